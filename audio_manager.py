@@ -1,65 +1,862 @@
 ﻿from __future__ import annotations
 
 import hashlib
+import io
+import json
 import os
 import threading
+import time
+import wave
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
 
-from gtts import gTTS
 import pygame
 
+from timer_core import PRIORITY_CRITICAL, PRIORITY_NORMAL
+
 MIXER_READY = False
+# Wall time of the last successful mixer init, for diagnostics.
+MIXER_INIT_MS: float | None = None
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16
+MIXER_OUTPUT_CHANNELS = 2
+# Samples per device callback (~11.6 ms at 44.1 kHz). Smaller starts sounds
+# sooner but risks underruns while the game keeps the CPU busy.
+MIXER_BUFFER = 512
 CACHE_DIR = Path(".tts_cache")
+TTS_CACHE_INDEX = "index.json"
+TTS_CACHE_MAX_BYTES = 50 * 1024 * 1024
+TTS_CACHE_MAX_ENTRIES = 2000
+DEFAULT_TTS_LANG = "zh-TW"
+TTS_PREFETCH_WORKERS = 2
+SOUND_CACHE_BUDGET_BYTES = 64 * 1024 * 1024
+AUDIO_QUEUE_SIZE = 64
+AUDIO_CHANNELS = 16
+# Channels only critical alerts may use, so they stay audible in a burst.
+RESERVED_CHANNELS = 2
 
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_MERGE = "merge"
+OVERFLOW_BLOCK = "block"
 
-def _ensure_mixer() -> bool:
-    global MIXER_READY
+# (text, lang, target_path) -> writes an mp3 to target_path.
+TtsBackend = Callable[[str, str, Path], None]
+
+_mixer_lock = threading.Lock()
+_synthesis_guard = threading.Lock()
+_synthesis_locks: Dict[Path, threading.Lock] = {}
+
+
+def init_mixer(frequency: int = MIXER_FREQUENCY, buffer: int = MIXER_BUFFER) -> bool:
+    global MIXER_READY, MIXER_INIT_MS
     if MIXER_READY:
         return True
 
-    try:
-        pygame.mixer.init()
+    # Threads racing here (startup init, the first alerts) open the device once.
+    with _mixer_lock:
+        if MIXER_READY:
+            return True
+
+        started = time.perf_counter()
+        try:
+            pygame.mixer.init(frequency=frequency, size=MIXER_SIZE, channels=MIXER_OUTPUT_CHANNELS, buffer=buffer)
+            CHANNEL_POOL.configure()
+            _warm_up_playback()
+        except Exception as exc:
+            print(f"初始化音效裝置失敗: {exc}")
+            return False
+        MIXER_INIT_MS = (time.perf_counter() - started) * 1000
         MIXER_READY = True
         return True
-    except Exception as exc:
-        print(f"初始化音效裝置失敗: {exc}")
-        return False
 
 
-def play_audio(file_path: str, volume: float) -> None:
-    def _play() -> None:
-        if not _ensure_mixer():
+def _warm_up_playback() -> None:
+    # One silent WAV through decode and a channel, so the first real alert
+    # does not pay for SDL's first-use setup.
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(MIXER_FREQUENCY)
+        handle.writeframes(bytes(256))
+    buffer.seek(0)
+    sound = pygame.mixer.Sound(file=buffer)
+    sound.get_raw()
+    channel = pygame.mixer.find_channel()
+    if channel is not None:
+        channel.set_volume(0.0)
+        channel.play(sound)
+
+
+def start_mixer_init(frequency: int = MIXER_FREQUENCY, buffer: int = MIXER_BUFFER) -> threading.Thread:
+    # Called at launch so the first alert does not pay for opening the device.
+    thread = threading.Thread(target=init_mixer, args=(frequency, buffer), name="mixer-init", daemon=True)
+    thread.start()
+    return thread
+
+
+def shutdown_mixer() -> None:
+    global MIXER_READY
+    with _mixer_lock:
+        if MIXER_READY:
+            pygame.mixer.quit()
+            MIXER_READY = False
+
+
+class SoundCache:
+    # Decoded sounds keyed by the file's real path, reloaded when its mtime
+    # changes. Every spelling of a file (relative, through a symlink, other
+    # case on Windows) maps to one entry, so all items that use the file share
+    # one decoded buffer. Unpinned entries are evicted least-recently-played
+    # first once the decoded size exceeds the budget.
+
+    def __init__(
+        self,
+        budget_bytes: int = SOUND_CACHE_BUDGET_BYTES,
+        loader: Callable[[str], Any] | None = None,
+    ) -> None:
+        self.budget_bytes = budget_bytes
+        self._loader = loader or pygame.mixer.Sound
+        self._lock = threading.Lock()
+        # real path -> (mtime_ns, decoded_bytes, sound)
+        self._entries: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+        self._pins: Dict[str, int] = {}
+        # path as given -> real path, so lookups skip realpath's lstat calls
+        self._keys: Dict[str, str] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        # Entries checked by preload() and not played since.
+        self._fresh: Set[str] = set()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, file_path: str, revalidate: bool = True) -> Any:
+        # revalidate=False skips the mtime check once after preload(), so the
+        # first alert for a preloaded sound does no disk I/O; later plays
+        # check again and pick up a file overwritten in place.
+        if not revalidate:
+            with self._lock:
+                key = self._keys.get(file_path, "")
+                entry = self._entries.get(key)
+                if entry is not None and key in self._fresh:
+                    self._fresh.discard(key)
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[2]
+
+        key = self._key(file_path, refresh=True)
+        mtime_ns = os.stat(key).st_mtime_ns
+        sound = self._cached(key, mtime_ns)
+        if sound is not None:
+            return sound
+
+        # Decoded outside the cache lock so other files can still be served;
+        # concurrent misses for one file wait for a single decode.
+        with self._load_lock(key):
+            sound = self._cached(key, mtime_ns, count=False)
+            if sound is not None:
+                return sound
+            sound = self._loader(key)
+            decoded_bytes = len(sound.get_raw())
+
+            with self._lock:
+                self._discard(key)
+                if decoded_bytes <= self.budget_bytes or key in self._pins:
+                    self._entries[key] = (mtime_ns, decoded_bytes, sound)
+                    self.total_bytes += decoded_bytes
+                    self._evict()
+        return sound
+
+    def preload(self, file_path: str) -> Any:
+        sound = self.get(file_path)
+        key = self._key(file_path)
+        with self._lock:
+            if key in self._entries:
+                self._fresh.add(key)
+        return sound
+
+    def pin(self, file_path: str) -> None:
+        key = self._key(file_path)
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+
+    def unpin(self, file_path: str) -> None:
+        key = self._key(file_path)
+        with self._lock:
+            count = self._pins.get(key, 0) - 1
+            if count > 0:
+                self._pins[key] = count
+                return
+            self._pins.pop(key, None)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._fresh.clear()
+            self.total_bytes = 0
+
+    def __contains__(self, file_path: str) -> bool:
+        key = self._key(file_path)
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _key(self, file_path: str, refresh: bool = False) -> str:
+        key = None if refresh else self._keys.get(file_path)
+        if key is None:
+            key = os.path.normcase(os.path.realpath(file_path))
+            self._keys[file_path] = key
+        return key
+
+    def _load_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(key, threading.Lock())
+
+    def _cached(self, key: str, mtime_ns: int, count: bool = True) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime_ns:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            if count:
+                self.misses += 1
+            return None
+
+    def _discard(self, key: str) -> None:
+        self._fresh.discard(key)
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def _evict(self) -> None:
+        if self.total_bytes <= self.budget_bytes:
             return
+        for key in [key for key in self._entries if key not in self._pins]:
+            self._discard(key)
+            if self.total_bytes <= self.budget_bytes:
+                return
+
+
+SOUND_CACHE = SoundCache()
+
+
+class ChannelPool:
+    # Picks the mixer channel for each voice instead of leaving it to pygame.
+    # The first `reserved` channels only take critical alerts. With every
+    # usable channel busy, the new voice steals the lowest-priority, oldest
+    # voice that is not above its own priority; if all of them are, it drops.
+
+    def __init__(self, channels: int = AUDIO_CHANNELS, reserved: int = RESERVED_CHANNELS) -> None:
+        self.channels = max(1, channels)
+        self.reserved = max(0, min(self.channels - 1, reserved))
+        self._lock = threading.Lock()
+        self._handles: List[Any] = []
+        # channel index -> (priority, started_at) of the voice last put there
+        self._voices: Dict[int, Tuple[int, float]] = {}
+
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def configure(self) -> None:
+        with self._lock:
+            self._configure()
+
+    def play(self, sound: Any, volume: float, priority: int = PRIORITY_NORMAL) -> bool:
+        with self._lock:
+            if pygame.mixer.get_num_channels() != self.channels or not self._handles:
+                # Also after a mixer re-init, which resets the channel setup.
+                self._configure()
+
+            first = 0 if priority >= PRIORITY_CRITICAL else self.reserved
+            index = self._free_channel(first)
+            if index is None:
+                index = self._victim_channel(first, priority)
+                if index is None:
+                    self.dropped += 1
+                    return False
+                self.stolen += 1
+
+            # The cached Sound is shared, so volume goes on the playback channel.
+            channel = self._handles[index]
+            channel.set_volume(max(0.0, min(1.0, float(volume))))
+            channel.play(sound)
+            self._voices[index] = (priority, time.monotonic())
+            self.played += 1
+            return True
+
+    def _configure(self) -> None:
+        pygame.mixer.set_num_channels(self.channels)
+        pygame.mixer.set_reserved(self.reserved)
+        self._handles = [pygame.mixer.Channel(index) for index in range(self.channels)]
+        self._voices.clear()
+
+    def _free_channel(self, first: int) -> int | None:
+        for index in range(first, self.channels):
+            if not self._handles[index].get_busy():
+                return index
+        return None
+
+    def _victim_channel(self, first: int, priority: int) -> int | None:
+        victim = None
+        for index in range(first, self.channels):
+            # A channel busy with a voice the pool did not start counts as normal.
+            voice = self._voices.get(index, (PRIORITY_NORMAL, 0.0))
+            if voice[0] <= priority and (victim is None or voice < victim[:2]):
+                victim = (*voice, index)
+        return victim[2] if victim is not None else None
+
+
+CHANNEL_POOL = ChannelPool()
+
+
+def _play_now(file_path: str, volume: float, priority: int = PRIORITY_NORMAL) -> None:
+    if not init_mixer():
+        return
+
+    try:
+        # The first alert after a preload skips the mtime check.
+        CHANNEL_POOL.play(SOUND_CACHE.get(file_path, revalidate=False), volume, priority)
+    except Exception as exc:
+        print(f"播放音檔時發生錯誤: {exc}")
+
+
+class SoundPreloader:
+    # Validates and decodes audio files into the sound cache ahead of their
+    # alerts. on_result(path, error) runs on the worker thread with error None
+    # for a usable file, or a message to show the user.
+
+    def __init__(
+        self,
+        on_result: Callable[[str, str | None], None] | None = None,
+        cache: SoundCache | None = None,
+    ) -> None:
+        self._on_result = on_result
+        self._cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sound-preload")
+        # Same re-entrancy need as TtsPrefetcher.
+        self._lock = threading.RLock()
+        self._pending: Dict[str, Future] = {}
+        self.failures: Dict[str, str] = {}
+
+    def preload(self, paths: Iterable[str]) -> int:
+        submitted = 0
+        with self._lock:
+            for file_path in paths:
+                file_path = file_path.strip()
+                if not file_path or file_path in self._pending:
+                    continue
+
+                future = self._executor.submit(self._load, file_path)
+                self._pending[file_path] = future
+                future.add_done_callback(lambda _future, file_path=file_path: self._forget(file_path))
+                submitted += 1
+        return submitted
+
+    def wait(self) -> None:
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _load(self, file_path: str) -> None:
+        error = None
+        if not os.path.isfile(file_path):
+            error = "找不到音檔"
+        elif not init_mixer():
+            error = "音效裝置無法使用"
+        else:
+            try:
+                (SOUND_CACHE if self._cache is None else self._cache).preload(file_path)
+            except Exception as exc:
+                error = f"無法解碼音檔: {exc}"
+
+        with self._lock:
+            if error is None:
+                self.failures.pop(file_path, None)
+            else:
+                self.failures[file_path] = error
+        if self._on_result is not None:
+            self._on_result(file_path, error)
+
+    def _forget(self, file_path: str) -> None:
+        with self._lock:
+            self._pending.pop(file_path, None)
+
 
+class TtsDiskCache:
+    # Synthesized speech in `directory`, tracked by an index file so lookups
+    # never touch the disk. The directory is scanned once, on first use, to
+    # adopt files from older builds and drop index entries whose file is
+    # gone. Past either cap the least recently used files are deleted.
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = TTS_CACHE_MAX_BYTES,
+        max_entries: int = TTS_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        # text digest -> {"lang", "size", "last_used"}
+        self._entries: Dict[str, Dict[str, Any]] | None = None
+        self._files: Dict[str, Path] = {}
+        self._dirty = False
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def digest(text: str, lang: str) -> str:
+        return hashlib.sha1(f"{lang}:{text}".encode("utf-8")).hexdigest()
+
+    def path_for(self, text: str, lang: str) -> Path:
+        return self._file(self.digest(text, lang))
+
+    def lookup(self, text: str, lang: str) -> Path | None:
+        digest = self.digest(text, lang)
+        with self._lock:
+            entry = self._load().get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry["last_used"] = time.time()
+            self._dirty = True
+            self.hits += 1
+        return self._file(digest)
+
+    def add(self, text: str, lang: str) -> Path:
+        # Called once the finished file has been moved into place.
+        digest = self.digest(text, lang)
+        cache_file = self._file(digest)
+        size = cache_file.stat().st_size
+        with self._lock:
+            entries = self._load()
+            previous = entries.pop(digest, None)
+            if previous is not None:
+                self.total_bytes -= previous["size"]
+            entries[digest] = {"lang": lang, "size": size, "last_used": time.time()}
+            self.total_bytes += size
+            self._evict(keep=digest)
+            self._save()
+        return cache_file
+
+    def discard(self, text: str, lang: str) -> None:
+        # For a file removed behind the index's back; the next lookup misses
+        # and the text is synthesized again.
+        digest = self.digest(text, lang)
+        with self._lock:
+            entry = self._load().pop(digest, None)
+            if entry is not None:
+                self.total_bytes -= entry["size"]
+                self._dirty = True
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        with self._lock:
+            return self.digest(*key) in self._load()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def _file(self, digest: str) -> Path:
+        # Building a Path costs more than the rest of a lookup.
+        cache_file = self._files.get(digest)
+        if cache_file is None:
+            cache_file = self._files.setdefault(digest, self.directory / f"tts_{digest}.mp3")
+        return cache_file
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is not None:
+            return self._entries
+
+        try:
+            stored = json.loads((self.directory / TTS_CACHE_INDEX).read_text(encoding="utf-8"))
+            stored_entries = stored.get("entries", {}) if isinstance(stored, dict) else {}
+        except (OSError, ValueError):
+            stored_entries = {}
+
+        entries: Dict[str, Dict[str, Any]] = {}
         try:
-            sound = pygame.mixer.Sound(file_path)
-            sound.set_volume(max(0.0, min(1.0, float(volume))))
-            sound.play()
+            scanned = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            scanned = []
+        except OSError as exc:
+            # An unusable directory leaves the cache empty rather than
+            # failing every lookup; synthesis reports its own errors.
+            print(f"讀取 TTS 快取失敗: {exc}")
+            scanned = []
+        for dir_entry in scanned:
+            name = dir_entry.name
+            if name.endswith(".tmp"):
+                # Left behind by a synthesis that never finished.
+                try:
+                    Path(dir_entry.path).unlink(missing_ok=True)
+                except OSError:
+                    pass
+                continue
+            if not (name.startswith("tts_") and name.endswith(".mp3")):
+                continue
+
+            digest = name[4:-4]
+            try:
+                stat = dir_entry.stat()
+            except OSError:
+                # Deleted or locked since the scan; it is simply not cached.
+                continue
+            entry = stored_entries.get(digest)
+            if not isinstance(entry, dict):
+                entry = {"lang": "", "last_used": stat.st_mtime}
+            entries[digest] = {
+                "lang": str(entry.get("lang", "")),
+                "size": stat.st_size,
+                "last_used": float(entry.get("last_used", stat.st_mtime)),
+            }
+
+        self._entries = entries
+        self.total_bytes = sum(entry["size"] for entry in entries.values())
+        if self._evict() or entries.keys() != stored_entries.keys():
+            self._save()
+        return entries
+
+    def _evict(self, keep: str | None = None) -> bool:
+        entries = self._entries
+        if len(entries) <= self.max_entries and self.total_bytes <= self.max_bytes:
+            return False
+
+        for digest in sorted(entries, key=lambda digest: entries[digest]["last_used"]):
+            if len(entries) <= self.max_entries and self.total_bytes <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            self.total_bytes -= entries.pop(digest)["size"]
+            try:
+                self._files.pop(digest, self.directory / f"tts_{digest}.mp3").unlink(missing_ok=True)
+            except OSError:
+                # A locked file stays on disk and is adopted again next scan.
+                pass
+        return True
+
+    def _save(self) -> None:
+        index_path = self.directory / TTS_CACHE_INDEX
+        temp_path = index_path.with_name(f".{TTS_CACHE_INDEX}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(json.dumps({"version": 1, "entries": self._entries}), encoding="utf-8")
+            os.replace(temp_path, index_path)
+            self._dirty = False
+        except OSError as exc:
+            try:
+                temp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            print(f"寫入 TTS 快取索引失敗: {exc}")
+
+
+TTS_CACHE = TtsDiskCache(CACHE_DIR)
+
+
+def gtts_backend(text: str, lang: str, target_path: Path) -> None:
+    # Imported lazily: gTTS pulls in requests, which startup does not need.
+    from gtts import gTTS
+
+    gTTS(text=text, lang=lang, tld="com.au").save(str(target_path))
+
+
+def _synthesis_lock(cache_file: Path) -> threading.Lock:
+    with _synthesis_guard:
+        return _synthesis_locks.setdefault(cache_file, threading.Lock())
+
+
+def synthesize_tts(text: str, lang: str = DEFAULT_TTS_LANG, backend: TtsBackend | None = None) -> Path:
+    cache = TTS_CACHE
+    cache_file = cache.lookup(text, lang)
+    if cache_file is not None:
+        return cache_file
+
+    # One synthesis per text: an alert that fires while the prefetcher is still
+    # synthesizing the same text waits for it instead of starting another.
+    cache_file = cache.path_for(text, lang)
+    with _synthesis_lock(cache_file):
+        if cache.lookup(text, lang) is None:
+            cache.directory.mkdir(parents=True, exist_ok=True)
+            # Synthesized beside the target and renamed into place, so a
+            # half-written mp3 never has the name an alert would play.
+            temp_file = cache_file.with_name(f".{cache_file.name}.{threading.get_ident()}.tmp")
+            try:
+                (backend or gtts_backend)(text, lang, temp_file)
+                os.replace(temp_file, cache_file)
+                cache.add(text, lang)
+            finally:
+                temp_file.unlink(missing_ok=True)
+    return cache_file
+
+
+class TtsPrefetcher:
+    def __init__(self, backend: TtsBackend | None = None, max_workers: int = TTS_PREFETCH_WORKERS) -> None:
+        self._backend = backend
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts-prefetch")
+        # Re-entrant: a future that finishes before add_done_callback runs
+        # calls _forget on the submitting thread while it holds the lock.
+        self._lock = threading.RLock()
+        self._pending: Dict[Tuple[str, str], Future] = {}
+
+    def prefetch(self, texts: Iterable[str], lang: str = DEFAULT_TTS_LANG) -> int:
+        submitted = 0
+        with self._lock:
+            for text in texts:
+                text = text.strip()
+                key = (text, lang)
+                if not text or key in self._pending or TTS_CACHE.lookup(text, lang) is not None:
+                    continue
+
+                future = self._executor.submit(self._synthesize, text, lang)
+                self._pending[key] = future
+                future.add_done_callback(lambda _future, key=key: self._forget(key))
+                submitted += 1
+        return submitted
+
+    def wait(self) -> None:
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _synthesize(self, text: str, lang: str) -> None:
+        try:
+            synthesize_tts(text, lang, self._backend)
         except Exception as exc:
-            print(f"播放音檔時發生錯誤: {exc}")
+            print(f"TTS 預先合成失敗: {exc}")
+
+    def _forget(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+
+
+class AudioDispatcher:
+    # One long-lived worker starts every alert, so a burst of expiries queues
+    # up instead of spawning a thread each. Requests with the same key (an
+    # item id, or the sound itself) coalesce into the one already queued; a
+    # full queue applies the overflow policy. Uncached TTS is synthesized off
+    # the worker and queued again once the file exists.
+
+    def __init__(
+        self,
+        max_queue: int = AUDIO_QUEUE_SIZE,
+        overflow: str = OVERFLOW_DROP_OLDEST,
+        player: Callable[[str, float, int], None] | None = None,
+        tts_backend: TtsBackend | None = None,
+    ) -> None:
+        if overflow not in (OVERFLOW_DROP_OLDEST, OVERFLOW_MERGE, OVERFLOW_BLOCK):
+            raise ValueError(f"unknown overflow policy: {overflow!r}")
+
+        self.max_queue = max(1, max_queue)
+        self.overflow = overflow
+        self._player = player or _play_now
+        self._tts_backend = tts_backend
+        self._condition = threading.Condition()
+        # key -> (kind, source, lang, volume, priority); kind is "file" or "tts".
+        self._queue: "OrderedDict[str, Tuple[str, str, str, float, int]]" = OrderedDict()
+        self._busy = False
+        self._synthesizing = 0
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._synth_executor: ThreadPoolExecutor | None = None
+
+        self.submitted = 0
+        self.played = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def play_file(
+        self, file_path: str, volume: float, key: str | None = None, priority: int = PRIORITY_NORMAL
+    ) -> bool:
+        return self._submit(key or f"file:{file_path}", ("file", file_path, "", volume, priority))
+
+    def speak(
+        self,
+        text: str,
+        volume: float,
+        lang: str = DEFAULT_TTS_LANG,
+        key: str | None = None,
+        priority: int = PRIORITY_NORMAL,
+    ) -> bool:
+        return self._submit(key or f"tts:{lang}:{text}", ("tts", text, lang, volume, priority))
+
+    @property
+    def queued(self) -> int:
+        with self._condition:
+            return len(self._queue)
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._queue and not self._busy and not self._synthesizing, timeout
+            )
 
-    threading.Thread(target=_play, daemon=True).start()
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._queue.clear()
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        if self._synth_executor is not None:
+            self._synth_executor.shutdown(wait=False, cancel_futures=True)
 
+    def _submit(self, key: str, request: Tuple[str, str, str, float, int]) -> bool:
+        with self._condition:
+            if self._closed:
+                return False
+            self.submitted += 1
 
-def _tts_cache_path(text: str, lang: str) -> Path:
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    digest = hashlib.sha1(f"{lang}:{text}".encode("utf-8")).hexdigest()
-    return CACHE_DIR / f"tts_{digest}.mp3"
+            if key in self._queue:
+                # Keeps the queued position; the newest settings win.
+                self._queue[key] = request
+                self.coalesced += 1
+                return True
 
+            if len(self._queue) >= self.max_queue:
+                if self.overflow == OVERFLOW_BLOCK:
+                    self._condition.wait_for(lambda: self._closed or len(self._queue) < self.max_queue)
+                    if self._closed:
+                        return False
+                elif self.overflow == OVERFLOW_MERGE:
+                    return self._merge(request)
+                else:
+                    self._queue.popitem(last=False)
+                    self.dropped += 1
 
-def speak_text(text: str, volume: float, lang: str = "zh-TW") -> None:
-    def _speak() -> None:
-        if not text.strip():
+            self._queue[key] = request
+            self._ensure_worker()
+            self._condition.notify_all()
+            return True
+
+    def _merge(self, request: Tuple[str, str, str, float, int]) -> bool:
+        # Fold into a queued request for the same sound at the louder volume
+        # and higher priority; with none queued the new alert is dropped.
+        for key, queued in self._queue.items():
+            if queued[:3] == request[:3]:
+                self._queue[key] = (*queued[:3], max(queued[3], request[3]), max(queued[4], request[4]))
+                self.coalesced += 1
+                return True
+        self.dropped += 1
+        return False
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="audio-dispatcher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._closed or self._queue)
+                if self._closed:
+                    return
+                _key, request = self._queue.popitem(last=False)
+                self._busy = True
+                self._condition.notify_all()
+
+            try:
+                self._execute(request)
+            except Exception as exc:
+                # One bad request must not take the only worker down with it.
+                print(f"音效播放失敗: {exc}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _execute(self, request: Tuple[str, str, str, float, int]) -> None:
+        kind, source, lang, volume, priority = request
+        if kind == "file":
+            self._play(source, volume, priority)
             return
 
-        cache_file = _tts_cache_path(text, lang)
+        cache_file = TTS_CACHE.lookup(source, lang)
+        if cache_file is not None:
+            if cache_file.is_file():
+                self._play(str(cache_file), volume, priority)
+                return
+            # Deleted since the index was read; synthesize it again below.
+            TTS_CACHE.discard(source, lang)
+
+        if self._synth_executor is None:
+            self._synth_executor = ThreadPoolExecutor(max_workers=TTS_PREFETCH_WORKERS, thread_name_prefix="audio-tts")
+        with self._condition:
+            self._synthesizing += 1
+        try:
+            self._synth_executor.submit(self._synthesize_then_play, source, lang, volume, priority)
+        except Exception:
+            with self._condition:
+                self._synthesizing -= 1
+                self._condition.notify_all()
+            raise
 
+    def _synthesize_then_play(self, text: str, lang: str, volume: float, priority: int) -> None:
         try:
-            if not cache_file.exists():
-                tts = gTTS(text=text, lang=lang, tld="com.au")
-                tts.save(str(cache_file))
-            play_audio(str(cache_file), volume)
+            cache_file = synthesize_tts(text, lang, self._tts_backend)
+            self.play_file(str(cache_file), volume, key=f"tts:{lang}:{text}", priority=priority)
         except Exception as exc:
             print(f"TTS 發聲失敗: {exc}")
+        finally:
+            with self._condition:
+                self._synthesizing -= 1
+                self._condition.notify_all()
+
+    def _play(self, file_path: str, volume: float, priority: int) -> None:
+        self._player(file_path, volume, priority)
+        with self._condition:
+            self.played += 1
+
+
+AUDIO_DISPATCHER = AudioDispatcher()
+
+
+def playback_stats() -> Dict[str, int]:
+    return {
+        "played": CHANNEL_POOL.played,
+        "stolen": CHANNEL_POOL.stolen,
+        # Alerts lost to a full queue plus voices that found no channel.
+        "dropped": AUDIO_DISPATCHER.dropped + CHANNEL_POOL.dropped,
+        "queued": AUDIO_DISPATCHER.queued,
+        "coalesced": AUDIO_DISPATCHER.coalesced,
+        "mixer_init_ms": round(MIXER_INIT_MS or 0),
+    }
+
+
+def play_audio(file_path: str, volume: float, key: str | None = None, priority: int = PRIORITY_NORMAL) -> None:
+    AUDIO_DISPATCHER.play_file(file_path, volume, key, priority)
+
 
-    threading.Thread(target=_speak, daemon=True).start()
+def speak_text(
+    text: str,
+    volume: float,
+    lang: str = DEFAULT_TTS_LANG,
+    key: str | None = None,
+    priority: int = PRIORITY_NORMAL,
+) -> None:
+    if not text.strip():
+        return
+    AUDIO_DISPATCHER.speak(text, volume, lang, key, priority)
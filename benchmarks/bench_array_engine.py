@@ -0,0 +1,73 @@
+﻿from __future__ import annotations
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from timer_array_engine import ArrayTimerEngine
+from timer_core import TimerEngine, TimerItem, VirtualClock
+
+TIMER_COUNTS = (100000, 1000000)
+HEAP_ENGINE_LIMIT = 100000
+ROUNDS = 5
+
+
+def _items(count: int) -> list:
+    rng = random.Random(7)
+    return [
+        TimerItem(id=f"item-{index}", countdown_sec=rng.randint(1, 3600), infinite_loop=index % 2 == 0)
+        for index in range(count)
+    ]
+
+
+def _mean_ms(action) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        action()
+    return (time.perf_counter() - started) / ROUNDS * 1000
+
+
+def main() -> int:
+    for count in TIMER_COUNTS:
+        items = _items(count)
+        engines = [("array", ArrayTimerEngine)]
+        if count <= HEAP_ENGINE_LIMIT:
+            engines.insert(0, ("heap", TimerEngine))
+
+        for name, engine_class in engines:
+            clock = VirtualClock(1000.0)
+            engine = engine_class(clock=clock)
+            if hasattr(engine, "start_items"):
+                engine.start_items(items)
+            else:
+                for item in items:
+                    engine.start_item(item)
+
+            def _second():
+                clock.advance(1.0)
+                engine.process_expired()
+
+            expire_ms = _mean_ms(_second)
+            line = f"timers={count:8d}  {name:5s} expire pass {expire_ms:7.1f} ms"
+            if hasattr(engine, "tick_slots"):
+
+                def _tick_slots():
+                    clock.advance(1.0)
+                    engine.tick_slots()
+
+                line += f"  vectorized tick {_mean_ms(_tick_slots):7.1f} ms"
+
+            def _tick():
+                clock.advance(1.0)
+                engine.tick()
+
+            line += f"  snapshot tick {_mean_ms(_tick):7.1f} ms"
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+﻿from __future__ import annotations
+
+import math
+import os
+import statistics
+import struct
+import sys
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import audio_manager
+from audio_manager import AudioDispatcher
+from timer_core import PRIORITY_NORMAL
+
+BURST = 500
+SAMPLE_RATE = 44100
+TTS_TEXTS = 25
+TTS_LATENCY_SEC = 0.05
+
+
+def _write_tone(path: Path) -> None:
+    frames = bytearray()
+    for index in range(SAMPLE_RATE // 2):
+        sample = int(12000 * math.sin(2 * math.pi * 880 * index / SAMPLE_RATE))
+        frames += struct.pack("<hh", sample, sample)
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(2)
+        handle.setsampwidth(2)
+        handle.setframerate(SAMPLE_RATE)
+        handle.writeframes(bytes(frames))
+
+
+def _slow_backend(text: str, lang: str, target_path: Path) -> None:
+    time.sleep(TTS_LATENCY_SEC)
+    target_path.write_bytes(b"")
+
+
+class _ThreadSampler:
+    def __init__(self) -> None:
+        self.before = threading.active_count()
+        self.peak = self.before
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(0.001):
+            self.peak = max(self.peak, threading.active_count())
+
+    def stop(self) -> int:
+        self._stop.set()
+        self._thread.join()
+        # The sampler itself is not part of the measured extra threads.
+        return self.peak - self.before - 1
+
+
+class _Probe:
+    def __init__(self, sound_path: str) -> None:
+        self.sound_path = sound_path
+        self.submitted_at = {}
+        self.latencies = []
+        self.lock = threading.Lock()
+        self.sampler = _ThreadSampler()
+
+    # Latency runs from the first alert for a sound, so repeats of one TTS text
+    # count from when that text was first requested.
+    def play(self, file_path: str, volume: float, priority: int = PRIORITY_NORMAL) -> None:
+        # Every alert plays the same cached tone through the real mixer path.
+        audio_manager._play_now(self.sound_path, volume, priority)
+        with self.lock:
+            self.latencies.append(time.perf_counter() - self.submitted_at[file_path])
+
+    def report(self, label: str) -> None:
+        extra_threads = self.sampler.stop()
+        latencies = sorted(self.latencies)
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(
+            f"{label:22s}  played {len(latencies):4d}  extra threads {extra_threads:4d}  "
+            f"p50 {statistics.median(latencies) * 1000:7.2f} ms  p99 {p99 * 1000:7.2f} ms"
+        )
+
+
+def _alerts(tts: bool):
+    for index in range(BURST):
+        if tts:
+            text = f"提醒 {index % TTS_TEXTS}"
+            yield index, text, str(audio_manager.TTS_CACHE.path_for(text, audio_manager.DEFAULT_TTS_LANG))
+        else:
+            yield index, "", f"{index}.wav"
+
+
+def _thread_per_alert(sound_path: str, tts: bool) -> None:
+    probe = _Probe(sound_path)
+
+    def _alert(text: str, path: str) -> None:
+        if text:
+            audio_manager.synthesize_tts(text, backend=_slow_backend)
+        probe.play(path, 1.0)
+
+    workers = []
+    for index, text, path in _alerts(tts):
+        probe.submitted_at.setdefault(path, time.perf_counter())
+        worker = threading.Thread(target=_alert, args=(text, path), daemon=True)
+        worker.start()
+        workers.append(worker)
+    for worker in workers:
+        worker.join()
+    probe.report("thread per alert" + (" tts" if tts else ""))
+
+
+def _dispatcher(sound_path: str, max_queue: int, tts: bool) -> None:
+    probe = _Probe(sound_path)
+    dispatcher = AudioDispatcher(max_queue=max_queue, player=probe.play, tts_backend=_slow_backend)
+    for index, text, path in _alerts(tts):
+        probe.submitted_at.setdefault(path, time.perf_counter())
+        if text:
+            dispatcher.speak(text, 1.0, key=f"item-{index}")
+        else:
+            dispatcher.play_file(path, 1.0, key=f"item-{index}")
+    dispatcher.wait_idle()
+    dispatcher.close()
+    probe.report(f"dispatcher q={max_queue}" + (" tts" if tts else ""))
+
+
+def main() -> int:
+    work_dir = Path(tempfile.mkdtemp(prefix="ms_timer_bench_"))
+    sound_path = work_dir / "alert.wav"
+    _write_tone(sound_path)
+    audio_manager._play_now(str(sound_path), 0.0)
+
+    for tts in (False, True):
+        # Uncached TTS each round: every alert text starts without a cached file.
+        audio_manager.TTS_CACHE = audio_manager.TtsDiskCache(work_dir / f"tts_{tts}")
+        _thread_per_alert(str(sound_path), tts)
+        for max_queue in (BURST, audio_manager.AUDIO_QUEUE_SIZE):
+            audio_manager.TTS_CACHE = audio_manager.TtsDiskCache(work_dir / f"tts_{tts}_{max_queue}")
+            # The default queue drops the oldest alerts of a burst instead of lagging behind it.
+            _dispatcher(str(sound_path), max_queue, tts)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
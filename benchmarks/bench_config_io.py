@@ -0,0 +1,74 @@
+﻿from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import data_manager
+
+ITEM_COUNTS = (1000, 10000, 100000)
+ROUNDS = 3
+
+INSTALLED_CONFIG_SCHEMA = data_manager.config_schema
+INSTALLED_ORJSON = data_manager.orjson
+BACKENDS = {
+    "json": (None, None),
+    "orjson": (None, INSTALLED_ORJSON),
+    "msgspec": (INSTALLED_CONFIG_SCHEMA, None),
+    "msgspec+orjson": (INSTALLED_CONFIG_SCHEMA, INSTALLED_ORJSON),
+}
+
+
+def _best_ms(action, prepare=None) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        if prepare is not None:
+            prepare()
+        started = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> int:
+    os.chdir(tempfile.mkdtemp(prefix="ms_timer_bench_"))
+    config_path = Path(data_manager.CONFIG_FILENAME)
+
+    for item_count in ITEM_COUNTS:
+        config = data_manager.default_config()
+        config["items"] = [data_manager._new_item(index) for index in range(item_count)]
+        unstamped_text = json.dumps(config, ensure_ascii=False, indent=4)
+        stamped_text = data_manager._stamp_fingerprint(unstamped_text)
+
+        for name, (config_schema, orjson) in BACKENDS.items():
+            if (name.startswith("msgspec") and config_schema is None) or ("orjson" in name and orjson is None):
+                continue
+            data_manager.config_schema = config_schema
+            data_manager.orjson = orjson
+
+            save_ms = _best_ms(lambda: data_manager.save_config(config))
+            stamped_ms = _best_ms(
+                data_manager.load_config,
+                lambda: config_path.write_text(stamped_text, encoding="utf-8"),
+            )
+            unstamped_ms = _best_ms(
+                data_manager.load_config,
+                lambda: config_path.write_text(unstamped_text, encoding="utf-8"),
+            )
+            print(
+                f"items={item_count:6d}  {name:15s} save {save_ms:8.1f} ms  "
+                f"load {stamped_ms:8.1f} ms  load unstamped {unstamped_ms:8.1f} ms"
+            )
+
+    data_manager.config_schema = INSTALLED_CONFIG_SCHEMA
+    data_manager.orjson = INSTALLED_ORJSON
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
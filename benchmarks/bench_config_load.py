@@ -0,0 +1,48 @@
+﻿from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import data_manager
+
+ITEM_COUNT = 10000
+ROUNDS = 5
+
+
+def _time_loads(config_path: Path, text: str) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        config_path.write_text(text, encoding="utf-8")
+        started = time.perf_counter()
+        data_manager.load_config()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main() -> int:
+    os.chdir(tempfile.mkdtemp(prefix="ms_timer_bench_"))
+    config_path = Path(data_manager.CONFIG_FILENAME)
+
+    config = data_manager.default_config()
+    config["items"] = [data_manager._new_item(index) for index in range(ITEM_COUNT)]
+    data_manager.save_config(config)
+    stamped_text = config_path.read_text(encoding="utf-8")
+
+    unstamped = json.loads(stamped_text)
+    unstamped.pop(data_manager.FINGERPRINT_KEY)
+    unstamped_text = json.dumps(unstamped, ensure_ascii=False, indent=4)
+
+    full_ms = _time_loads(config_path, unstamped_text)
+    trusted_ms = _time_loads(config_path, stamped_text)
+    print(f"items={ITEM_COUNT}  unstamped (validate + restamp) {full_ms:8.1f} ms  fingerprinted {trusted_ms:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+﻿from __future__ import annotations
+
+import itertools
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hotkey_utils import MODIFIER_FLAGS, HotkeyRegistration, HotkeyRegistry, _canonicalize, parse_hotkey
+
+LOOKUPS = 100_000
+MODIFIERS = ["ctrl", "Alt", "shift", "Ctrl + Alt", "control+shift", "alt+SHIFT"]
+KEYS = [f"f{index}" for index in range(1, 13)] + list("abcdefghij0123")
+
+
+def _parse_uncached(hotkey_str: str):
+    # The pre-memoization path: tokenize, then split the canonical form again.
+    canonical = _canonicalize(hotkey_str)
+    if canonical is None:
+        return None
+    *modifier_tokens, key = canonical.split("+")
+    modifiers = 0
+    for token in modifier_tokens:
+        modifiers |= MODIFIER_FLAGS[token]
+    vk = 0x70 + int(key[1:]) - 1 if len(key) > 1 else ord(key)
+    return canonical, vk, modifiers
+
+
+def _inputs() -> list:
+    # Config loads, recorder events and registrations keep re-parsing the
+    # same few hundred raw spellings.
+    spellings = itertools.cycle(f"{modifier}+{key}" for modifier in MODIFIERS for key in KEYS)
+    return [next(spellings) for _ in range(LOOKUPS)]
+
+
+def _parse_us(parse, inputs: list) -> float:
+    started = time.perf_counter()
+    for hotkey_str in inputs:
+        parse(hotkey_str)
+    return (time.perf_counter() - started) / len(inputs) * 1_000_000
+
+
+def _lookup_us(parse, inputs: list) -> float:
+    # Parse, then ask the registry who owns the combo, as registration does.
+    registry = HotkeyRegistry()
+    for hotkey_str in set(inputs):
+        canonical, vk, modifiers = parse(hotkey_str)
+        if registry.owner(vk, modifiers) is None:
+            registry.add(HotkeyRegistration(canonical, canonical, vk, modifiers, registry.allocate_id()))
+    started = time.perf_counter()
+    for hotkey_str in inputs:
+        _canonical, vk, modifiers = parse(hotkey_str)
+        registry.owner(vk, modifiers)
+    return (time.perf_counter() - started) / len(inputs) * 1_000_000
+
+
+def main() -> int:
+    inputs = _inputs()
+    assert all(tuple(parse_hotkey(value)) == _parse_uncached(value) for value in set(inputs))
+    print(f"{LOOKUPS} hotkey strings, {len(set(inputs))} distinct spellings")
+    print(f"parse   uncached {_parse_us(_parse_uncached, inputs):6.2f} us  memoized {_parse_us(parse_hotkey, inputs):6.2f} us")
+    print(f"lookup  uncached {_lookup_us(_parse_uncached, inputs):6.2f} us  memoized {_lookup_us(parse_hotkey, inputs):6.2f} us")
+    info = parse_hotkey.cache_info()
+    print(f"cache   {info.currsize}/{info.maxsize} entries, {info.hits} hits, {info.misses} misses")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
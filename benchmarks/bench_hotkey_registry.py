@@ -0,0 +1,74 @@
+﻿from __future__ import annotations
+
+import itertools
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hotkey_utils import (
+    HotkeyRegistration,
+    HotkeyRegistry,
+    canonicalize_hotkey,
+    hotkey_to_vk_and_modifiers,
+    parse_hotkey,
+)
+
+BINDINGS = 500
+ROUNDS = 20
+MODIFIERS = ["ctrl", "alt", "shift", "ctrl+alt", "ctrl+shift", "alt+shift", "ctrl+alt+shift"]
+KEYS = [f"f{index}" for index in range(1, 13)] + [chr(code) for code in range(ord("a"), ord("z") + 1)] + list("0123456789")
+
+
+def _bindings() -> list:
+    # 336 distinct combos exist, so the tail of the batch is all conflicts.
+    combos = itertools.cycle(f"{modifier}+{key}" for modifier in MODIFIERS for key in KEYS)
+    return [(f"item-{index}", next(combos)) for index in range(BINDINGS)]
+
+
+def _register_linear(bindings: list) -> int:
+    # The previous GlobalHotkeyService.register_hotkey, minus the Win32 call.
+    registrations = {}
+    failures = 0
+    for item_id, hotkey_str in bindings:
+        token = f"item:{item_id}"
+        canonical = canonicalize_hotkey(hotkey_str)
+        if any(existing != token and hotkey == canonical for existing, (hotkey, _vk) in registrations.items()):
+            failures += 1
+            continue
+        registrations[token] = (canonical, hotkey_to_vk_and_modifiers(canonical))
+    return failures
+
+
+def _register_indexed(bindings: list) -> int:
+    registry = HotkeyRegistry()
+    failures = 0
+    for item_id, hotkey_str in bindings:
+        token = f"item:{item_id}"
+        canonical, vk, modifiers = parse_hotkey(hotkey_str)
+        if registry.owner(vk, modifiers) not in (None, token):
+            failures += 1
+            continue
+        registry.add(HotkeyRegistration(token, canonical, vk, modifiers, registry.allocate_id()))
+    return failures
+
+
+def _mean_ms(register, bindings: list) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        register(bindings)
+    return (time.perf_counter() - started) / ROUNDS * 1000
+
+
+def main() -> int:
+    bindings = _bindings()
+    assert _register_linear(bindings) == _register_indexed(bindings)
+    print(f"register {BINDINGS} bindings ({_register_indexed(bindings)} conflicts), Win32 calls excluded")
+    print(f"linear scan + double parse  {_mean_ms(_register_linear, bindings):8.2f} ms")
+    print(f"(vk, mods) registry         {_mean_ms(_register_indexed, bindings):8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+﻿from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PySide6.QtWidgets import QApplication
+
+import data_manager
+from timer_core import TimerItem
+
+LIST_SIZES = (300, 3000)
+ROUNDS = 20
+
+
+def _time_adds(app, window) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        window._on_add_clicked()
+        app.processEvents()
+    return (time.perf_counter() - started) / ROUNDS * 1000
+
+
+def _measure(app, item_count: int) -> tuple[float, float, float]:
+    os.chdir(tempfile.mkdtemp(prefix="ms_timer_bench_"))
+    config = data_manager.default_config()
+    config["items"] = [data_manager._new_item(index) for index in range(item_count)]
+    for item in config["items"]:
+        item["hotkey"] = None
+    data_manager.save_config(config)
+
+    from main import TimerMainWindow
+
+    window = TimerMainWindow()
+    window.show()
+    app.processEvents()
+
+    started = time.perf_counter()
+    for index in range(ROUNDS):
+        window.tree_model.insert_item(len(window.items), TimerItem(id=f"bench-{index}", name="bench", countdown_sec=30))
+    model_ms = (time.perf_counter() - started) / ROUNDS * 1000
+
+    handler_ms = _time_adds(app, window)
+    window._persist_config = lambda: None
+    ui_only_ms = _time_adds(app, window)
+
+    window.close()
+    app.processEvents()
+    return model_ms, handler_ms, ui_only_ms
+
+
+def main() -> int:
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    for item_count in LIST_SIZES:
+        model_ms, handler_ms, ui_only_ms = _measure(app, item_count)
+        print(
+            f"items={item_count:5d}  model insert {model_ms:7.3f} ms  "
+            f"add handler {handler_ms:7.3f} ms  (without save {ui_only_ms:7.3f} ms)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+﻿from __future__ import annotations
+
+import math
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+SAMPLE_RATE = 44100
+ROUNDS = 5
+STARTUP_SEC = 0.3
+
+
+def _write_tone(path: Path) -> None:
+    frames = bytearray()
+    for index in range(SAMPLE_RATE // 2):
+        sample = int(12000 * math.sin(2 * math.pi * 880 * index / SAMPLE_RATE))
+        frames += struct.pack("<hh", sample, sample)
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(2)
+        handle.setsampwidth(2)
+        handle.setframerate(SAMPLE_RATE)
+        handle.writeframes(bytes(frames))
+
+
+def _alert_ms(audio_manager, path: Path) -> float:
+    started = time.perf_counter()
+    audio_manager._play_now(str(path), 0.0)
+    return (time.perf_counter() - started) * 1000
+
+
+def _child(mode: str, work_dir: Path) -> None:
+    import audio_manager
+
+    if mode == "startup":
+        audio_manager.start_mixer_init()
+    # Stand-in for the window building before the first timer can expire.
+    time.sleep(STARTUP_SEC)
+
+    # Same tone under two paths, so both alerts decode an uncached file.
+    first_ms = _alert_ms(audio_manager, work_dir / "first.wav")
+    steady_ms = _alert_ms(audio_manager, work_dir / "steady.wav")
+    print(f"{first_ms} {steady_ms} {audio_manager.MIXER_INIT_MS}")
+
+
+def main() -> int:
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        _child(sys.argv[2], Path(sys.argv[3]))
+        return 0
+
+    work_dir = Path(tempfile.mkdtemp(prefix="ms_timer_bench_"))
+    _write_tone(work_dir / "first.wav")
+    _write_tone(work_dir / "steady.wav")
+
+    # Fresh processes: the mixer can only be opened for the first time once.
+    for mode in ("lazy", "startup"):
+        samples = []
+        for _ in range(ROUNDS):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", mode, str(work_dir)],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+            samples.append([float(value) for value in output[-3:]])
+        first_ms, steady_ms, init_ms = (sum(column) / ROUNDS for column in zip(*samples))
+        print(f"{mode:8s}  mixer init {init_ms:7.2f} ms  first alert {first_ms:7.2f} ms  steady alert {steady_ms:7.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
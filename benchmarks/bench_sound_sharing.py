@@ -0,0 +1,112 @@
+﻿from __future__ import annotations
+
+import mmap
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+SAMPLE_RATE = 44100
+FILES = 10
+ITEMS = 200
+SECONDS = 10
+
+
+def _write_noise(path: Path) -> None:
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(2)
+        handle.setsampwidth(2)
+        handle.setframerate(SAMPLE_RATE)
+        handle.writeframes(os.urandom(SAMPLE_RATE * SECONDS * 4))
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as handle:
+        return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def _mmap_loader(file_path: str):
+    import pygame
+
+    # PCM straight out of a memory map; the files are written in the mixer's
+    # format, so the 44-byte header is the only part to skip.
+    with open(file_path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)[44:]
+        try:
+            return pygame.mixer.Sound(buffer=view)
+        finally:
+            view.release()
+
+
+def _item_paths(work_dir: Path) -> list:
+    # Items name the same files in different ways, as hand-edited configs do.
+    spellings = []
+    for index in range(ITEMS):
+        name = f"alert-{index % FILES}.wav"
+        variant = index // FILES % 3
+        if variant == 0:
+            spellings.append(str(work_dir / name))
+        elif variant == 1:
+            spellings.append(name)
+        else:
+            spellings.append(str(work_dir / "links" / name))
+    return spellings
+
+
+def _child(mode: str, work_dir: Path) -> None:
+    import pygame
+
+    import audio_manager
+
+    os.chdir(work_dir)
+    audio_manager.init_mixer()
+    paths = _item_paths(work_dir)
+    before = _rss_mb()
+    started = time.perf_counter()
+
+    if mode == "per item":
+        sounds = [pygame.mixer.Sound(path) for path in paths]
+        buffers = len(sounds)
+    else:
+        cache = audio_manager.SoundCache(budget_bytes=1 << 32, loader=_mmap_loader if mode == "shared mmap" else None)
+        for path in paths:
+            cache.pin(path)
+            cache.get(path)
+        buffers = len(cache)
+
+    load_ms = (time.perf_counter() - started) * 1000
+    print(f"{buffers} {_rss_mb() - before} {load_ms}")
+
+
+def main() -> int:
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        _child(sys.argv[2], Path(sys.argv[3]))
+        return 0
+
+    work_dir = Path(tempfile.mkdtemp(prefix="ms_timer_bench_"))
+    (work_dir / "links").mkdir()
+    for index in range(FILES):
+        _write_noise(work_dir / f"alert-{index}.wav")
+        (work_dir / "links" / f"alert-{index}.wav").symlink_to(work_dir / f"alert-{index}.wav")
+
+    print(f"{ITEMS} items -> {FILES} files of {SECONDS} s stereo 16-bit")
+    for mode in ("per item", "shared", "shared mmap"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", mode, str(work_dir)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        buffers, rss_mb, load_ms = output[-3:]
+        print(f"{mode:12s}  decoded buffers {int(buffers):4d}  RSS +{float(rss_mb):7.1f} MB  load {float(load_ms):8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,58 @@
+﻿from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PySide6.QtWidgets import QApplication
+
+import data_manager
+
+ITEM_COUNT = 5000
+
+
+def _rss_mb() -> float:
+    try:
+        import psutil
+    except ImportError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def main() -> int:
+    os.chdir(tempfile.mkdtemp(prefix="ms_timer_bench_"))
+    config = data_manager.default_config()
+    config["items"] = [data_manager._new_item(index) for index in range(ITEM_COUNT)]
+    for item in config["items"]:
+        item["hotkey"] = None
+    data_manager.save_config(config)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from main import TimerMainWindow
+
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    window = TimerMainWindow()
+    window.show()
+    app.processEvents()
+    startup_ms = (time.perf_counter() - started) * 1000
+    rss_after = _rss_mb()
+
+    print(f"items={ITEM_COUNT}")
+    print(f"startup  : {startup_ms:8.1f} ms")
+    print(f"rss delta: {rss_after - rss_before:8.1f} MiB (total {rss_after:.1f} MiB)")
+
+    window.close()
+    app.processEvents()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
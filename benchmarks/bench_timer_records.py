@@ -0,0 +1,62 @@
+﻿from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import data_manager
+from timer_core import TimerEngine, TimerItem, VirtualClock
+
+ITEM_COUNT = 50000
+ROUNDS = 5
+
+
+def _traced_bytes(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main() -> int:
+    raw_items = [data_manager._new_item(index) for index in range(ITEM_COUNT)]
+    raw_items = [dict(item, id=f"item-{index:05d}") for index, item in enumerate(raw_items)]
+
+    _dict_items, dict_bytes = _traced_bytes(lambda: [dict(item) for item in raw_items])
+    items, record_bytes = _traced_bytes(lambda: [TimerItem.from_dict(item) for item in raw_items])
+
+    clock = VirtualClock(1000.0)
+
+    def _start_all():
+        engine = TimerEngine(clock=clock)
+        for item in items:
+            engine.start_item(item)
+        return engine
+
+    _unused, start_bytes = _traced_bytes(_start_all)
+    started = time.perf_counter()
+    engine = _start_all()
+    start_ms = (time.perf_counter() - started) * 1000
+
+    tick_ms = float("inf")
+    for _ in range(ROUNDS):
+        clock.advance(1.0)
+        began = time.perf_counter()
+        engine.tick()
+        tick_ms = min(tick_ms, (time.perf_counter() - began) * 1000)
+
+    print(f"items={ITEM_COUNT}")
+    print(f"  config dict   {dict_bytes / ITEM_COUNT:8.1f} B/item")
+    print(f"  TimerItem     {record_bytes / ITEM_COUNT:8.1f} B/item")
+    print(f"  start all     {start_ms:8.1f} ms  (+{start_bytes / ITEM_COUNT:6.1f} B/item engine state)")
+    print(f"  tick          {tick_ms:8.1f} ms  (all items changed)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+﻿from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+import data_manager
+
+ITEM_COUNT = 2000
+RUNNING_COUNT = 500
+ROUNDS = 20
+
+
+def _linear_find(model, item_id: str) -> int:
+    for row in range(model.rowCount()):
+        if model.index(row, 0).data(Qt.UserRole) == item_id:
+            return row
+    return -1
+
+
+def _time_per_round(callback, rounds: int = ROUNDS) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        callback()
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main() -> int:
+    os.chdir(tempfile.mkdtemp(prefix="ms_timer_bench_"))
+    config = data_manager.default_config()
+    config["items"] = [data_manager._new_item(index) for index in range(ITEM_COUNT)]
+    for item in config["items"]:
+        item["hotkey"] = None
+    data_manager.save_config(config)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from main import TimerMainWindow
+
+    window = TimerMainWindow()
+    running_ids = [item.id for item in window.items[:: ITEM_COUNT // RUNNING_COUNT]][:RUNNING_COUNT]
+    for item_id in running_ids:
+        window._start_item(item_id)
+
+    snapshot = [(item_id, 29, 30, "running") for item_id in running_ids]
+
+    linear_ms = _time_per_round(lambda: [_linear_find(window.tree_model, item_id) for item_id in running_ids], rounds=1)
+    indexed_ms = _time_per_round(lambda: [window.tree_model.row_of(item_id) for item_id in running_ids])
+    tick_ms = _time_per_round(lambda: window._on_timers_ticked(snapshot))
+
+    print(f"items={ITEM_COUNT} running={RUNNING_COUNT}")
+    print(f"linear lookup : {linear_ms:8.2f} ms per tick")
+    print(f"indexed lookup: {indexed_ms:8.2f} ms per tick")
+    print(f"tick handler  : {tick_ms:8.2f} ms per tick")
+
+    window.timer_manager.stop_all()
+    window.hotkey_service.unregister_all()
+    app.processEvents()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
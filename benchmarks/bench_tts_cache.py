@@ -0,0 +1,47 @@
+﻿from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from audio_manager import TtsDiskCache
+
+ENTRIES = 2000
+LOOKUPS = 100_000
+
+
+def main() -> int:
+    cache_dir = Path(tempfile.mkdtemp(prefix="ms_timer_bench_"))
+    cache = TtsDiskCache(cache_dir)
+    texts = [f"提醒 {index}" for index in range(ENTRIES)]
+    for text in texts:
+        cache.path_for(text, "zh-TW").write_bytes(b"\xff" * 8000)
+        cache.add(text, "zh-TW")
+    cache.flush()
+
+    started = time.perf_counter()
+    reopened = TtsDiskCache(cache_dir)
+    len(reopened)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    paths = [reopened.path_for(text, "zh-TW") for text in texts]
+    started = time.perf_counter()
+    for index in range(LOOKUPS):
+        paths[index % ENTRIES].exists()
+    stat_us = (time.perf_counter() - started) / LOOKUPS * 1e6
+
+    started = time.perf_counter()
+    for index in range(LOOKUPS):
+        reopened.lookup(texts[index % ENTRIES], "zh-TW")
+    index_us = (time.perf_counter() - started) / LOOKUPS * 1e6
+
+    print(f"{ENTRIES} entries: load + directory scan {load_ms:.1f} ms")
+    print(f"per-alert lookup: stat {stat_us:.2f} us  index {index_us:.2f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
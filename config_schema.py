@@ -0,0 +1,66 @@
+﻿from __future__ import annotations
+
+from typing import Annotated, List, Literal, Optional
+
+import msgspec
+
+# Typed mirror of an already-normalized v2 config. Anything normalize_config
+# would still have to coerce (missing keys, strings for numbers, out-of-range
+# values) fails to decode, so a successful decode only leaves the cross-item
+# checks to the caller. Field order matches normalize_config's output.
+
+
+class ConfigItem(msgspec.Struct):
+    id: Annotated[str, msgspec.Meta(min_length=1)]
+    name: Annotated[str, msgspec.Meta(min_length=1)]
+    play_mode: Literal["文字", "音檔"]
+    tts_text: str
+    audio_path: str
+    countdown_sec: Annotated[int, msgspec.Meta(ge=1, le=359999)]
+    infinite_loop: bool
+    volume: Annotated[int, msgspec.Meta(ge=0, le=100)]
+    priority: Annotated[int, msgspec.Meta(ge=0, le=2)]
+    hotkey: Optional[Annotated[str, msgspec.Meta(min_length=1)]]
+    sort_order: int
+
+
+class GlobalHotkeys(msgspec.Struct):
+    stop_all: Annotated[str, msgspec.Meta(min_length=1)]
+    show_window: Annotated[str, msgspec.Meta(min_length=1)]
+
+
+class UiSettings(msgspec.Struct):
+    theme: str
+    language: str
+
+
+class ConfigFile(msgspec.Struct):
+    config_version: Literal[2]
+    items: List[ConfigItem]
+    global_hotkeys: GlobalHotkeys
+    ui: UiSettings
+
+
+_config_decoder = msgspec.json.Decoder(ConfigFile)
+_any_decoder = msgspec.json.Decoder()
+_encoder = msgspec.json.Encoder()
+
+
+def decode_typed(data: bytes) -> Optional[ConfigFile]:
+    try:
+        return _config_decoder.decode(data)
+    except msgspec.MsgspecError:
+        return None
+
+
+def decode(data: bytes):
+    return _any_decoder.decode(data)
+
+
+def to_dict(config: ConfigFile) -> dict:
+    return msgspec.to_builtins(config)
+
+
+def encode(app_config: dict) -> str:
+    # Same bytes as json.dumps(..., ensure_ascii=False, indent=4).
+    return msgspec.json.format(_encoder.encode(app_config), indent=4).decode("utf-8")
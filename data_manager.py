@@ -1,15 +1,44 @@
 ﻿from __future__ import annotations
 
+import hashlib
 import json
+import os
+import tempfile
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 from uuid import uuid4
 
 from hotkey_utils import canonicalize_hotkey
+from timer_core import PRIORITY_CRITICAL, PRIORITY_LOW, PRIORITY_NORMAL, TimerItem
+
+# Optional fast JSON backends. msgspec also gives typed decoding and writes
+# the same bytes as the stdlib encoder; orjson only speeds up plain decoding
+# because it cannot emit the 4-space indent older builds wrote.
+try:
+    import config_schema
+except ImportError:
+    config_schema = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 CONFIG_FILENAME = "config.json"
 CONFIG_VERSION = 2
+# Bump whenever _normalize_item / normalize_config start producing different
+# output, so files stamped by an older build go through full validation again.
+NORMALIZER_REVISION = 2
+FINGERPRINT_KEY = "fingerprint"
+_FINGERPRINT_PREFIX = f',\n    "{FINGERPRINT_KEY}": "'.encode("utf-8")
+_FINGERPRINT_SUFFIX = b'"\n}'
+CONFIG_WRITE_DELAY_SEC = 0.5
+CONFIG_WRITE_MAX_DELAY_SEC = 2.0
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_COMPACT_RECORDS = 500
 
 DEFAULT_GLOBAL_HOTKEYS = {
     "stop_all": "Ctrl+Shift+S",
@@ -47,6 +76,7 @@ def _new_item(index: int) -> dict:
         "countdown_sec": 30,
         "infinite_loop": False,
         "volume": 80,
+        "priority": PRIORITY_NORMAL,
         "hotkey": f"Ctrl+F{index + 1}" if index < 12 else None,
         "sort_order": index,
     }
@@ -85,6 +115,7 @@ def _normalize_item(raw_item: Any, fallback_index: int) -> dict:
     countdown_sec = _clamp(_safe_int(countdown_candidate, 30), 1, 359999)
 
     volume = _clamp(_safe_int(raw_item.get("volume", 80), 80), 0, 100)
+    priority = _clamp(_safe_int(raw_item.get("priority", PRIORITY_NORMAL), PRIORITY_NORMAL), PRIORITY_LOW, PRIORITY_CRITICAL)
     sort_order = _safe_int(raw_item.get("sort_order", fallback_index), fallback_index)
 
     raw_hotkey = raw_item.get("hotkey")
@@ -99,6 +130,7 @@ def _normalize_item(raw_item: Any, fallback_index: int) -> dict:
         "countdown_sec": countdown_sec,
         "infinite_loop": bool(raw_item.get("infinite_loop", False)),
         "volume": volume,
+        "priority": priority,
         "hotkey": hotkey,
         "sort_order": sort_order,
     }
@@ -166,35 +198,394 @@ def normalize_config(raw_config: Any) -> dict:
     }
 
 
+def _decode_json(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    if config_schema is not None:
+        return config_schema.decode(data)
+    return json.loads(data)
+
+
+def _encode_config_text(app_config: dict) -> str:
+    if config_schema is not None:
+        return config_schema.encode(app_config)
+    return json.dumps(app_config, ensure_ascii=False, indent=4)
+
+
+def _config_to_builtins(app_config: dict) -> dict:
+    # The live config holds TimerItem records; only their config fields are saved.
+    # sort_order is written from list position: deletes leave gaps and adds
+    # append at len(items), but a fingerprinted file must load as normalized.
+    items = []
+    for index, item in enumerate(app_config.get("items", [])):
+        record = item.to_dict() if isinstance(item, TimerItem) else dict(item)
+        record["sort_order"] = index
+        items.append(record)
+    return {**app_config, "items": items}
+
+
+def _journal_default(value: Any) -> dict:
+    if isinstance(value, TimerItem):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _is_normalized(typed_config: Any) -> bool:
+    # Cross-item rules the typed schema cannot express on its own.
+    seen_ids = set()
+    for index, item in enumerate(typed_config.items):
+        if item.sort_order != index or item.id in seen_ids or item.name != item.name.strip():
+            return False
+        if item.hotkey is not None and canonicalize_hotkey(item.hotkey) != item.hotkey:
+            return False
+        seen_ids.add(item.id)
+
+    global_hotkeys = typed_config.global_hotkeys
+    return (
+        canonicalize_hotkey(global_hotkeys.stop_all) == global_hotkeys.stop_all
+        and canonicalize_hotkey(global_hotkeys.show_window) == global_hotkeys.show_window
+    )
+
+
+def _config_fingerprint(*body_parts: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in body_parts:
+        digest.update(part)
+    return f"{CONFIG_VERSION}.{NORMALIZER_REVISION}:{digest.hexdigest()}"
+
+
+def _stamp_fingerprint(body_text: str) -> str:
+    # The fingerprint is appended as the last key and hashes the text before
+    # it, so checking it on load is one hash over the file instead of
+    # re-serializing or re-validating the whole config.
+    if not body_text.endswith("\n}"):
+        return body_text
+    fingerprint = _config_fingerprint(body_text.encode("utf-8"))
+    return f'{body_text[:-2]},\n    "{FINGERPRINT_KEY}": "{fingerprint}"\n}}'
+
+
+def _has_valid_fingerprint(data: bytes) -> bool:
+    entry_start = data.rfind(_FINGERPRINT_PREFIX)
+    if entry_start < 0 or not data.endswith(_FINGERPRINT_SUFFIX):
+        return False
+
+    fingerprint = data[entry_start + len(_FINGERPRINT_PREFIX) : -len(_FINGERPRINT_SUFFIX)]
+    body = memoryview(data)[:entry_start]
+    return fingerprint == _config_fingerprint(body, b"\n}").encode("ascii")
+
+
+def _load_clean_config(data: bytes, trusted: bool) -> dict | None:
+    # A file whose fingerprint matches was written from an already-normalized
+    # config by this schema revision. Without one, the typed decoder (when
+    # msgspec is installed) can still prove the file needs no normalization.
+    if trusted:
+        raw = _decode_json(data)
+        if isinstance(raw, dict):
+            raw.pop(FINGERPRINT_KEY, None)
+            return raw
+        return None
+
+    if config_schema is None:
+        return None
+    typed_config = config_schema.decode_typed(data)
+    if typed_config is None or not _is_normalized(typed_config):
+        return None
+    return config_schema.to_dict(typed_config)
+
+
+def _journal_path() -> Path:
+    config_path = Path(CONFIG_FILENAME)
+    return config_path.with_name(config_path.name + JOURNAL_SUFFIX)
+
+
+def load_journal() -> list:
+    journal_path = _journal_path()
+    if not journal_path.exists():
+        return []
+
+    records = []
+    for line in journal_path.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # A crash during an append can only tear the last line.
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return records
+
+
+def append_journal(records: list) -> None:
+    if not records:
+        return
+
+    journal_path = _journal_path()
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = "".join(
+        json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=_journal_default) + "\n"
+        for record in records
+    )
+    with open(journal_path, "a", encoding="utf-8", newline="") as handle:
+        handle.write(payload)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def clear_journal() -> None:
+    _journal_path().unlink(missing_ok=True)
+
+
+def compact_journal(app_config: dict) -> None:
+    # The snapshot is replaced first; replaying an old journal over the new
+    # snapshot is harmless if the process dies before the journal is removed.
+    save_config(app_config)
+    clear_journal()
+
+
+def _replay_journal(app_config: dict, records: list) -> bool:
+    if not records:
+        return False
+
+    items = app_config["items"]
+    index_by_id = {item["id"]: index for index, item in enumerate(items)}
+    removed_ids = set()
+    changed = False
+
+    for record in records:
+        op = record.get("op")
+        if op == "item" and isinstance(record.get("item"), dict):
+            item = _normalize_item(record["item"], len(items))
+            index = index_by_id.get(item["id"])
+            if index is None:
+                index_by_id[item["id"]] = len(items)
+                items.append(item)
+            else:
+                items[index] = item
+            removed_ids.discard(item["id"])
+            changed = True
+        elif op == "remove" and record.get("id") in index_by_id:
+            removed_ids.add(record["id"])
+            changed = True
+
+    if removed_ids:
+        items[:] = [item for item in items if item["id"] not in removed_ids]
+    return changed
+
+
 def load_config() -> dict:
     config_path = Path(CONFIG_FILENAME)
 
     if not config_path.exists():
         config = default_config()
-        save_config(config)
+        compact_journal(config)
         return config
 
     try:
-        raw = json.loads(config_path.read_text(encoding="utf-8"))
+        data = config_path.read_bytes()
+        trusted = _has_valid_fingerprint(data)
+        clean_config = _load_clean_config(data, trusted)
+        raw = clean_config if clean_config is not None else _decode_json(data)
     except Exception:
         _backup_file(config_path, "broken")
         config = default_config()
-        save_config(config)
+        compact_journal(config)
         return config
 
     if isinstance(raw, list):
         _backup_file(config_path, "v1")
         config = migrate_legacy_list(raw)
-        save_config(config)
+        compact_journal(config)
         return config
 
-    normalized = normalize_config(raw)
-    if raw != normalized:
-        save_config(normalized)
+    normalized = clean_config if clean_config is not None else normalize_config(raw)
+    needs_rewrite = not trusted
+
+    journal_records = load_journal()
+    if _replay_journal(normalized, journal_records):
+        for index, item in enumerate(normalized["items"]):
+            item["sort_order"] = index
+        compact_journal(normalized)
+    elif needs_rewrite:
+        # Also stamps a fingerprint on hand-edited or older files so the next
+        # start can take the fast path.
+        compact_journal(normalized)
+    elif journal_records:
+        clear_journal()
     return normalized
 
 
+def _fsync_directory(directory: Path) -> None:
+    if os.name != "posix":
+        return
+
+    directory_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(directory_fd)
+    finally:
+        os.close(directory_fd)
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    # Write to a sibling temp file, fsync it and rename it over the target so a
+    # crash leaves either the previous file or the complete new one.
+    file_descriptor, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    temp_path = Path(temp_name)
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8", newline="") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    _fsync_directory(path.parent)
+
+
 def save_config(app_config: dict) -> None:
     config_path = Path(CONFIG_FILENAME)
     config_path.parent.mkdir(parents=True, exist_ok=True)
-    config_path.write_text(json.dumps(app_config, ensure_ascii=False, indent=4), encoding="utf-8")
+    body_text = _encode_config_text(_config_to_builtins(app_config))
+    _atomic_write_text(config_path, _stamp_fingerprint(body_text))
+
+
+class ConfigWriter:
+    def __init__(
+        self,
+        delay_sec: float = CONFIG_WRITE_DELAY_SEC,
+        max_delay_sec: float = CONFIG_WRITE_MAX_DELAY_SEC,
+        journal: bool = False,
+        compact_after: int = JOURNAL_COMPACT_RECORDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._delay_sec = delay_sec
+        self._max_delay_sec = max(delay_sec, max_delay_sec)
+        self._journal = journal
+        self._compact_after = compact_after
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._pending: dict | None = None
+        # item_id -> latest journal record for that item.
+        self._dirty_items: dict[str, dict] = {}
+        self._config: dict | None = None
+        self._journal_records = 0
+        self._first_scheduled_at = 0.0
+        self._due_at = 0.0
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="config-writer", daemon=True)
+        self._thread.start()
+
+    def schedule(self, app_config: dict) -> None:
+        with self._condition:
+            if self._closed:
+                return
+
+            self._pending = app_config
+            self._config = app_config
+            self._dirty_items.clear()
+            self._mark_due()
+
+    def schedule_item(self, app_config: dict, item: TimerItem) -> None:
+        if not self._journal:
+            self.schedule(app_config)
+            return
+
+        with self._condition:
+            if self._closed:
+                return
+
+            self._config = app_config
+            # A pending snapshot already serializes the live item.
+            if self._pending is None:
+                self._dirty_items[item.id] = {"op": "item", "item": item}
+            self._mark_due()
+
+    def schedule_removal(self, app_config: dict, item_id: str) -> None:
+        if not self._journal:
+            self.schedule(app_config)
+            return
+
+        with self._condition:
+            if self._closed:
+                return
+
+            self._config = app_config
+            if self._pending is None:
+                self._dirty_items[item_id] = {"op": "remove", "id": item_id}
+            self._mark_due()
+
+    def flush(self) -> None:
+        with self._condition:
+            pending, records = self._take_pending()
+
+        # Taking the write lock also waits for a write already running on the worker.
+        with self._write_lock:
+            self._write(pending, records)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+
+        with self._write_lock:
+            if self._journal_records and self._config is not None:
+                self._compact(self._config)
+
+    def _mark_due(self) -> None:
+        now = self._clock()
+        if not self._has_pending():
+            self._first_scheduled_at = now
+        self._due_at = min(now + self._delay_sec, self._first_scheduled_at + self._max_delay_sec)
+        self._condition.notify()
+
+    def _has_pending(self) -> bool:
+        return self._pending is not None or bool(self._dirty_items)
+
+    def _take_pending(self) -> tuple[dict | None, list]:
+        pending, self._pending = self._pending, None
+        records = list(self._dirty_items.values())
+        self._dirty_items.clear()
+        return pending, records
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and (not self._has_pending() or self._clock() < self._due_at):
+                    timeout = self._due_at - self._clock() if self._has_pending() else None
+                    self._condition.wait(timeout)
+
+                if self._closed:
+                    return
+                pending, records = self._take_pending()
+                self._write_lock.acquire()
+
+            try:
+                self._write(pending, records)
+            finally:
+                self._write_lock.release()
+
+    def _write(self, pending: dict | None, records: list) -> None:
+        # The GUI thread may keep editing while this serializes; every edit schedules
+        # another write, so the last write always carries the final state.
+        try:
+            if pending is not None:
+                if self._journal:
+                    self._compact(pending)
+                else:
+                    save_config(pending)
+            elif records:
+                append_journal(records)
+                self._journal_records += len(records)
+                if self._journal_records >= self._compact_after and self._config is not None:
+                    self._compact(self._config)
+        except Exception as exc:
+            print(f"儲存設定失敗: {exc}")
+
+    def _compact(self, app_config: dict) -> None:
+        compact_journal(app_config)
+        self._journal_records = 0
@@ -3,11 +3,11 @@
 import ctypes
 from ctypes import wintypes
 from dataclasses import dataclass
-from typing import Callable, Dict
+from typing import Callable, Iterable, List, Tuple
 
 from PySide6.QtCore import QAbstractNativeEventFilter, QObject, Signal
 
-from hotkey_utils import canonicalize_hotkey, hotkey_to_vk_and_modifiers
+from hotkey_utils import HotkeyRegistration, HotkeyRegistry, parse_hotkey
 
 WM_HOTKEY = 0x0312
 USER32 = ctypes.windll.user32
@@ -25,13 +25,6 @@ class HotkeyRegisterResult:
     canonical_hotkey: str | None = None
 
 
-@dataclass
-class _Registration:
-    token: str
-    hotkey: str
-    hotkey_id: int
-
-
 class _NativeHotkeyEventFilter(QAbstractNativeEventFilter):
     def __init__(self, on_hotkey: Callable[[int], None]) -> None:
         super().__init__()
@@ -61,13 +54,16 @@ class GlobalHotkeyService(QObject):
         self._event_filter = _NativeHotkeyEventFilter(self._handle_hotkey_id)
         self._app.installNativeEventFilter(self._event_filter)
 
-        self._next_hotkey_id = 1000
-        self._token_to_registration: Dict[str, _Registration] = {}
-        self._id_to_token: Dict[int, str] = {}
+        self._registry = HotkeyRegistry()
 
     def register_item_hotkey(self, item_id: str, hotkey_str: str) -> HotkeyRegisterResult:
         return self.register_hotkey(f"item:{item_id}", hotkey_str)
 
+    def register_item_hotkeys(self, bindings: Iterable[Tuple[str, str]]) -> List[Tuple[str, HotkeyRegisterResult]]:
+        # One result per (item_id, hotkey) binding, so the caller can report
+        # every failure at once; the first binding of a combo wins.
+        return [(item_id, self.register_hotkey(f"item:{item_id}", hotkey_str)) for item_id, hotkey_str in bindings]
+
     def unregister_item_hotkey(self, item_id: str) -> None:
         self.unregister_token(f"item:{item_id}")
 
@@ -83,64 +79,38 @@ class GlobalHotkeyService(QObject):
         return HotkeyRegisterResult(True)
 
     def register_hotkey(self, token: str, hotkey_str: str) -> HotkeyRegisterResult:
-        canonical = canonicalize_hotkey(hotkey_str)
-        if canonical is None:
+        parsed = parse_hotkey(hotkey_str)
+        if parsed is None:
             return HotkeyRegisterResult(False, "熱鍵格式不支援")
+        canonical, vk, modifiers = parsed
 
-        for existing_token, registration in self._token_to_registration.items():
-            if existing_token != token and registration.hotkey == canonical:
-                return HotkeyRegisterResult(False, f"熱鍵 {canonical} 已被其他項目使用")
-
-        existing = self._token_to_registration.get(token)
-        if existing and existing.hotkey == canonical:
+        owner = self._registry.owner(vk, modifiers)
+        if owner == token:
             return HotkeyRegisterResult(True, canonical_hotkey=canonical)
+        if owner is not None:
+            return HotkeyRegisterResult(False, f"熱鍵 {canonical} 已被其他項目使用")
 
-        if existing:
-            self._unregister_registration(existing)
-
-        vk_result = hotkey_to_vk_and_modifiers(canonical)
-        if vk_result is None:
-            return HotkeyRegisterResult(False, "熱鍵格式不支援")
-
-        vk, modifiers = vk_result
-        hotkey_id = self._allocate_hotkey_id()
+        self.unregister_token(token)
 
+        hotkey_id = self._registry.allocate_id()
         success = USER32.RegisterHotKey(None, hotkey_id, modifiers, vk)
         if not success:
             error_code = ctypes.GetLastError()
             return HotkeyRegisterResult(False, f"RegisterHotKey 失敗，系統錯誤碼 {error_code}")
 
-        registration = _Registration(token=token, hotkey=canonical, hotkey_id=hotkey_id)
-        self._token_to_registration[token] = registration
-        self._id_to_token[hotkey_id] = token
+        self._registry.add(HotkeyRegistration(token, canonical, vk, modifiers, hotkey_id))
         return HotkeyRegisterResult(True, canonical_hotkey=canonical)
 
     def unregister_token(self, token: str) -> None:
-        registration = self._token_to_registration.pop(token, None)
-        if registration is None:
-            return
-
-        self._id_to_token.pop(registration.hotkey_id, None)
-        USER32.UnregisterHotKey(None, registration.hotkey_id)
+        registration = self._registry.remove(token)
+        if registration is not None:
+            USER32.UnregisterHotKey(None, registration.hotkey_id)
 
     def unregister_all(self) -> None:
-        for registration in list(self._token_to_registration.values()):
-            self._unregister_registration(registration)
-        self._token_to_registration.clear()
-        self._id_to_token.clear()
-
-    def _unregister_registration(self, registration: _Registration) -> None:
-        self._id_to_token.pop(registration.hotkey_id, None)
-        USER32.UnregisterHotKey(None, registration.hotkey_id)
-
-    def _allocate_hotkey_id(self) -> int:
-        while self._next_hotkey_id in self._id_to_token:
-            self._next_hotkey_id += 1
-        value = self._next_hotkey_id
-        self._next_hotkey_id += 1
-        return value
+        for registration in self._registry.clear():
+            USER32.UnregisterHotKey(None, registration.hotkey_id)
 
     def _handle_hotkey_id(self, hotkey_id: int) -> None:
-        token = self._id_to_token.get(hotkey_id)
+        token = self._registry.token_for_id(hotkey_id)
         if token:
             self.hotkey_triggered.emit(token)
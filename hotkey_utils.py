@@ -1,12 +1,19 @@
 ﻿from __future__ import annotations
 
-from typing import Optional, Tuple
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 MOD_ALT = 0x0001
 MOD_CONTROL = 0x0002
 MOD_SHIFT = 0x0004
 
 MODIFIER_ORDER = ("Ctrl", "Alt", "Shift")
+MODIFIER_FLAGS = {"Ctrl": MOD_CONTROL, "Alt": MOD_ALT, "Shift": MOD_SHIFT}
+# Raw spellings seen in config, recorder and registration; bounded so odd
+# user input cannot grow it without limit.
+HOTKEY_CACHE_SIZE = 1024
 
 
 def _normalize_modifier(token: str) -> Optional[str]:
@@ -33,7 +40,39 @@ def _normalize_base_key(token: str) -> Optional[str]:
     return None
 
 
+class Hotkey(NamedTuple):
+    # Parsed, immutable hotkey; unpacks as (canonical, vk, modifiers).
+    canonical: str
+    vk: int
+    modifiers: int
+
+    def __str__(self) -> str:
+        return self.canonical
+
+
+@lru_cache(maxsize=HOTKEY_CACHE_SIZE)
+def parse_hotkey(hotkey_str: str) -> Optional[Hotkey]:
+    # One pass from user input to (canonical, vk, modifiers), memoized per raw
+    # string. Canonical strings are interned so equal hotkeys share one object.
+    canonical = _canonicalize(hotkey_str)
+    if canonical is None:
+        return None
+
+    *modifier_tokens, key = canonical.split("+")
+    modifiers = 0
+    for token in modifier_tokens:
+        modifiers |= MODIFIER_FLAGS[token]
+    # "F" alone is the letter key, not a function key.
+    vk = 0x70 + int(key[1:]) - 1 if len(key) > 1 else ord(key)
+    return Hotkey(sys.intern(canonical), vk, modifiers)
+
+
 def canonicalize_hotkey(hotkey_str: str) -> Optional[str]:
+    parsed = parse_hotkey(hotkey_str)
+    return parsed.canonical if parsed is not None else None
+
+
+def _canonicalize(hotkey_str: str) -> Optional[str]:
     if not hotkey_str:
         return None
 
@@ -65,31 +104,72 @@ def canonicalize_hotkey(hotkey_str: str) -> Optional[str]:
 
 
 def hotkey_to_vk_and_modifiers(hotkey_str: str) -> Optional[Tuple[int, int]]:
-    canonical = canonicalize_hotkey(hotkey_str)
-    if canonical is None:
+    parsed = parse_hotkey(hotkey_str)
+    if parsed is None:
         return None
-
-    parts = canonical.split("+")
-    key = parts[-1]
-    modifier_tokens = parts[:-1]
-
-    modifiers = 0
-    if "Alt" in modifier_tokens:
-        modifiers |= MOD_ALT
-    if "Ctrl" in modifier_tokens:
-        modifiers |= MOD_CONTROL
-    if "Shift" in modifier_tokens:
-        modifiers |= MOD_SHIFT
-
-    if key.startswith("F"):
-        vk = 0x70 + int(key[1:]) - 1
-    elif key.isdigit():
-        vk = ord(key)
-    else:
-        vk = ord(key)
-
-    return vk, modifiers
+    return parsed.vk, parsed.modifiers
 
 
 def is_supported_hotkey(hotkey_str: str) -> bool:
-    return canonicalize_hotkey(hotkey_str) is not None
+    return parse_hotkey(hotkey_str) is not None
+
+
+@dataclass
+class HotkeyRegistration:
+    token: str
+    hotkey: str
+    vk: int
+    modifiers: int
+    hotkey_id: int
+
+
+class HotkeyRegistry:
+    # Bookkeeping for registered hotkeys, indexed by token, by the
+    # (vk, modifiers) pair the OS sees and by hotkey id, so conflict checks
+    # and WM_HOTKEY lookups are O(1). Platform calls stay with the caller.
+
+    def __init__(self, first_hotkey_id: int = 1000) -> None:
+        self._next_hotkey_id = first_hotkey_id
+        self._by_token: Dict[str, HotkeyRegistration] = {}
+        self._by_combo: Dict[Tuple[int, int], HotkeyRegistration] = {}
+        self._by_id: Dict[int, HotkeyRegistration] = {}
+
+    def get(self, token: str) -> Optional[HotkeyRegistration]:
+        return self._by_token.get(token)
+
+    def owner(self, vk: int, modifiers: int) -> Optional[str]:
+        registration = self._by_combo.get((vk, modifiers))
+        return registration.token if registration is not None else None
+
+    def token_for_id(self, hotkey_id: int) -> Optional[str]:
+        registration = self._by_id.get(hotkey_id)
+        return registration.token if registration is not None else None
+
+    def allocate_id(self) -> int:
+        while self._next_hotkey_id in self._by_id:
+            self._next_hotkey_id += 1
+        value = self._next_hotkey_id
+        self._next_hotkey_id += 1
+        return value
+
+    def add(self, registration: HotkeyRegistration) -> None:
+        self._by_token[registration.token] = registration
+        self._by_combo[(registration.vk, registration.modifiers)] = registration
+        self._by_id[registration.hotkey_id] = registration
+
+    def remove(self, token: str) -> Optional[HotkeyRegistration]:
+        registration = self._by_token.pop(token, None)
+        if registration is not None:
+            self._by_combo.pop((registration.vk, registration.modifiers), None)
+            self._by_id.pop(registration.hotkey_id, None)
+        return registration
+
+    def clear(self) -> List[HotkeyRegistration]:
+        registrations = list(self._by_token.values())
+        self._by_token.clear()
+        self._by_combo.clear()
+        self._by_id.clear()
+        return registrations
+
+    def __len__(self) -> int:
+        return len(self._by_token)
@@ -1,11 +1,10 @@
 ﻿from __future__ import annotations
 
-import copy
 import sys
 from uuid import uuid4
 
-from PySide6.QtCore import Qt, Signal, QUrl
-from PySide6.QtGui import QColor, QCloseEvent, QDesktopServices, QCursor
+from PySide6.QtCore import Qt, Signal, QItemSelectionModel, QTimer, QUrl
+from PySide6.QtGui import QCloseEvent, QDesktopServices, QCursor
 from PySide6.QtWidgets import (
     QApplication,
     QAbstractItemView,
@@ -23,52 +22,25 @@ from PySide6.QtWidgets import (
     QPushButton,
     QSlider,
     QSpinBox,
-    QTreeWidget,
-    QTreeWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
-from data_manager import load_config, save_config
+from audio_manager import AUDIO_DISPATCHER, SOUND_CACHE, TTS_CACHE, SoundPreloader, TtsPrefetcher, start_mixer_init
+from data_manager import ConfigWriter, load_config
 from hotkey_manager import GlobalHotkeyService
-from hotkey_utils import canonicalize_hotkey
+from hotkey_utils import parse_hotkey
+from timer_core import PRIORITY_CRITICAL, PRIORITY_LOW, PRIORITY_NORMAL, TimerItem
+from timer_list_model import (
+    STATE_COLORS,
+    STATE_LABELS,
+    RowActionDelegate,
+    TimerListModel,
+    TimerTableView,
+    format_seconds,
+)
 from timer_manager import TimerManager
 
-STATE_LABELS = {
-    TimerManager.STATE_IDLE: "Idle",
-    TimerManager.STATE_RUNNING: "Running",
-    TimerManager.STATE_LOOPING: "Looping",
-    TimerManager.STATE_STOPPED: "Stopped",
-}
-
-STATE_COLORS = {
-    TimerManager.STATE_IDLE: "#5f7388",
-    TimerManager.STATE_RUNNING: "#00c896",
-    TimerManager.STATE_LOOPING: "#4aa3ff",
-    TimerManager.STATE_STOPPED: "#ff5d73",
-}
-
-
-def format_seconds(total_seconds: int) -> str:
-    safe_value = max(0, int(total_seconds))
-    minute = safe_value // 60
-    second = safe_value % 60
-    return f"{minute:02d}:{second:02d}"
-
-
-class ReorderableTreeWidget(QTreeWidget):
-    order_changed = Signal(list)
-
-    def dropEvent(self, event) -> None:
-        super().dropEvent(event)
-        ordered_ids = []
-        for index in range(self.topLevelItemCount()):
-            item = self.topLevelItem(index)
-            item_id = item.data(0, Qt.UserRole)
-            if item_id:
-                ordered_ids.append(item_id)
-        self.order_changed.emit(ordered_ids)
-
 
 class HotkeyRecorderLineEdit(QLineEdit):
     hotkey_captured = Signal(str)
@@ -121,29 +93,62 @@ class HotkeyRecorderLineEdit(QLineEdit):
 
 
 class TimerMainWindow(QMainWindow):
+    # (audio path, error message or "") from the preload worker thread.
+    audio_preloaded = Signal(str, str)
+
     REPO_URL = "https://github.com/T4ngL3m0n/maple_story_timer"
     APP_VERSION = "v1.0.1"
     DEFAULT_WINDOW_WIDTH = 1280
     DEFAULT_WINDOW_HEIGHT = 760
     MIN_WINDOW_WIDTH = 900
     MIN_WINDOW_HEIGHT = 620
+    TTS_PREFETCH_DELAY_MS = 800
 
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle(f"Maple Story Timer {self.APP_VERSION} | by L3m0nT4ng")
         self.resize(self.DEFAULT_WINDOW_WIDTH, self.DEFAULT_WINDOW_HEIGHT)
 
+        # Opens the audio device while the window builds, not on the first alert.
+        start_mixer_init()
+
         self.config = load_config()
-        self.items = sorted(self.config.get("items", []), key=lambda item: item.get("sort_order", 0))
+        self.config_writer = ConfigWriter(journal=True)
+        self.items = [
+            TimerItem.from_dict(item)
+            for item in sorted(self.config.get("items", []), key=lambda item: item.get("sort_order", 0))
+        ]
+        self.config["items"] = self.items
         self._rebuild_item_lookup()
 
         self.timer_manager = TimerManager(self)
         self.timer_manager.timer_tick.connect(self._on_timer_tick)
+        self.timer_manager.timers_ticked.connect(self._on_timers_ticked)
         self.timer_manager.timer_state_changed.connect(self._on_timer_state_changed)
+        self.timer_manager.set_visible_items(self._visible_timer_items)
 
         self.hotkey_service = GlobalHotkeyService(QApplication.instance())
         self.hotkey_service.hotkey_triggered.connect(self._on_hotkey_triggered)
 
+        # Synthesize TTS ahead of time so an alert only has to play a cached file.
+        self.tts_prefetcher = TtsPrefetcher()
+        self.tts_prefetcher.prefetch(item.tts_text for item in self.items if item.play_mode == "文字")
+        self._tts_prefetch_timer = QTimer(self)
+        self._tts_prefetch_timer.setSingleShot(True)
+        self._tts_prefetch_timer.setInterval(self.TTS_PREFETCH_DELAY_MS)
+        self._tts_prefetch_timer.timeout.connect(self._prefetch_current_tts)
+
+        # item_id -> audio path pinned in the decoded-sound cache.
+        self._pinned_sound_paths: dict[str, str] = {}
+        for item in self.items:
+            self._sync_sound_pin(item)
+
+        # Decode every audio file now, so a missing or broken file shows up in
+        # the editor instead of at the alert, and the alert reads no disk.
+        self.audio_preloaded.connect(self._on_audio_preloaded)
+        self.sound_preloader = SoundPreloader(on_result=lambda path, error: self.audio_preloaded.emit(path, error or ""))
+        self.sound_preloader.preload(item.audio_path for item in self.items if item.play_mode == "音檔")
+
         self._loading_editor = False
 
         self._build_ui()
@@ -153,7 +158,7 @@ class TimerMainWindow(QMainWindow):
         self._register_item_hotkeys()
 
         if self.items:
-            self._select_item(self.items[0]["id"])
+            self._select_item(self.items[0].id)
         else:
             self._clear_editor()
             self._update_focus_panel(None)
@@ -204,9 +209,14 @@ class TimerMainWindow(QMainWindow):
         left_title.setObjectName("panelTitle")
         left_layout.addWidget(left_title)
 
-        self.tree = ReorderableTreeWidget()
-        self.tree.setColumnCount(5)
-        self.tree.setHeaderLabels(["名稱", "剩餘 / 總時", "狀態", "熱鍵", "操作"])
+        self.tree_model = TimerListModel(self.timer_manager, self)
+        self.action_delegate = RowActionDelegate(self)
+        self.action_delegate.start_clicked.connect(self._start_item)
+        self.action_delegate.stop_clicked.connect(self._stop_item)
+
+        self.tree = TimerTableView()
+        self.tree.setModel(self.tree_model)
+        self.tree.setItemDelegateForColumn(TimerListModel.COLUMN_ACTIONS, self.action_delegate)
         self.tree.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.tree.setSelectionMode(QAbstractItemView.SingleSelection)
         self.tree.setEditTriggers(QAbstractItemView.NoEditTriggers)
@@ -216,18 +226,26 @@ class TimerMainWindow(QMainWindow):
         self.tree.setAcceptDrops(True)
         self.tree.setDropIndicatorShown(True)
         self.tree.setAlternatingRowColors(True)
-        self.tree.setRootIsDecorated(False)
-        self.tree.setUniformRowHeights(True)
 
-        header = self.tree.header()
+        # Fixed widths sized for the widest possible text; ResizeToContents would
+        # query every row of the model whenever a cell changes.
+        metrics = self.tree.fontMetrics()
+        header = self.tree.horizontalHeader()
+        header.setStretchLastSection(False)
         header.setSectionResizeMode(0, QHeaderView.Stretch)
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)
-
-        self.tree.itemSelectionChanged.connect(self._on_selection_changed)
-        self.tree.order_changed.connect(self._on_order_changed)
+        column_samples = {
+            TimerListModel.COLUMN_TIME: "9999:59 / 9999:59",
+            TimerListModel.COLUMN_STATE: "Stopped",
+            TimerListModel.COLUMN_HOTKEY: "Ctrl+Alt+Shift+F12",
+        }
+        for column, sample in column_samples.items():
+            header.setSectionResizeMode(column, QHeaderView.Fixed)
+            header.resizeSection(column, max(metrics.horizontalAdvance(sample) + 24, header.sectionSizeHint(column)))
+        header.setSectionResizeMode(TimerListModel.COLUMN_ACTIONS, QHeaderView.Fixed)
+        header.resizeSection(TimerListModel.COLUMN_ACTIONS, self.action_delegate.column_width())
+
+        self.tree.selectionModel().selectionChanged.connect(self._on_selection_changed)
+        self.tree_model.order_changed.connect(self._on_order_changed)
         left_layout.addWidget(self.tree)
 
         list_actions = QHBoxLayout()
@@ -338,6 +356,7 @@ class TimerMainWindow(QMainWindow):
         self.edit_audio_path = QLineEdit()
         self.edit_audio_path.setPlaceholderText("音檔路徑")
         self.edit_audio_path.textEdited.connect(self._on_editor_changed)
+        self.edit_audio_path.editingFinished.connect(self._preload_current_audio)
         self.btn_browse_audio = QPushButton("瀏覽")
         self.btn_browse_audio.clicked.connect(self._browse_audio)
 
@@ -348,6 +367,11 @@ class TimerMainWindow(QMainWindow):
         audio_layout.addWidget(self.btn_browse_audio)
         form_layout.addRow("音檔路徑", self.audio_container)
 
+        self.lbl_audio_status = QLabel("")
+        self.lbl_audio_status.setObjectName("error")
+        self.lbl_audio_status.setVisible(False)
+        form_layout.addRow("", self.lbl_audio_status)
+
         countdown_container = QWidget()
         countdown_layout = QHBoxLayout(countdown_container)
         countdown_layout.setContentsMargins(0, 0, 0, 0)
@@ -387,6 +411,14 @@ class TimerMainWindow(QMainWindow):
         self.chk_infinite.toggled.connect(self._on_editor_changed)
         form_layout.addRow("循環", self.chk_infinite)
 
+        # Higher priority keeps its channel when many alerts sound at once;
+        # 重要 may also use the reserved channels.
+        self.combo_priority = QComboBox()
+        for label, priority in (("低", PRIORITY_LOW), ("一般", PRIORITY_NORMAL), ("重要", PRIORITY_CRITICAL)):
+            self.combo_priority.addItem(label, priority)
+        self.combo_priority.currentIndexChanged.connect(self._on_editor_changed)
+        form_layout.addRow("優先度", self.combo_priority)
+
         self.edit_hotkey = HotkeyRecorderLineEdit()
         self.edit_hotkey.hotkey_captured.connect(self._on_hotkey_captured)
         self.edit_hotkey.hotkey_cleared.connect(self._on_hotkey_cleared)
@@ -452,6 +484,10 @@ class TimerMainWindow(QMainWindow):
                 font-size: 12px;
                 color: #7f96af;
             }
+            QLabel#error {
+                font-size: 12px;
+                color: #ff7b7b;
+            }
             QLabel#sourceLink {
                 font-size: 12px;
                 color: #7f96af;
@@ -463,7 +499,7 @@ class TimerMainWindow(QMainWindow):
             QLabel#sourceLink a:hover {
                 color: #c6ebff;
             }
-            QTreeWidget {
+            QTableView {
                 background: #0d1723;
                 border: 1px solid #1f3043;
                 border-radius: 8px;
@@ -519,96 +555,45 @@ class TimerMainWindow(QMainWindow):
             """
         )
     def _rebuild_item_lookup(self) -> None:
-        self.item_lookup = {item["id"]: item for item in self.items}
+        self.item_lookup = {item.id: item for item in self.items}
 
     def _refresh_tree(self, selected_item_id: str | None = None) -> None:
         if selected_item_id is None:
             selected_item_id = self._current_item_id()
 
-        self.tree.blockSignals(True)
-        self.tree.clear()
-
-        for item in self.items:
-            tree_item = QTreeWidgetItem()
-            tree_item.setFlags(
-                tree_item.flags()
-                | Qt.ItemIsSelectable
-                | Qt.ItemIsEnabled
-                | Qt.ItemIsDragEnabled
-                | Qt.ItemIsDropEnabled
-            )
-            tree_item.setData(0, Qt.UserRole, item["id"])
-            self.tree.addTopLevelItem(tree_item)
-            self._attach_row_action_buttons(tree_item, item["id"])
-            self._update_row_visuals(item["id"], tree_item)
-
-        self.tree.blockSignals(False)
+        self.tree.selectionModel().blockSignals(True)
+        self.tree_model.set_items(self.items)
+        self.tree.selectionModel().blockSignals(False)
 
         if not self.items:
             self._clear_editor()
             self._update_focus_panel(None)
             return
 
-        target_id = selected_item_id if selected_item_id in self.item_lookup else self.items[0]["id"]
+        target_id = selected_item_id if selected_item_id in self.item_lookup else self.items[0].id
         self._select_item(target_id)
 
-    def _attach_row_action_buttons(self, tree_item: QTreeWidgetItem, item_id: str) -> None:
-        action_widget = QWidget()
-        action_layout = QHBoxLayout(action_widget)
-        action_layout.setContentsMargins(0, 0, 0, 0)
-        action_layout.setSpacing(4)
-
-        btn_start = QPushButton("開始")
-        btn_start.setFixedWidth(54)
-        btn_stop = QPushButton("停止")
-        btn_stop.setFixedWidth(54)
-
-        btn_start.clicked.connect(lambda _checked=False, value=item_id: self._start_item(value))
-        btn_stop.clicked.connect(lambda _checked=False, value=item_id: self._stop_item(value))
-
-        action_layout.addWidget(btn_start)
-        action_layout.addWidget(btn_stop)
-        self.tree.setItemWidget(tree_item, 4, action_widget)
-
-    def _update_row_visuals(self, item_id: str, tree_item: QTreeWidgetItem | None = None) -> None:
-        item = self.item_lookup.get(item_id)
-        if item is None:
-            return
-
-        if tree_item is None:
-            tree_item = self._find_tree_item(item_id)
-            if tree_item is None:
-                return
-
-        total = int(item.get("countdown_sec", 30))
-        state = self.timer_manager.get_state(item_id)
-        remaining = self.timer_manager.get_remaining(item_id, total)
-
-        tree_item.setText(0, item.get("name", ""))
-        tree_item.setText(1, f"{format_seconds(remaining)} / {format_seconds(total)}")
-        tree_item.setText(2, STATE_LABELS.get(state, "Idle"))
-        tree_item.setText(3, item.get("hotkey") or "-")
-        tree_item.setForeground(2, QColor(STATE_COLORS.get(state, "#5f7388")))
-
-    def _find_tree_item(self, item_id: str) -> QTreeWidgetItem | None:
-        for index in range(self.tree.topLevelItemCount()):
-            item = self.tree.topLevelItem(index)
-            if item.data(0, Qt.UserRole) == item_id:
-                return item
-        return None
+    def _update_row_visuals(self, item_id: str) -> None:
+        self.tree_model.refresh_item(item_id)
 
     def _select_item(self, item_id: str) -> None:
-        target = self._find_tree_item(item_id)
-        if target:
-            self.tree.setCurrentItem(target)
+        row = self.tree_model.row_of(item_id)
+        if row < 0:
+            return
+        index = self.tree_model.index(row, 0)
+        self.tree.selectionModel().setCurrentIndex(
+            index,
+            QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows,
+        )
+        self.tree.scrollTo(index)
 
     def _current_item_id(self) -> str | None:
-        selected = self.tree.selectedItems()
+        selected = self.tree.selectionModel().selectedRows()
         if not selected:
             return None
-        return selected[0].data(0, Qt.UserRole)
+        return selected[0].data(Qt.UserRole)
 
-    def _current_item(self) -> dict | None:
+    def _current_item(self) -> TimerItem | None:
         item_id = self._current_item_id()
         if not item_id:
             return None
@@ -622,28 +607,30 @@ class TimerMainWindow(QMainWindow):
             return
 
         self._load_item_into_editor(item)
-        self._update_focus_panel(item["id"])
+        self._update_focus_panel(item.id)
 
-    def _load_item_into_editor(self, item: dict) -> None:
+    def _load_item_into_editor(self, item: TimerItem) -> None:
         self._loading_editor = True
 
-        self.edit_name.setText(str(item.get("name", "")))
-        self.combo_mode.setCurrentText(item.get("play_mode", "文字"))
-        self.edit_tts.setText(str(item.get("tts_text", "")))
-        self.edit_audio_path.setText(str(item.get("audio_path", "")))
+        self.edit_name.setText(item.name)
+        self.combo_mode.setCurrentText(item.play_mode)
+        self.edit_tts.setText(item.tts_text)
+        self.edit_audio_path.setText(item.audio_path)
 
-        countdown_sec = int(item.get("countdown_sec", 30))
+        countdown_sec = int(item.countdown_sec)
         self.spin_min.setValue(countdown_sec // 60)
         self.spin_sec.setValue(countdown_sec % 60)
 
-        volume = int(item.get("volume", 80))
+        volume = int(item.volume)
         self.slider_volume.setValue(volume)
         self.lbl_volume_value.setText(str(volume))
 
-        self.chk_infinite.setChecked(bool(item.get("infinite_loop", False)))
-        self.edit_hotkey.setText(item.get("hotkey") or "")
+        self.chk_infinite.setChecked(item.infinite_loop)
+        self.combo_priority.setCurrentIndex(max(0, self.combo_priority.findData(item.priority)))
+        self.edit_hotkey.setText(item.hotkey or "")
 
         self._set_mode_visibility(self.combo_mode.currentText())
+        self._update_audio_status()
         self._loading_editor = False
 
     def _clear_editor(self) -> None:
@@ -657,8 +644,10 @@ class TimerMainWindow(QMainWindow):
         self.slider_volume.setValue(80)
         self.lbl_volume_value.setText("80")
         self.chk_infinite.setChecked(False)
+        self.combo_priority.setCurrentIndex(self.combo_priority.findData(PRIORITY_NORMAL))
         self.edit_hotkey.clear()
         self._set_mode_visibility("文字")
+        self.lbl_audio_status.setVisible(False)
         self._loading_editor = False
 
     def _set_mode_visibility(self, mode: str) -> None:
@@ -669,6 +658,8 @@ class TimerMainWindow(QMainWindow):
     def _on_mode_changed(self, _value: str) -> None:
         self._set_mode_visibility(self.combo_mode.currentText())
         self._on_editor_changed()
+        if not self._loading_editor:
+            self._preload_current_audio()
 
     def _on_volume_changed(self, value: int) -> None:
         self.lbl_volume_value.setText(str(value))
@@ -687,17 +678,58 @@ class TimerMainWindow(QMainWindow):
             self.spin_sec.setValue(1)
             self._loading_editor = False
 
-        item["name"] = self.edit_name.text().strip() or "未命名項目"
-        item["play_mode"] = self.combo_mode.currentText()
-        item["tts_text"] = self.edit_tts.text().strip()
-        item["audio_path"] = self.edit_audio_path.text().strip()
-        item["countdown_sec"] = self.spin_min.value() * 60 + self.spin_sec.value()
-        item["volume"] = self.slider_volume.value()
-        item["infinite_loop"] = self.chk_infinite.isChecked()
+        item.name = self.edit_name.text().strip() or "未命名項目"
+        item.play_mode = self.combo_mode.currentText()
+        item.tts_text = self.edit_tts.text().strip()
+        item.audio_path = self.edit_audio_path.text().strip()
+        item.countdown_sec = self.spin_min.value() * 60 + self.spin_sec.value()
+        item.volume = self.slider_volume.value()
+        item.infinite_loop = self.chk_infinite.isChecked()
+        item.priority = self.combo_priority.currentData()
+
+        self._persist_item(item)
+        self._update_row_visuals(item.id)
+        self._update_focus_panel(item.id)
+        self._sync_sound_pin(item)
+        self._update_audio_status()
+        if item.play_mode == "文字":
+            # Debounced so typing does not synthesize every intermediate text.
+            self._tts_prefetch_timer.start()
+
+    def _sync_sound_pin(self, item: TimerItem | None, item_id: str | None = None) -> None:
+        item_id = item.id if item is not None else item_id
+        wanted = item.audio_path if item is not None and item.play_mode == "音檔" and item.audio_path else None
+        pinned = self._pinned_sound_paths.get(item_id)
+        if wanted == pinned:
+            return
 
-        self._persist_config()
-        self._update_row_visuals(item["id"])
-        self._update_focus_panel(item["id"])
+        if pinned is not None:
+            SOUND_CACHE.unpin(pinned)
+            del self._pinned_sound_paths[item_id]
+        if wanted is not None:
+            SOUND_CACHE.pin(wanted)
+            self._pinned_sound_paths[item_id] = wanted
+
+    def _preload_current_audio(self) -> None:
+        item = self._current_item()
+        if item is not None and item.play_mode == "音檔" and item.audio_path:
+            self.sound_preloader.preload([item.audio_path])
+
+    def _on_audio_preloaded(self, _file_path: str, _error: str) -> None:
+        self._update_audio_status()
+
+    def _update_audio_status(self) -> None:
+        item = self._current_item()
+        error = None
+        if item is not None and item.play_mode == "音檔":
+            error = self.sound_preloader.failures.get(item.audio_path)
+        self.lbl_audio_status.setText(f"無法播放：{error}" if error else "")
+        self.lbl_audio_status.setVisible(bool(error))
+
+    def _prefetch_current_tts(self) -> None:
+        item = self._current_item()
+        if item is not None and item.play_mode == "文字":
+            self.tts_prefetcher.prefetch([item.tts_text])
 
     def _browse_audio(self) -> None:
         file_path, _selected_filter = QFileDialog.getOpenFileName(
@@ -711,6 +743,7 @@ class TimerMainWindow(QMainWindow):
 
         self.edit_audio_path.setText(file_path)
         self._on_editor_changed()
+        self._preload_current_audio()
 
     def _on_hotkey_captured(self, hotkey_str: str) -> None:
         if self._loading_editor:
@@ -720,26 +753,27 @@ class TimerMainWindow(QMainWindow):
         if item is None:
             return
 
-        canonical = canonicalize_hotkey(hotkey_str)
-        if canonical is None:
+        parsed = parse_hotkey(hotkey_str)
+        if parsed is None:
             self._restore_hotkey_editor(item)
             self._set_feedback("熱鍵格式無效，請使用 Ctrl/Alt/Shift + 單鍵", is_error=True)
             return
 
-        if self._hotkey_conflict_exists(canonical, item["id"]):
+        canonical = parsed.canonical
+        if self._hotkey_conflict_exists(canonical, item.id):
             self._restore_hotkey_editor(item)
             self._set_feedback(f"熱鍵衝突：{canonical} 已被其他項目使用", is_error=True)
             return
 
-        result = self.hotkey_service.register_item_hotkey(item["id"], canonical)
+        result = self.hotkey_service.register_item_hotkey(item.id, canonical)
         if not result.ok:
             self._restore_hotkey_editor(item)
             self._set_feedback(f"熱鍵註冊失敗：{result.message}", is_error=True)
             return
 
-        item["hotkey"] = canonical
-        self._persist_config()
-        self._update_row_visuals(item["id"])
+        item.hotkey = canonical
+        self._persist_item(item)
+        self._update_row_visuals(item.id)
         self._set_feedback(f"已綁定熱鍵 {canonical}", is_error=False)
 
     def _on_hotkey_cleared(self) -> None:
@@ -750,41 +784,35 @@ class TimerMainWindow(QMainWindow):
         if item is None:
             return
 
-        self.hotkey_service.unregister_item_hotkey(item["id"])
-        item["hotkey"] = None
-        self._persist_config()
-        self._update_row_visuals(item["id"])
+        self.hotkey_service.unregister_item_hotkey(item.id)
+        item.hotkey = None
+        self._persist_item(item)
+        self._update_row_visuals(item.id)
         self._set_feedback("已清除項目熱鍵", is_error=False)
 
-    def _restore_hotkey_editor(self, item: dict) -> None:
+    def _restore_hotkey_editor(self, item: TimerItem) -> None:
         self._loading_editor = True
-        self.edit_hotkey.setText(item.get("hotkey") or "")
+        self.edit_hotkey.setText(item.hotkey or "")
         self._loading_editor = False
 
     def _hotkey_conflict_exists(self, hotkey: str, current_item_id: str) -> bool:
         for item in self.items:
-            if item["id"] == current_item_id:
+            if item.id == current_item_id:
                 continue
-            if item.get("hotkey") == hotkey:
+            if item.hotkey == hotkey:
                 return True
         return False
     def _on_add_clicked(self) -> None:
-        new_item = {
-            "id": str(uuid4()),
-            "name": "新的項目",
-            "play_mode": "文字",
-            "tts_text": "新的項目",
-            "audio_path": "",
-            "countdown_sec": 30,
-            "infinite_loop": False,
-            "volume": 80,
-            "hotkey": None,
-            "sort_order": len(self.items),
-        }
-        self.items.append(new_item)
-        self._rebuild_item_lookup()
-        self._persist_config()
-        self._refresh_tree(selected_item_id=new_item["id"])
+        new_item = TimerItem(
+            id=str(uuid4()),
+            name="新的項目",
+            tts_text="新的項目",
+            sort_order=len(self.items),
+        )
+        self.tree_model.insert_item(len(self.items), new_item)
+        self.item_lookup[new_item.id] = new_item
+        self._persist_item(new_item)
+        self._select_item(new_item.id)
         self._set_feedback("已新增項目", is_error=False)
 
     def _on_duplicate_clicked(self) -> None:
@@ -792,16 +820,17 @@ class TimerMainWindow(QMainWindow):
         if item is None:
             return
 
-        index = self.items.index(item)
-        cloned = copy.deepcopy(item)
-        cloned["id"] = str(uuid4())
-        cloned["name"] = f"{item.get('name', '項目')} (副本)"
-        cloned["hotkey"] = None
+        index = self.tree_model.row_of(item.id)
+        cloned = TimerItem.from_dict(item.to_dict())
+        cloned.id = str(uuid4())
+        cloned.name = f"{item.name} (副本)"
+        cloned.hotkey = None
 
-        self.items.insert(index + 1, cloned)
-        self._rebuild_item_lookup()
+        self.tree_model.insert_item(index + 1, cloned)
+        self.item_lookup[cloned.id] = cloned
+        self._sync_sound_pin(cloned)
         self._persist_config()
-        self._refresh_tree(selected_item_id=cloned["id"])
+        self._select_item(cloned.id)
         self._set_feedback("已複製項目（熱鍵已清空）", is_error=False)
 
     def _on_delete_clicked(self) -> None:
@@ -809,40 +838,37 @@ class TimerMainWindow(QMainWindow):
         if item is None:
             return
 
-        item_id = item["id"]
+        item_id = item.id
         self.hotkey_service.unregister_item_hotkey(item_id)
         self.timer_manager.remove_item(item_id)
 
-        self.items = [current for current in self.items if current["id"] != item_id]
-        self._rebuild_item_lookup()
-        self._persist_config()
-        self._refresh_tree()
-        self._set_feedback("已刪除項目", is_error=False)
-
-    def _on_order_changed(self, ordered_ids: list) -> None:
-        if len(ordered_ids) != len(self.items):
-            return
+        row = self.tree_model.row_of(item_id)
+        self.tree_model.remove_item(item_id)
+        self.item_lookup.pop(item_id, None)
+        self._sync_sound_pin(None, item_id)
+        self._persist_removal(item_id)
 
-        lookup = {item["id"]: item for item in self.items}
-        if any(item_id not in lookup for item_id in ordered_ids):
-            return
+        if self.items:
+            self._select_item(self.items[min(row, len(self.items) - 1)].id)
+        else:
+            self._clear_editor()
+            self._update_focus_panel(None)
+        self._set_feedback("已刪除項目", is_error=False)
 
-        selected_item_id = self._current_item_id()
-        self.items = [lookup[item_id] for item_id in ordered_ids]
-        self._rebuild_item_lookup()
+    def _on_order_changed(self, _ordered_ids: list) -> None:
+        # The model has already moved the row inside the shared self.items list.
         self._persist_config()
-        self._refresh_tree(selected_item_id=selected_item_id)
         self._set_feedback("排序已儲存", is_error=False)
 
     def _start_selected_item(self) -> None:
         item = self._current_item()
         if item:
-            self._start_item(item["id"])
+            self._start_item(item.id)
 
     def _stop_selected_item(self) -> None:
         item = self._current_item()
         if item:
-            self._stop_item(item["id"])
+            self._stop_item(item.id)
 
     def _start_item(self, item_id: str) -> None:
         item = self.item_lookup.get(item_id)
@@ -850,6 +876,9 @@ class TimerMainWindow(QMainWindow):
             return
 
         self.timer_manager.start_item(item)
+        if item.play_mode == "音檔" and item.audio_path:
+            # Re-checks the file so its first alert can skip the disk.
+            self.sound_preloader.preload([item.audio_path])
         self._update_row_visuals(item_id)
         self._update_focus_panel(item_id)
 
@@ -866,15 +895,22 @@ class TimerMainWindow(QMainWindow):
 
     def _stop_all_items(self) -> None:
         self.timer_manager.stop_all()
-        for item in self.items:
-            self._update_row_visuals(item["id"])
+        self.tree_model.refresh_all()
         self._update_focus_panel(self._current_item_id())
 
     def _persist_config(self) -> None:
         for index, item in enumerate(self.items):
-            item["sort_order"] = index
+            item.sort_order = index
+        self.config["items"] = self.items
+        self.config_writer.schedule(self.config)
+
+    def _persist_item(self, item: TimerItem) -> None:
+        self.config["items"] = self.items
+        self.config_writer.schedule_item(self.config, item)
+
+    def _persist_removal(self, item_id: str) -> None:
         self.config["items"] = self.items
-        save_config(self.config)
+        self.config_writer.schedule_removal(self.config, item_id)
 
     def _register_global_hotkeys(self) -> None:
         global_hotkeys = self.config.get("global_hotkeys", {})
@@ -895,18 +931,15 @@ class TimerMainWindow(QMainWindow):
 
     def _register_item_hotkeys(self) -> None:
         failed_items = []
+        bindings = [(item.id, item.hotkey) for item in self.items if item.hotkey]
 
-        for item in self.items:
-            hotkey = item.get("hotkey")
-            if not hotkey:
-                continue
-
-            result = self.hotkey_service.register_item_hotkey(item["id"], hotkey)
+        for item_id, result in self.hotkey_service.register_item_hotkeys(bindings):
+            item = self.item_lookup[item_id]
             if result.ok:
-                item["hotkey"] = result.canonical_hotkey
+                item.hotkey = result.canonical_hotkey
             else:
-                failed_items.append((item.get("name", "未命名項目"), hotkey, result.message))
-                item["hotkey"] = None
+                failed_items.append((item.name, item.hotkey, result.message))
+                item.hotkey = None
 
         if failed_items:
             self._persist_config()
@@ -936,6 +969,30 @@ class TimerMainWindow(QMainWindow):
         if self._current_item_id() == item_id:
             self._update_focus_panel(item_id)
 
+    def _visible_timer_items(self) -> list[TimerItem]:
+        # The display tick only checks rows on screen plus the focused item;
+        # rows scrolled into view later read their time from the model.
+        if not self.tree.isVisible():
+            return []
+        first_row = self.tree.rowAt(0)
+        items: list[TimerItem] = []
+        if first_row >= 0:
+            last_row = self.tree.rowAt(self.tree.viewport().height() - 1)
+            if last_row < 0:
+                last_row = self.tree_model.rowCount() - 1
+            items = self.tree_model.items_in_rows(first_row, last_row)
+        current_item = self._current_item()
+        if current_item is not None and not any(item is current_item for item in items):
+            items.append(current_item)
+        return items
+
+    def _on_timers_ticked(self, snapshot: list) -> None:
+        self.tree_model.apply_tick(snapshot)
+
+        current_item_id = self._current_item_id()
+        if any(entry[0] == current_item_id for entry in snapshot):
+            self._update_focus_panel(current_item_id)
+
     def _on_timer_state_changed(self, item_id: str, _state: str) -> None:
         self._update_row_visuals(item_id)
         if self._current_item_id() == item_id:
@@ -955,13 +1012,11 @@ class TimerMainWindow(QMainWindow):
             self._set_state_chip(TimerManager.STATE_IDLE)
             return
 
-        total = int(item.get("countdown_sec", 30))
-        remaining = self.timer_manager.get_remaining(item_id, total)
-        state = self.timer_manager.get_state(item_id)
+        remaining = self.timer_manager.remaining_for(item)
 
-        self.focus_name_label.setText(item.get("name", "未命名項目"))
-        self.focus_timer_label.setText(f"{format_seconds(remaining)} / {format_seconds(total)}")
-        self._set_state_chip(state)
+        self.focus_name_label.setText(item.name)
+        self.focus_timer_label.setText(f"{format_seconds(remaining)} / {format_seconds(item.countdown_sec)}")
+        self._set_state_chip(item.state)
 
     def _set_state_chip(self, state: str) -> None:
         label = STATE_LABELS.get(state, "Idle")
@@ -983,6 +1038,11 @@ class TimerMainWindow(QMainWindow):
         self.timer_manager.stop_all()
         self.hotkey_service.unregister_all()
         self._persist_config()
+        self.config_writer.close()
+        self.tts_prefetcher.close()
+        self.sound_preloader.close()
+        AUDIO_DISPATCHER.close()
+        TTS_CACHE.flush()
         event.accept()
 
 
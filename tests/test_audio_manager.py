@@ -0,0 +1,516 @@
+﻿import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+import audio_manager
+from timer_core import PRIORITY_CRITICAL, PRIORITY_LOW, PRIORITY_NORMAL
+
+
+class _FakeTts:
+    def __init__(self, delay_sec=0.0, release=None) -> None:
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._delay_sec = delay_sec
+        self._release = release
+        self._lock = threading.Lock()
+
+    def __call__(self, text, lang, target_path) -> None:
+        with self._lock:
+            self.calls.append((text, lang))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if self._release is not None:
+                self._release.wait(5)
+            time.sleep(self._delay_sec)
+            target_path.write_bytes(f"{lang}:{text}".encode("utf-8"))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _unexpected_backend(text, lang, target_path):
+    raise AssertionError(f"unexpected synthesis of {text!r}")
+
+
+@pytest.fixture(autouse=True)
+def _tts_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_manager, "TTS_CACHE", audio_manager.TtsDiskCache(tmp_path / "tts"))
+
+
+def test_prefetch_synthesizes_each_distinct_text_once_with_bounded_concurrency():
+    backend = _FakeTts(delay_sec=0.02)
+    prefetcher = audio_manager.TtsPrefetcher(backend=backend, max_workers=2)
+
+    submitted = prefetcher.prefetch(["a", "b", "a", " b ", "", "c", "d", "e"])
+    prefetcher.wait()
+
+    assert submitted == 5
+    assert sorted(backend.calls) == [(text, "zh-TW") for text in "abcde"]
+    assert backend.max_active == 2
+
+    assert prefetcher.prefetch(["a", "e"]) == 0
+    cache_file = audio_manager.synthesize_tts("c", backend=_unexpected_backend)
+    assert cache_file.read_bytes() == "zh-TW:c".encode("utf-8")
+    prefetcher.close()
+
+
+def test_alert_waits_for_in_flight_prefetch_instead_of_synthesizing_again():
+    release = threading.Event()
+    backend = _FakeTts(release=release)
+    prefetcher = audio_manager.TtsPrefetcher(backend=backend, max_workers=1)
+    prefetcher.prefetch(["提醒"])
+
+    while not backend.calls:
+        time.sleep(0.001)
+    results = []
+    alert = threading.Thread(target=lambda: results.append(audio_manager.synthesize_tts("提醒", backend=_unexpected_backend)))
+    alert.start()
+    time.sleep(0.05)
+    assert results == []
+
+    release.set()
+    alert.join(5)
+    prefetcher.wait()
+
+    assert len(backend.calls) == 1
+    assert results[0].read_bytes() == "zh-TW:提醒".encode("utf-8")
+    prefetcher.close()
+
+
+def test_failed_synthesis_leaves_no_cache_entry(capsys):
+    def _failing_backend(text, lang, target_path):
+        target_path.write_bytes(b"partial")
+        raise OSError("offline")
+
+    prefetcher = audio_manager.TtsPrefetcher(backend=_failing_backend)
+    prefetcher.prefetch(["hello"])
+    prefetcher.wait()
+    prefetcher.close()
+
+    assert "offline" in capsys.readouterr().out
+    assert list(audio_manager.TTS_CACHE.directory.iterdir()) == []
+
+
+def test_tts_disk_cache_evicts_least_recently_used_speech(tmp_path, monkeypatch):
+    cache = audio_manager.TtsDiskCache(tmp_path / "tts", max_entries=2)
+    monkeypatch.setattr(audio_manager, "TTS_CACHE", cache)
+    backend = _FakeTts()
+
+    first = audio_manager.synthesize_tts("first", backend=backend)
+    second = audio_manager.synthesize_tts("second", backend=backend)
+    assert audio_manager.synthesize_tts("first", backend=_unexpected_backend) == first
+    third = audio_manager.synthesize_tts("third", backend=backend)
+
+    assert first.exists() and third.exists()
+    assert not second.exists()
+    assert ("second", "zh-TW") not in cache
+    assert len(backend.calls) == 3
+
+    index = json.loads((cache.directory / audio_manager.TTS_CACHE_INDEX).read_text(encoding="utf-8"))
+    assert set(index["entries"]) == {cache.digest("first", "zh-TW"), cache.digest("third", "zh-TW")}
+    assert index["entries"][cache.digest("third", "zh-TW")]["size"] == len("zh-TW:third".encode("utf-8"))
+
+
+def test_tts_disk_cache_reconciles_index_with_directory_on_first_use(tmp_path):
+    cache_dir = tmp_path / "tts"
+    writer = audio_manager.TtsDiskCache(cache_dir, max_bytes=100)
+    for text in ("kept", "deleted"):
+        writer.path_for(text, "zh-TW").parent.mkdir(parents=True, exist_ok=True)
+        writer.path_for(text, "zh-TW").write_bytes(b"x" * 30)
+        writer.add(text, "zh-TW")
+    writer.path_for("deleted", "zh-TW").unlink()
+    legacy = writer.path_for("from an older build", "zh-TW")
+    legacy.write_bytes(b"x" * 30)
+    partial = cache_dir / f".{legacy.name}.1.tmp"
+    partial.write_bytes(b"half")
+    oversized = writer.path_for("oversized", "zh-TW")
+    oversized.write_bytes(b"x" * 50)
+    os.utime(oversized, (0, 0))
+
+    reader = audio_manager.TtsDiskCache(cache_dir, max_bytes=100)
+
+    assert reader.lookup("kept", "zh-TW") == writer.path_for("kept", "zh-TW")
+    assert reader.lookup("from an older build", "zh-TW") == legacy
+    assert reader.lookup("deleted", "zh-TW") is None
+    assert ("oversized", "zh-TW") not in reader
+    assert not oversized.exists()
+    assert not partial.exists()
+    assert reader.total_bytes == 60
+
+
+def test_tts_disk_cache_treats_an_unusable_directory_as_empty(tmp_path, monkeypatch):
+    blocker = tmp_path / "tts"
+    blocker.write_text("not a directory", encoding="utf-8")
+    cache = audio_manager.TtsDiskCache(blocker)
+
+    assert cache.lookup("提醒", "zh-TW") is None
+    assert len(cache) == 0
+    cache.flush()
+
+    scans = []
+    monkeypatch.setattr(audio_manager.os, "scandir", lambda path: scans.append(path) or [])
+    assert cache.lookup("提醒", "zh-TW") is None
+    assert scans == []
+
+
+class _FakeSound:
+    def __init__(self, path) -> None:
+        self.path = path
+        self._raw = bytes(os.path.getsize(path))
+
+    def get_raw(self) -> bytes:
+        return self._raw
+
+
+def _sound_files(tmp_path, sizes):
+    paths = []
+    for index, size in enumerate(sizes):
+        path = tmp_path / f"sound-{index}.wav"
+        path.write_bytes(bytes(size))
+        paths.append(str(path))
+    return paths
+
+
+def test_sound_cache_reuses_decoded_sounds_until_the_file_changes(tmp_path):
+    loads = []
+    cache = audio_manager.SoundCache(budget_bytes=1000, loader=lambda path: loads.append(path) or _FakeSound(path))
+    (path,) = _sound_files(tmp_path, [100])
+
+    first = cache.get(path)
+    assert cache.get(path) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    Path(path).write_bytes(bytes(200))
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10_000_000))
+    reloaded = cache.get(path)
+
+    assert reloaded is not first
+    assert len(loads) == 2
+    assert cache.total_bytes == 200
+
+
+def test_sound_cache_evicts_least_recent_unpinned_sounds_over_budget(tmp_path):
+    cache = audio_manager.SoundCache(budget_bytes=250, loader=_FakeSound)
+    first, second, third, oversized = _sound_files(tmp_path, [100, 100, 100, 300])
+
+    cache.pin(first)
+    cache.get(first)
+    cache.get(second)
+    cache.get(third)
+
+    assert first in cache and second not in cache and third in cache
+    assert cache.total_bytes == 200
+
+    cache.get(oversized)
+    assert oversized not in cache
+
+    cache.unpin(first)
+    cache.get(second)
+    assert first not in cache and second in cache and third in cache
+
+
+def test_sound_cache_shares_one_decode_across_spellings_of_a_file(tmp_path, monkeypatch):
+    loads = []
+    cache = audio_manager.SoundCache(budget_bytes=150, loader=lambda path: loads.append(path) or _FakeSound(path))
+    (path,) = _sound_files(tmp_path, [100])
+    (tmp_path / "sub").mkdir()
+    link = tmp_path / "link.wav"
+    link.symlink_to(path)
+    monkeypatch.chdir(tmp_path)
+
+    cache.pin("sound-0.wav")
+    spellings = [path, "sound-0.wav", str(tmp_path / "sub" / ".." / "sound-0.wav"), str(link)]
+    sounds = {id(cache.get(spelling)) for spelling in spellings}
+
+    assert len(sounds) == 1
+    assert len(loads) == 1
+    assert all(cache.get(spelling, revalidate=False) is not None for spelling in spellings)
+    assert cache.hits == 3 + len(spellings)
+
+    # Pinned through one spelling, the shared entry survives budget pressure.
+    (other,) = _sound_files(tmp_path / "sub", [100])
+    cache.get(other)
+    assert str(link) in cache
+    assert other not in cache
+
+
+def test_preloader_reports_missing_and_undecodable_files(tmp_path, monkeypatch):
+    def _loader(path):
+        if path.endswith(".bad"):
+            raise ValueError("not audio")
+        return _FakeSound(path)
+
+    monkeypatch.setattr(audio_manager, "init_mixer", lambda: True)
+    cache = audio_manager.SoundCache(loader=_loader)
+    results = []
+    preloader = audio_manager.SoundPreloader(on_result=lambda path, error: results.append((path, error)), cache=cache)
+    good, bad = _sound_files(tmp_path, [100, 100])
+    Path(bad).rename(bad + ".bad")
+    missing = str(tmp_path / "missing.wav")
+
+    assert preloader.preload([good, bad + ".bad", missing, " "]) == 3
+    preloader.wait()
+
+    assert good in cache
+    assert dict(results) == {good: None, bad + ".bad": "無法解碼音檔: not audio", missing: "找不到音檔"}
+    assert set(preloader.failures) == {bad + ".bad", missing}
+
+    Path(missing).write_bytes(bytes(10))
+    preloader.preload([missing])
+    preloader.wait()
+    preloader.close()
+    assert set(preloader.failures) == {bad + ".bad"}
+
+
+def test_preloaded_sound_is_served_without_touching_the_disk(tmp_path, monkeypatch):
+    cache = audio_manager.SoundCache(loader=_FakeSound)
+    (path,) = _sound_files(tmp_path, [100])
+    sound = cache.preload(path)
+
+    def _no_stat(*_args, **_kwargs):
+        raise AssertionError("stat on the alert path")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(audio_manager.os, "stat", _no_stat)
+        assert cache.get(path, revalidate=False) is sound
+
+    # Later alerts check the file again and pick up an overwritten sound.
+    Path(path).write_bytes(bytes(200))
+    os.utime(path, ns=(0, 0))
+    reloaded = cache.get(path, revalidate=False)
+    assert reloaded is not sound
+    assert reloaded.get_raw() == bytes(200)
+
+
+class _GatedPlayer:
+    def __init__(self) -> None:
+        self.played = []
+        self.gate = threading.Event()
+        self.started = threading.Event()
+
+    def __call__(self, file_path, volume, priority) -> None:
+        self.started.set()
+        self.gate.wait(5)
+        self.played.append((file_path, volume))
+
+
+def _blocked_dispatcher(**kwargs):
+    player = _GatedPlayer()
+    dispatcher = audio_manager.AudioDispatcher(player=player, **kwargs)
+    dispatcher.play_file("first.wav", 1.0)
+    assert player.started.wait(5)
+    return dispatcher, player
+
+
+def test_dispatcher_coalesces_requests_per_key():
+    dispatcher, player = _blocked_dispatcher()
+    for volume in (0.1, 0.2, 0.3):
+        dispatcher.play_file("loop.wav", volume, key="item-a")
+    dispatcher.play_file("other.wav", 0.5, key="item-b")
+
+    player.gate.set()
+    assert dispatcher.wait_idle(5)
+    dispatcher.close()
+
+    assert player.played == [("first.wav", 1.0), ("loop.wav", 0.3), ("other.wav", 0.5)]
+    assert (dispatcher.submitted, dispatcher.coalesced, dispatcher.played) == (5, 2, 3)
+
+
+def test_dispatcher_overflow_drops_oldest():
+    dispatcher, player = _blocked_dispatcher(max_queue=2)
+    for index in range(4):
+        dispatcher.play_file(f"{index}.wav", 1.0)
+
+    player.gate.set()
+    assert dispatcher.wait_idle(5)
+    dispatcher.close()
+
+    assert [path for path, _volume in player.played] == ["first.wav", "2.wav", "3.wav"]
+    assert dispatcher.dropped == 2
+
+
+def test_dispatcher_overflow_merges_same_sound():
+    dispatcher, player = _blocked_dispatcher(max_queue=2, overflow=audio_manager.OVERFLOW_MERGE)
+    dispatcher.play_file("shared.wav", 0.2, key="item-a")
+    dispatcher.play_file("other.wav", 0.5, key="item-b")
+
+    assert dispatcher.play_file("shared.wav", 0.9, key="item-c")
+    assert not dispatcher.play_file("new.wav", 1.0, key="item-d")
+
+    player.gate.set()
+    assert dispatcher.wait_idle(5)
+    dispatcher.close()
+
+    assert player.played == [("first.wav", 1.0), ("shared.wav", 0.9), ("other.wav", 0.5)]
+    assert dispatcher.dropped == 1
+
+
+def test_dispatcher_overflow_blocks_producer_until_space():
+    dispatcher, player = _blocked_dispatcher(max_queue=1, overflow=audio_manager.OVERFLOW_BLOCK)
+    dispatcher.play_file("queued.wav", 1.0)
+
+    producer = threading.Thread(target=dispatcher.play_file, args=("blocked.wav", 1.0))
+    producer.start()
+    producer.join(0.1)
+    assert producer.is_alive()
+
+    player.gate.set()
+    producer.join(5)
+    assert dispatcher.wait_idle(5)
+    dispatcher.close()
+
+    assert [path for path, _volume in player.played] == ["first.wav", "queued.wav", "blocked.wav"]
+
+
+def test_dispatcher_plays_a_burst_from_one_worker_and_synthesizes_off_it():
+    played = []
+    backend = _FakeTts()
+    dispatcher = audio_manager.AudioDispatcher(
+        max_queue=1000, player=lambda path, volume, priority: played.append(path), tts_backend=backend
+    )
+    threads_before = threading.active_count()
+
+    for index in range(500):
+        dispatcher.play_file(f"{index}.wav", 1.0, key=f"item-{index}")
+    dispatcher.speak("提醒", 1.0, key="item-tts")
+    peak_threads = threading.active_count()
+
+    assert dispatcher.wait_idle(5)
+    dispatcher.close()
+
+    assert peak_threads - threads_before <= 2
+    assert len(played) == 501
+    assert played[-1] == str(audio_manager.TTS_CACHE.path_for("提醒", "zh-TW"))
+    assert backend.calls == [("提醒", "zh-TW")]
+
+
+def test_dispatcher_resynthesizes_speech_deleted_from_the_cache():
+    played = []
+    backend = _FakeTts()
+    dispatcher = audio_manager.AudioDispatcher(
+        player=lambda path, volume, priority: played.append(path), tts_backend=backend
+    )
+    dispatcher.speak("提醒", 1.0)
+    assert dispatcher.wait_idle(5)
+
+    cache_file = audio_manager.TTS_CACHE.path_for("提醒", "zh-TW")
+    shutil.rmtree(cache_file.parent)
+    dispatcher.speak("提醒", 1.0)
+    assert dispatcher.wait_idle(5)
+    dispatcher.speak("提醒", 1.0)
+    assert dispatcher.wait_idle(5)
+    dispatcher.close()
+
+    assert played == [str(cache_file)] * 3
+    assert cache_file.is_file()
+    assert backend.calls == [("提醒", "zh-TW")] * 2
+
+
+def test_dispatcher_survives_a_failing_request(monkeypatch):
+    played = []
+
+    def _lookup(text, lang):
+        raise NotADirectoryError(".tts_cache")
+
+    monkeypatch.setattr(audio_manager.TTS_CACHE, "lookup", _lookup)
+    dispatcher = audio_manager.AudioDispatcher(player=lambda path, volume, priority: played.append(path))
+    dispatcher.speak("提醒", 1.0)
+    assert dispatcher.wait_idle(5)
+    dispatcher.play_file("after.wav", 1.0)
+    assert dispatcher.wait_idle(5)
+
+    # A worker that died anyway is replaced on the next request.
+    dead = threading.Thread(target=lambda: None)
+    dead.start()
+    dead.join()
+    dispatcher._thread = dead
+    dispatcher.play_file("restarted.wav", 1.0)
+    assert dispatcher.wait_idle(5)
+    dispatcher.close()
+
+    assert played == ["after.wav", "restarted.wav"]
+
+
+@pytest.fixture
+def dummy_mixer(monkeypatch):
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    try:
+        pygame.mixer.init()
+    except pygame.error as exc:
+        pytest.skip(f"no dummy audio driver: {exc}")
+    yield
+    pygame.mixer.quit()
+
+
+def _long_sound(seconds=5):
+    frequency, size, channels = pygame.mixer.get_init()
+    return pygame.mixer.Sound(buffer=bytes(frequency * seconds * channels * abs(size) // 8))
+
+
+def test_channel_pool_reserves_channels_and_steals_by_priority(dummy_mixer):
+    pool = audio_manager.ChannelPool(channels=3, reserved=1)
+    low, normal, critical = PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_CRITICAL
+    sounds = [_long_sound() for _ in range(5)]
+
+    assert pool.play(sounds[0], 1.0, low)
+    assert pool.play(sounds[1], 1.0, normal)
+    assert pygame.mixer.get_num_channels() == 3
+    assert not pygame.mixer.Channel(0).get_busy()
+
+    # Only the reserved channel is left, so the low voice is stolen.
+    assert pool.play(sounds[2], 1.0, normal)
+    assert pygame.mixer.Channel(1).get_sound() is sounds[2]
+    assert not pool.play(sounds[3], 1.0, low)
+
+    assert pool.play(sounds[3], 1.0, critical)
+    assert pygame.mixer.Channel(0).get_sound() is sounds[3]
+
+    # Every channel is busy: the oldest normal voice goes, the critical one stays.
+    assert pool.play(sounds[4], 1.0, critical)
+    assert pygame.mixer.Channel(2).get_sound() is sounds[4]
+    assert pygame.mixer.Channel(0).get_sound() is sounds[3]
+
+    assert (pool.played, pool.stolen, pool.dropped) == (5, 2, 1)
+
+
+def test_concurrent_mixer_init_opens_the_device_once(monkeypatch):
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    audio_manager.shutdown_mixer()
+    pygame.mixer.quit()
+
+    real_init = pygame.mixer.init
+    calls = []
+
+    def _slow_init(**kwargs):
+        calls.append(kwargs)
+        time.sleep(0.05)
+        real_init(**kwargs)
+
+    monkeypatch.setattr(pygame.mixer, "init", _slow_init)
+    threads = [audio_manager.start_mixer_init(buffer=256) for _ in range(4)]
+    results = []
+    threads += [threading.Thread(target=lambda: results.append(audio_manager.init_mixer())) for _ in range(4)]
+    for thread in threads[4:]:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    try:
+        if not audio_manager.MIXER_READY:
+            pytest.skip("no dummy audio driver")
+        assert len(calls) == 1
+        assert calls[0]["buffer"] == 256
+        assert results == [True] * 4
+        assert audio_manager.MIXER_INIT_MS >= 50
+        assert pygame.mixer.get_num_channels() == audio_manager.AUDIO_CHANNELS
+    finally:
+        audio_manager.shutdown_mixer()
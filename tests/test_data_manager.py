@@ -1,6 +1,30 @@
 ﻿import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
 
 import data_manager
+from timer_core import TimerItem
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _stored_config(config_path):
+    stored = json.loads(config_path.read_text(encoding="utf-8"))
+    stored.pop(data_manager.FINGERPRINT_KEY, None)
+    return stored
 
 
 def test_legacy_list_migrates_and_backups(tmp_path, monkeypatch):
@@ -45,6 +69,7 @@ def test_invalid_v2_values_are_normalized(tmp_path, monkeypatch):
                 "play_mode": "bad",
                 "countdown_sec": -10,
                 "volume": 999,
+                "priority": 9,
                 "hotkey": "F1",
                 "sort_order": 3,
             },
@@ -76,7 +101,360 @@ def test_invalid_v2_values_are_normalized(tmp_path, monkeypatch):
     for item in normalized["items"]:
         assert item["countdown_sec"] >= 1
         assert 0 <= item["volume"] <= 100
+    assert [item["priority"] for item in normalized["items"]] == [1, 2]
 
     hotkeys = {item["hotkey"] for item in normalized["items"]}
     assert hotkeys == {None, "Ctrl+1"}
     assert normalized["items"][0]["id"] != normalized["items"][1]["id"]
+
+
+def test_config_writer_coalesces_bursts_into_one_write(monkeypatch):
+    writes = []
+    written = threading.Event()
+
+    def _save(app_config):
+        writes.append(json.dumps(app_config))
+        written.set()
+
+    monkeypatch.setattr(data_manager, "save_config", _save)
+
+    clock = _FakeClock()
+    writer = data_manager.ConfigWriter(delay_sec=0.05, clock=clock)
+    config = {"items": [{"volume": 0}]}
+    for volume in range(40):
+        config["items"][0]["volume"] = volume
+        writer.schedule(config)
+    assert writes == []
+
+    clock.now += 0.05
+    assert written.wait(5)
+    assert len(writes) == 1
+    assert json.loads(writes[0])["items"][0]["volume"] == 39
+
+    writer.close()
+    assert len(writes) == 1
+
+
+def test_config_writer_flushes_pending_changes_on_close(monkeypatch):
+    writes = []
+    monkeypatch.setattr(data_manager, "save_config", lambda app_config: writes.append(dict(app_config)))
+
+    writer = data_manager.ConfigWriter(delay_sec=60)
+    writer.schedule({"value": 1})
+    writer.schedule({"value": 2})
+    assert writes == []
+
+    writer.close()
+    assert writes == [{"value": 2}]
+
+    writer.schedule({"value": 3})
+    writer.flush()
+    assert writes == [{"value": 2}]
+
+
+def test_config_writer_caps_the_delay_for_continuous_edits(monkeypatch):
+    written = threading.Event()
+    monkeypatch.setattr(data_manager, "save_config", lambda app_config: written.set())
+
+    clock = _FakeClock()
+    writer = data_manager.ConfigWriter(delay_sec=0.125, max_delay_sec=0.25, clock=clock)
+    for _ in range(4):
+        writer.schedule({})
+        clock.now += 0.0625
+
+    # The last edit pushed the debounce out to 0.3125; the cap writes at 0.25.
+    assert clock.now == 0.25
+    assert written.wait(5)
+
+    writer.close()
+
+
+def test_failed_save_keeps_previous_config(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    monkeypatch.setattr(data_manager, "CONFIG_FILENAME", str(config_path))
+
+    previous = data_manager.default_config()
+    data_manager.save_config(previous)
+
+    def _fail_replace(_source, _target):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(data_manager.os, "replace", _fail_replace)
+    updated = data_manager.default_config()
+    updated["items"][0]["name"] = "updated"
+    with pytest.raises(OSError):
+        data_manager.save_config(updated)
+
+    assert _stored_config(config_path) == previous
+    assert list(tmp_path.iterdir()) == [config_path]
+
+
+_WRITER_SCRIPT = """
+import sys
+import data_manager
+
+data_manager.CONFIG_FILENAME = sys.argv[1]
+configs = []
+for marker in ("old", "new"):
+    config = data_manager.default_config()
+    config["items"] = [data_manager._new_item(index) for index in range(2000)]
+    config["ui"]["theme"] = marker
+    configs.append(config)
+
+print("ready", flush=True)
+while True:
+    for config in configs:
+        data_manager.save_config(config)
+"""
+
+
+def test_killed_writer_never_leaves_a_partial_config(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    monkeypatch.setattr(data_manager, "CONFIG_FILENAME", str(config_path))
+    rng = random.Random(7)
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(Path(data_manager.__file__).resolve().parent), env.get("PYTHONPATH", "")])
+
+    for _ in range(8):
+        process = subprocess.Popen(
+            [sys.executable, "-c", _WRITER_SCRIPT, str(config_path)],
+            stdout=subprocess.PIPE,
+            env=env,
+        )
+        assert process.stdout.readline().strip() == b"ready"
+        time.sleep(rng.uniform(0.0, 0.3))
+        process.kill()
+        process.wait()
+        process.stdout.close()
+
+        if config_path.exists():
+            stored = json.loads(config_path.read_text(encoding="utf-8"))
+            assert stored["ui"]["theme"] in {"old", "new"}
+            assert len(stored["items"]) == 2000
+
+
+def _three_item_config():
+    config = data_manager.default_config()
+    config["items"] = [data_manager._new_item(index) for index in range(3)]
+    return config
+
+
+def test_load_config_replays_and_compacts_journal(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    monkeypatch.setattr(data_manager, "CONFIG_FILENAME", str(config_path))
+
+    config = _three_item_config()
+    data_manager.save_config(config)
+    first, second, third = (dict(item) for item in config["items"])
+
+    added = data_manager._new_item(3)
+    data_manager.append_journal(
+        [
+            {"op": "item", "item": dict(second, volume=5)},
+            {"op": "item", "item": added},
+            {"op": "remove", "id": first["id"]},
+            {"op": "item", "item": dict(second, volume=7)},
+        ]
+    )
+    journal_path = tmp_path / "config.json.journal"
+    with open(journal_path, "a", encoding="utf-8") as handle:
+        handle.write('{"op": "item", "item": {"id"')
+
+    loaded = data_manager.load_config()
+
+    assert [item["id"] for item in loaded["items"]] == [second["id"], third["id"], added["id"]]
+    assert loaded["items"][0]["volume"] == 7
+    assert [item["sort_order"] for item in loaded["items"]] == [0, 1, 2]
+    assert not journal_path.exists()
+    assert _stored_config(config_path) == loaded
+
+
+def test_journal_writer_appends_item_edits_without_rewriting_snapshot(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    monkeypatch.setattr(data_manager, "CONFIG_FILENAME", str(config_path))
+
+    config = _three_item_config()
+    data_manager.save_config(config)
+    config["items"] = [TimerItem.from_dict(item) for item in config["items"]]
+    snapshot_text = config_path.read_text(encoding="utf-8")
+
+    writer = data_manager.ConfigWriter(delay_sec=60, journal=True)
+    for volume in range(10):
+        config["items"][1].volume = volume
+        writer.schedule_item(config, config["items"][1])
+    writer.schedule_removal(config, config["items"][2].id)
+    writer.flush()
+
+    assert config_path.read_text(encoding="utf-8") == snapshot_text
+    records = data_manager.load_journal()
+    assert [record["op"] for record in records] == ["item", "remove"]
+    assert records[0]["item"]["volume"] == 9
+
+    del config["items"][2]
+    writer.close()
+
+    assert not (tmp_path / "config.json.journal").exists()
+    assert _stored_config(config_path) == data_manager._config_to_builtins(config)
+
+
+def test_journal_writer_compacts_after_threshold(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    monkeypatch.setattr(data_manager, "CONFIG_FILENAME", str(config_path))
+
+    config = _three_item_config()
+    data_manager.save_config(config)
+    config["items"] = [TimerItem.from_dict(item) for item in config["items"]]
+
+    writer = data_manager.ConfigWriter(delay_sec=60, journal=True, compact_after=2)
+    writer.schedule_item(config, config["items"][0])
+    writer.flush()
+    assert len(data_manager.load_journal()) == 1
+
+    config["items"][1].name = "compacted"
+    writer.schedule_item(config, config["items"][1])
+    writer.flush()
+
+    assert data_manager.load_journal() == []
+    assert _stored_config(config_path)["items"][1]["name"] == "compacted"
+    writer.close()
+
+
+def test_compaction_after_delete_and_add_keeps_the_list_order(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    monkeypatch.setattr(data_manager, "CONFIG_FILENAME", str(config_path))
+
+    config = _three_item_config()
+    data_manager.save_config(config)
+    config["items"] = [TimerItem.from_dict(item) for item in config["items"]]
+    kept_id = config["items"][2].id
+
+    # The editor removes rows without renumbering and appends at len(items).
+    writer = data_manager.ConfigWriter(delay_sec=60, journal=True, compact_after=3)
+    for removed in config["items"][:2]:
+        config["items"].remove(removed)
+        writer.schedule_removal(config, removed.id)
+        writer.flush()
+    added = TimerItem(id="added", name="added", sort_order=len(config["items"]))
+    config["items"].append(added)
+    writer.schedule_item(config, added)
+    writer.flush()
+    assert data_manager.load_journal() == []
+
+    # Reloaded without a clean close, straight from the fingerprinted snapshot.
+    assert data_manager._has_valid_fingerprint(config_path.read_bytes())
+    loaded = data_manager.load_config()
+    assert [(item["id"], item["sort_order"]) for item in loaded["items"]] == [(kept_id, 0), ("added", 1)]
+    writer.close()
+
+
+def test_fingerprinted_config_skips_normalization(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    monkeypatch.setattr(data_manager, "CONFIG_FILENAME", str(config_path))
+
+    config = _three_item_config()
+    data_manager.save_config(config)
+    stored_text = config_path.read_text(encoding="utf-8")
+
+    def _fail_normalize(_raw):
+        raise AssertionError("trusted config should not be normalized")
+
+    monkeypatch.setattr(data_manager, "normalize_config", _fail_normalize)
+
+    assert data_manager.load_config() == config
+    assert config_path.read_text(encoding="utf-8") == stored_text
+
+
+def test_edited_or_stale_fingerprint_falls_back_to_full_normalization(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    monkeypatch.setattr(data_manager, "CONFIG_FILENAME", str(config_path))
+
+    config = _three_item_config()
+    data_manager.save_config(config)
+    stored = json.loads(config_path.read_text(encoding="utf-8"))
+    stored["items"][0]["volume"] = 999
+    config_path.write_text(json.dumps(stored, ensure_ascii=False, indent=4), encoding="utf-8")
+
+    loaded = data_manager.load_config()
+    assert loaded["items"][0]["volume"] == 100
+
+    monkeypatch.setattr(data_manager, "NORMALIZER_REVISION", data_manager.NORMALIZER_REVISION + 1)
+    assert not data_manager._has_valid_fingerprint(config_path.read_bytes())
+
+    assert data_manager.load_config() == loaded
+    assert data_manager._has_valid_fingerprint(config_path.read_bytes())
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "fast"])
+def test_json_backends_round_trip_identical_files(tmp_path, monkeypatch, backend):
+    config_path = tmp_path / "config.json"
+    monkeypatch.setattr(data_manager, "CONFIG_FILENAME", str(config_path))
+    if backend == "stdlib":
+        monkeypatch.setattr(data_manager, "config_schema", None)
+        monkeypatch.setattr(data_manager, "orjson", None)
+    elif data_manager.config_schema is None and data_manager.orjson is None:
+        pytest.skip("no fast JSON backend installed")
+
+    config = _three_item_config()
+    config["items"][0]["name"] = "楓之谷"
+    data_manager.save_config(config)
+
+    body_text = json.dumps(config, ensure_ascii=False, indent=4)
+    assert config_path.read_text(encoding="utf-8") == data_manager._stamp_fingerprint(body_text)
+    assert data_manager.load_config() == config
+
+
+def test_typed_decoding_accepts_clean_unstamped_config_without_normalizing(tmp_path, monkeypatch):
+    pytest.importorskip("msgspec")
+    config_path = tmp_path / "config.json"
+    monkeypatch.setattr(data_manager, "CONFIG_FILENAME", str(config_path))
+
+    config = _three_item_config()
+    config_path.write_text(json.dumps(config, ensure_ascii=False, indent=4), encoding="utf-8")
+
+    def _fail_normalize(_raw):
+        raise AssertionError("typed config should not be normalized")
+
+    monkeypatch.setattr(data_manager, "normalize_config", _fail_normalize)
+
+    loaded = data_manager.load_config()
+    assert loaded == config
+    assert list(loaded["items"][0]) == list(config["items"][0])
+    assert data_manager._has_valid_fingerprint(config_path.read_bytes())
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        lambda item: item.update(countdown_sec="30"),
+        lambda item: item.update(hotkey="ctrl+f1"),
+        lambda item: item.update(name=" padded "),
+        lambda item: item.update(sort_order=7),
+        lambda item: item.pop("volume"),
+        lambda item: item.update(priority=5),
+    ],
+)
+def test_typed_decoding_rejects_configs_that_need_normalization(edit):
+    config_schema = pytest.importorskip("config_schema")
+    config = _three_item_config()
+    edit(config["items"][1])
+
+    typed_config = config_schema.decode_typed(json.dumps(config, ensure_ascii=False).encode("utf-8"))
+
+    assert typed_config is None or not data_manager._is_normalized(typed_config)
+
+
+def test_save_config_persists_only_timer_item_config_fields(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.json"
+    monkeypatch.setattr(data_manager, "CONFIG_FILENAME", str(config_path))
+
+    config = _three_item_config()
+    expected = json.loads(json.dumps(config))
+    config["items"] = [TimerItem.from_dict(item) for item in config["items"]]
+    config["items"][0].state = "running"
+    config["items"][0].deadline = 1234.5
+
+    data_manager.save_config(config)
+
+    assert _stored_config(config_path) == expected
+    assert data_manager.load_config() == expected
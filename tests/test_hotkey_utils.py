@@ -1,4 +1,11 @@
-﻿from hotkey_utils import canonicalize_hotkey, hotkey_to_vk_and_modifiers
+﻿from hotkey_utils import (
+    Hotkey,
+    HotkeyRegistration,
+    HotkeyRegistry,
+    canonicalize_hotkey,
+    hotkey_to_vk_and_modifiers,
+    parse_hotkey,
+)
 
 
 def test_canonicalize_hotkey_formats_tokens():
@@ -18,3 +25,46 @@ def test_hotkey_vk_mapping():
     assert hotkey_to_vk_and_modifiers("Ctrl+F2") == (0x71, 0x0002)
     assert hotkey_to_vk_and_modifiers("Alt+Shift+A") == (ord("A"), 0x0001 | 0x0004)
     assert hotkey_to_vk_and_modifiers("bad") is None
+
+
+def test_parse_hotkey_returns_canonical_form_and_vk_pair_in_one_pass():
+    assert parse_hotkey("shift + ctrl + f12") == ("Ctrl+Shift+F12", 0x7B, 0x0002 | 0x0004)
+    assert parse_hotkey("alt+7") == ("Alt+7", ord("7"), 0x0001)
+    assert parse_hotkey("ctrl+f") == ("Ctrl+F", ord("F"), 0x0002)
+    assert parse_hotkey("Ctrl+F13") is None
+
+
+def test_parse_hotkey_memoizes_an_interned_hashable_value():
+    first = parse_hotkey("ctrl + f3")
+    assert isinstance(first, Hotkey)
+    assert first == Hotkey("Ctrl+F3", 0x72, 0x0002)
+    assert str(first) == "Ctrl+F3"
+    assert parse_hotkey("ctrl + f3") is first
+    # Different spellings of one hotkey share the same canonical string object.
+    assert parse_hotkey("F3+Control").canonical is first.canonical
+    assert canonicalize_hotkey("CTRL+f3") is first.canonical
+    assert len({first, parse_hotkey("Control+F3")}) == 1
+    assert parse_hotkey.cache_info().maxsize is not None
+
+
+def test_hotkey_registry_indexes_by_combo_token_and_id():
+    registry = HotkeyRegistry(first_hotkey_id=1000)
+    first_id = registry.allocate_id()
+    registry.add(HotkeyRegistration("item:a", "Ctrl+F1", 0x70, 0x0002, first_id))
+
+    assert registry.owner(*hotkey_to_vk_and_modifiers("ctrl+f1")) == "item:a"
+    assert registry.owner(0x70, 0x0004) is None
+    assert registry.token_for_id(first_id) == "item:a"
+
+    second_id = registry.allocate_id()
+    assert second_id != first_id
+    registry.add(HotkeyRegistration("item:b", "Alt+A", ord("A"), 0x0001, second_id))
+
+    removed = registry.remove("item:a")
+    assert removed.hotkey_id == first_id
+    assert registry.owner(0x70, 0x0002) is None
+    assert registry.token_for_id(first_id) is None
+    assert len(registry) == 1
+
+    assert [registration.token for registration in registry.clear()] == ["item:b"]
+    assert registry.get("item:b") is None
@@ -0,0 +1,136 @@
+﻿import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from timer_array_engine import ArrayTimerEngine
+from timer_core import TimerEngine, TimerItem, VirtualClock
+
+
+def _items(count, seed):
+    rng = random.Random(seed)
+    return [
+        TimerItem(id=f"item-{index}", countdown_sec=rng.randint(1, 120), infinite_loop=rng.random() < 0.5)
+        for index in range(count)
+    ]
+
+
+def _run_scenario(engine_class, seed):
+    clock = VirtualClock(1000.0)
+    expired = []
+    engine = engine_class(clock=clock, on_expired=lambda item: expired.append((round(clock.now, 6), item.id)))
+    items = _items(200, seed)
+    rng = random.Random(seed + 1)
+
+    for item in items:
+        engine.start_item(item)
+    for _ in range(50):
+        clock.run(engine, rng.uniform(0.0, 90.0))
+        victim = rng.choice(items)
+        if rng.random() < 0.5:
+            engine.stop_item(victim.id)
+        else:
+            engine.start_item(victim)
+
+    remaining = {item.id: engine.get_remaining(item.id, -1) for item in items}
+    states = {item.id: engine.get_state(item.id) for item in items}
+    return sorted(expired), remaining, states
+
+
+def test_array_engine_matches_heap_engine():
+    assert _run_scenario(ArrayTimerEngine, 11) == _run_scenario(TimerEngine, 11)
+
+
+def test_tick_reports_the_same_changes_as_heap_engine():
+    snapshots = []
+    for engine_class in (TimerEngine, ArrayTimerEngine):
+        clock = VirtualClock(1000.0)
+        engine = engine_class(clock=clock)
+        engine.start_item(TimerItem(id="fast", countdown_sec=2))
+        clock.advance(0.5)
+        engine.start_item(TimerItem(id="slow", countdown_sec=10, infinite_loop=True))
+
+        ticks = []
+        for _ in range(4):
+            clock.advance(0.6)
+            ticks.append(sorted(engine.tick()))
+        snapshots.append(ticks)
+
+    assert snapshots[0] == snapshots[1]
+
+
+def test_tick_limited_to_visible_items_matches_heap_engine():
+    snapshots = []
+    for engine_class in (TimerEngine, ArrayTimerEngine):
+        clock = VirtualClock(1000.0)
+        engine = engine_class(clock=clock)
+        items = _items(20, 3)
+        for item in items[:15]:
+            engine.start_item(item)
+        engine.stop_item(items[5].id)
+
+        clock.advance(1.5)
+        snapshots.append(sorted(engine.tick(items[4:18])))
+
+    assert snapshots[0] == snapshots[1]
+    assert {entry[0] for entry in snapshots[0]} == {item.id for item in _items(20, 3)[6:15]} | {"item-4"}
+
+
+def test_looping_slots_stay_on_the_start_grid():
+    clock = VirtualClock(1000.0)
+    engine = ArrayTimerEngine(clock=clock)
+    rng = random.Random(2024)
+
+    started_at = clock.now
+    engine.start_item(TimerItem(id="loop-item", countdown_sec=1, infinite_loop=True))
+    for cycle in range(1, 10_001):
+        clock.now = started_at + cycle + rng.uniform(0.0, 0.4)
+        engine.process_expired()
+
+    clock.now = started_at + 10_000 + 0.25
+    assert engine.get_remaining("loop-item", 1) == pytest.approx(0.75, abs=0.05)
+
+    clock.now = started_at + 10_007.5
+    _now, expired = engine.expire_slots()
+    assert expired.tolist() == [0]
+    assert engine.get_remaining("loop-item", 1) == pytest.approx(0.5)
+
+
+def test_slots_grow_and_are_reused_after_removal():
+    clock = VirtualClock(1000.0)
+    engine = ArrayTimerEngine(clock=clock, capacity=2)
+    items = [TimerItem(id=f"item-{index}", countdown_sec=5 + index) for index in range(5)]
+    engine.start_items(items)
+
+    engine.remove_item("item-1")
+    replacement = TimerItem(id="late", countdown_sec=3)
+    engine.start_item(replacement)
+
+    assert engine._slot_by_id["late"] == 1
+    assert engine.next_deadline() == pytest.approx(1003.0)
+    assert engine.get_state("item-1") == "idle"
+    assert engine.remaining_for(items[1]) == 6
+    assert engine.remaining_for(replacement) == pytest.approx(3.0)
+
+    engine.stop_all()
+    assert engine.next_deadline() is None
+    assert {item.state for item in items if item.id != "item-1"} == {"stopped"}
+
+
+def test_timer_manager_accepts_array_engine():
+    qtcore = pytest.importorskip("PySide6.QtCore")
+    from timer_manager import TimerManager
+
+    if qtcore.QCoreApplication.instance() is None:
+        qtcore.QCoreApplication([])
+    clock = VirtualClock(1000.0)
+    manager = TimerManager(clock=clock, engine_factory=ArrayTimerEngine)
+
+    manager.start_item(TimerItem(id="item-1", countdown_sec=2))
+    assert manager._expiry_timer.interval() == 2000
+
+    clock.advance(2)
+    manager._on_expiry()
+    assert manager.get_state("item-1") == "stopped"
+    assert not manager._expiry_timer.isActive()
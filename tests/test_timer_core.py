@@ -0,0 +1,129 @@
+﻿import random
+
+import pytest
+
+from timer_core import TimerEngine, TimerItem, VirtualClock
+
+
+def _loop_item(item_id, countdown_sec):
+    return TimerItem(id=item_id, countdown_sec=countdown_sec, infinite_loop=True, tts_text="")
+
+
+def test_engine_runs_without_qt_and_reports_callbacks():
+    clock = VirtualClock(1000.0)
+    ticks = []
+    states = []
+    expired = []
+    engine = TimerEngine(
+        clock=clock,
+        on_tick=lambda item_id, remaining, total: ticks.append((item_id, remaining, total)),
+        on_state_changed=lambda item_id, state: states.append((item_id, state)),
+        on_expired=lambda item: expired.append(item.id),
+    )
+
+    engine.start_item(TimerItem(id="item-1", countdown_sec=3, tts_text=""))
+    assert engine.next_deadline() == pytest.approx(1003.0)
+
+    clock.advance(1.2)
+    assert engine.tick() == [("item-1", 2, 3, "running")]
+
+    clock.run(engine, 5)
+    assert expired == ["item-1"]
+    assert states == [("item-1", "running"), ("item-1", "stopped")]
+    assert engine.next_deadline() is None
+
+
+def test_tick_batches_only_changed_items():
+    clock = VirtualClock(1000.0)
+    batches = []
+    engine = TimerEngine(clock=clock, on_batch_tick=batches.append)
+
+    engine.start_item(TimerItem(id="fast", countdown_sec=2, tts_text=""))
+    clock.advance(0.5)
+    engine.start_item(TimerItem(id="slow", countdown_sec=10, tts_text=""))
+
+    clock.advance(0.6)
+    engine.tick()
+    clock.advance(0.2)
+    engine.tick()
+
+    assert batches == [[("fast", 1, 2, "running")]]
+
+
+def test_remaining_has_millisecond_resolution():
+    clock = VirtualClock(1000.0)
+    engine = TimerEngine(clock=clock)
+
+    engine.start_item(TimerItem(id="item-1", countdown_sec=10, tts_text=""))
+    clock.advance(2.3456)
+
+    assert engine.get_remaining("item-1", 10) == pytest.approx(7.654)
+
+
+def test_looping_timer_does_not_drift_when_expiries_are_late():
+    clock = VirtualClock(1000.0)
+    engine = TimerEngine(clock=clock)
+    rng = random.Random(2024)
+
+    started_at = clock.now
+    engine.start_item(_loop_item("loop-item", 1))
+
+    cycles = 10_000
+    for cycle in range(1, cycles + 1):
+        # The busy event loop delivers each expiry up to 400 ms late.
+        clock.now = started_at + cycle + rng.uniform(0.0, 0.4)
+        engine.process_expired()
+
+    clock.now = started_at + cycles + 0.25
+    assert abs(engine.get_remaining("loop-item", 1) - 0.75) < 0.05
+    assert engine.active_timers["loop-item"].cycle == cycles
+
+
+def test_blocked_event_loop_skips_missed_cycles():
+    clock = VirtualClock(1000.0)
+    expired = []
+    engine = TimerEngine(clock=clock, on_expired=lambda item: expired.append(item.id))
+
+    started_at = clock.now
+    engine.start_item(_loop_item("loop-item", 2))
+
+    clock.now = started_at + 7.5
+    engine.process_expired()
+
+    assert expired == ["loop-item"]
+    assert engine.get_remaining("loop-item", 2) == pytest.approx(0.5)
+
+
+def test_simulates_a_day_of_looping_timers():
+    clock = VirtualClock()
+    expired = []
+    engine = TimerEngine(clock=clock, on_expired=lambda item: expired.append(item.id))
+
+    for index in range(500):
+        engine.start_item(_loop_item(f"loop-{index}", 60 + index))
+
+    processed = clock.run(engine, 24 * 60 * 60)
+
+    expected = sum(86400 // (60 + index) for index in range(500))
+    assert processed == expected == len(expired)
+    assert engine.get_remaining("loop-0", 60) == pytest.approx(60.0)
+
+
+def test_engine_keeps_runtime_state_on_the_shared_item():
+    clock = VirtualClock(1000.0)
+    engine = TimerEngine(clock=clock)
+    item = TimerItem(id="item-1", countdown_sec=5)
+
+    assert engine.remaining_for(item) == 5
+    engine.start_item(item)
+    clock.advance(1.5)
+
+    assert item.state == "running"
+    assert engine.remaining_for(item) == pytest.approx(3.5)
+    assert engine.active_timers["item-1"] is item
+
+    engine.stop_item("item-1")
+    assert item.state == "stopped"
+    assert engine.remaining_for(item) == 0
+    assert engine.next_deadline() is None
+    assert item.to_dict() == TimerItem(id="item-1", countdown_sec=5).to_dict()
@@ -0,0 +1,108 @@
+﻿import pytest
+
+qtwidgets = pytest.importorskip("PySide6.QtWidgets")
+
+from PySide6.QtCore import QModelIndex, Qt
+
+from timer_core import TimerItem
+from timer_list_model import TimerListModel, format_seconds
+from timer_manager import TimerManager
+
+
+def _ensure_app():
+    app = qtwidgets.QApplication.instance()
+    if app is None:
+        app = qtwidgets.QApplication([])
+    return app
+
+
+def _items(count):
+    return [
+        TimerItem(id=f"item-{index}", name=f"name-{index}", countdown_sec=90, hotkey=None, tts_text="")
+        for index in range(count)
+    ]
+
+
+def test_format_seconds_rounds_up_partial_seconds():
+    assert format_seconds(0) == "00:00"
+    assert format_seconds(59.2) == "01:00"
+    assert format_seconds(90) == "01:30"
+
+
+def test_model_exposes_items_and_timer_state():
+    _ensure_app()
+    manager = TimerManager()
+    model = TimerListModel(manager)
+    model.set_items(_items(3))
+
+    assert model.rowCount() == 3
+    assert model.row_of("item-2") == 2
+    assert model.row_of("missing") == -1
+    assert model.index(1, TimerListModel.COLUMN_NAME).data() == "name-1"
+    assert model.index(1, TimerListModel.COLUMN_TIME).data() == "01:30 / 01:30"
+    assert model.index(1, TimerListModel.COLUMN_STATE).data() == "Idle"
+    assert model.index(1, TimerListModel.COLUMN_HOTKEY).data() == "-"
+    assert model.index(1, TimerListModel.COLUMN_ACTIONS).data(Qt.UserRole) == "item-1"
+
+    manager.start_item(model.item_at(1))
+    assert model.index(1, TimerListModel.COLUMN_STATE).data() == "Running"
+    manager.stop_all()
+
+
+def test_apply_tick_only_touches_time_column_of_changed_rows():
+    _ensure_app()
+    model = TimerListModel(TimerManager())
+    model.set_items(_items(10))
+
+    changes = []
+    model.dataChanged.connect(
+        lambda top_left, bottom_right, _roles: changes.append(
+            (top_left.row(), bottom_right.row(), top_left.column(), bottom_right.column())
+        )
+    )
+
+    model.apply_tick([(f"item-{row}", 10, 90, "running") for row in (7, 2, 3, 4, 9)] + [("gone", 1, 1, "running")])
+
+    assert changes == [(2, 4, 1, 1), (7, 7, 1, 1), (9, 9, 1, 1)]
+
+
+def test_move_row_and_drop_reorder_items():
+    _ensure_app()
+    model = TimerListModel(TimerManager())
+    model.set_items(_items(4))
+
+    orders = []
+    model.order_changed.connect(orders.append)
+
+    assert model.move_row(0, 3)
+    assert orders[-1] == ["item-1", "item-2", "item-0", "item-3"]
+    assert model.row_of("item-0") == 2
+    assert not model.move_row(1, 2)
+
+    mime_data = model.mimeData([model.index(3, 0)])
+    # The move is applied in place, so the view must not remove the source row.
+    assert not model.dropMimeData(mime_data, Qt.MoveAction, 0, 0, QModelIndex())
+    assert orders[-1] == ["item-3", "item-1", "item-2", "item-0"]
+
+
+def test_insert_and_remove_update_shared_list_and_row_index():
+    _ensure_app()
+    model = TimerListModel(TimerManager())
+    items = _items(3)
+    model.set_items(items)
+
+    inserted = []
+    removed = []
+    model.rowsInserted.connect(lambda _parent, first, last: inserted.append((first, last)))
+    model.rowsRemoved.connect(lambda _parent, first, last: removed.append((first, last)))
+
+    model.insert_item(1, TimerItem(id="new", name="new", countdown_sec=5))
+    assert [item.id for item in items] == ["item-0", "new", "item-1", "item-2"]
+    assert inserted == [(1, 1)]
+    assert model.row_of("item-2") == 3
+
+    assert model.remove_item("item-0").id == "item-0"
+    assert model.remove_item("item-0") is None
+    assert [item.id for item in items] == ["new", "item-1", "item-2"]
+    assert removed == [(0, 0)]
+    assert [model.row_of(item_id) for item_id in ("new", "item-1", "item-2")] == [0, 1, 2]
@@ -2,6 +2,8 @@
 
 qtcore = pytest.importorskip("PySide6.QtCore")
 
+import timer_manager
+from timer_core import PRIORITY_CRITICAL, PRIORITY_NORMAL, TimerItem
 from timer_manager import TimerManager
 
 
@@ -12,9 +14,18 @@ def _ensure_app():
     return app
 
 
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
 def test_timer_stops_after_countdown():
     _ensure_app()
-    manager = TimerManager()
+    clock = _FakeClock()
+    manager = TimerManager(clock=clock)
 
     states = []
     ticks = []
@@ -22,19 +33,24 @@ def test_timer_stops_after_countdown():
     manager.timer_state_changed.connect(lambda item_id, state: states.append((item_id, state)))
     manager.timer_tick.connect(lambda item_id, remaining, total: ticks.append((item_id, remaining, total)))
 
-    item = {
-        "id": "item-1",
-        "countdown_sec": 2,
-        "infinite_loop": False,
-        "play_mode": "文字",
-        "tts_text": "",
-        "audio_path": "",
-        "volume": 80,
-    }
+    item = TimerItem(
+        id="item-1",
+        countdown_sec=2,
+        infinite_loop=False,
+        play_mode="文字",
+        tts_text="",
+        audio_path="",
+        volume=80,
+    )
 
     manager.start_item(item)
-    manager._on_tick()
-    manager._on_tick()
+    clock.now += 1
+    manager._on_expiry()
+    assert manager.is_running("item-1")
+    assert manager.get_remaining("item-1", 2) == 1
+
+    clock.now += 1
+    manager._on_expiry()
 
     assert not manager.is_running("item-1")
     assert states[-1] == ("item-1", "stopped")
@@ -43,23 +59,181 @@ def test_timer_stops_after_countdown():
 
 def test_infinite_loop_keeps_timer_running():
     _ensure_app()
-    manager = TimerManager()
-
-    item = {
-        "id": "loop-item",
-        "countdown_sec": 1,
-        "infinite_loop": True,
-        "play_mode": "文字",
-        "tts_text": "",
-        "audio_path": "",
-        "volume": 80,
-    }
+    clock = _FakeClock()
+    manager = TimerManager(clock=clock)
+
+    item = TimerItem(
+        id="loop-item",
+        countdown_sec=1,
+        infinite_loop=True,
+        play_mode="文字",
+        tts_text="",
+        audio_path="",
+        volume=80,
+    )
 
     manager.start_item(item)
-    manager._on_tick()
+    clock.now += 1
+    manager._on_expiry()
 
     assert manager.is_running("loop-item")
     assert manager.get_state("loop-item") == "looping"
     assert manager.get_remaining("loop-item", 1) == 1
 
     manager.stop_all()
+
+
+def test_expiry_timer_is_armed_for_nearest_deadline():
+    _ensure_app()
+    clock = _FakeClock()
+    manager = TimerManager(clock=clock)
+
+    for index, countdown in enumerate((30, 5, 12)):
+        manager.start_item(TimerItem(id=f"item-{index}", countdown_sec=countdown, tts_text=""))
+
+    assert manager._expiry_timer.isActive()
+    assert manager._expiry_timer.interval() == 5000
+
+    manager.stop_item("item-1")
+    assert manager._expiry_timer.interval() == 12000
+
+    clock.now += 12
+    manager._on_expiry()
+    assert manager.get_state("item-2") == "stopped"
+    assert manager.get_remaining("item-0", 30) == 18
+    assert manager._expiry_timer.interval() == 18000
+
+    manager.stop_all()
+    assert not manager._expiry_timer.isActive()
+
+
+def test_display_tick_emits_one_batch_for_all_running_items():
+    _ensure_app()
+    clock = _FakeClock()
+    manager = TimerManager(clock=clock)
+
+    for index in range(300):
+        manager.start_item(TimerItem(id=f"item-{index}", countdown_sec=60, tts_text=""))
+
+    ticks = []
+    batches = []
+    manager.timer_tick.connect(lambda item_id, remaining, total: ticks.append(item_id))
+    manager.timers_ticked.connect(batches.append)
+
+    clock.now += 1
+    manager._on_tick()
+
+    assert ticks == []
+    assert len(batches) == 1
+    assert len(batches[0]) == 300
+    assert batches[0][0] == ("item-0", 59, 60, "running")
+
+    manager.stop_all()
+
+
+def test_display_tick_only_checks_visible_items():
+    _ensure_app()
+    clock = _FakeClock()
+    manager = TimerManager(clock=clock)
+
+    items = [TimerItem(id=f"item-{index}", countdown_sec=60, tts_text="") for index in range(300)]
+    for item in items:
+        manager.start_item(item)
+    idle = TimerItem(id="idle", countdown_sec=60, tts_text="")
+    manager.set_visible_items(lambda: items[10:13] + [idle])
+
+    batches = []
+    manager.timers_ticked.connect(batches.append)
+    clock.now += 1
+    manager._on_tick()
+
+    assert batches == [[(f"item-{index}", 59, 60, "running") for index in (10, 11, 12)]]
+
+    manager.stop_all()
+
+
+def _capture_alerts(monkeypatch):
+    alerts = []
+    monkeypatch.setattr(
+        timer_manager,
+        "play_audio",
+        lambda path, volume, key=None, priority=PRIORITY_NORMAL: alerts.append(("file", path, volume, priority, key)),
+    )
+    monkeypatch.setattr(
+        timer_manager,
+        "speak_text",
+        lambda text, volume, key=None, priority=PRIORITY_NORMAL: alerts.append(("tts", text, volume, priority, key)),
+    )
+    return alerts
+
+
+def test_single_expiry_plays_under_its_item_key(monkeypatch):
+    _ensure_app()
+    alerts = _capture_alerts(monkeypatch)
+    clock = _FakeClock()
+    manager = TimerManager(clock=clock)
+
+    manager.start_item(TimerItem(id="solo", countdown_sec=1, tts_text="王出現了", volume=50))
+    clock.now += 1
+    manager._on_expiry()
+
+    assert alerts == [("tts", "王出現了", 0.5, PRIORITY_NORMAL, "solo")]
+
+
+def test_expiry_burst_is_announced_once(monkeypatch, tmp_path):
+    _ensure_app()
+    alerts = _capture_alerts(monkeypatch)
+    clock = _FakeClock()
+    manager = TimerManager(clock=clock)
+    sound = str(tmp_path / "bell.wav")
+
+    items = [
+        TimerItem(id="a", countdown_sec=5, tts_text="輪迴", volume=40),
+        TimerItem(id="b", countdown_sec=5, tts_text="輪迴", volume=90),
+        TimerItem(id="c", countdown_sec=5, tts_text="吃藥", priority=PRIORITY_CRITICAL),
+        TimerItem(id="d", countdown_sec=5, play_mode="音檔", audio_path=sound, volume=30),
+        TimerItem(id="e", countdown_sec=5, play_mode="音檔", audio_path=sound, volume=60),
+        TimerItem(id="f", countdown_sec=5, play_mode="音檔", audio_path=str(tmp_path / "other.wav")),
+    ]
+    for item in items:
+        manager.start_item(item)
+    clock.now += 5
+    manager._on_expiry()
+
+    assert alerts == [
+        ("file", sound, 0.6, PRIORITY_NORMAL, f"file:{timer_manager.os.path.normcase(sound)}"),
+        ("file", str(tmp_path / "other.wav"), 0.8, PRIORITY_NORMAL, "f"),
+        ("tts", "輪迴，吃藥", 0.9, PRIORITY_CRITICAL, "tts:輪迴，吃藥"),
+    ]
+
+
+def test_large_burst_announcement_names_the_first_texts_and_a_count(monkeypatch):
+    _ensure_app()
+    alerts = _capture_alerts(monkeypatch)
+    clock = _FakeClock()
+    manager = TimerManager(clock=clock)
+
+    for index in range(500):
+        manager.start_item(TimerItem(id=f"item-{index}", countdown_sec=3, tts_text=f"提醒{index}"))
+    clock.now += 3
+    manager._on_expiry()
+
+    assert len(alerts) == 1
+    assert alerts[0][1] == "提醒0，提醒1，提醒2，提醒3，提醒4等 500 項提醒"
+
+
+def test_looping_item_alerts_on_every_expiry_pass(monkeypatch):
+    _ensure_app()
+    alerts = _capture_alerts(monkeypatch)
+    clock = _FakeClock()
+    manager = TimerManager(clock=clock)
+
+    manager.start_item(TimerItem(id="loop", countdown_sec=1, infinite_loop=True, tts_text="再來一次"))
+    for _ in range(3):
+        clock.now += 1
+        manager._on_expiry()
+
+    assert [alert[4] for alert in alerts] == ["loop", "loop", "loop"]
+    assert manager._pending_alerts == []
+
+    manager.stop_all()
@@ -0,0 +1,276 @@
+﻿from __future__ import annotations
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from timer_core import (
+    STATE_IDLE,
+    STATE_LOOPING,
+    STATE_RUNNING,
+    STATE_STOPPED,
+    BatchTickCallback,
+    ExpiredCallback,
+    StateCallback,
+    TickCallback,
+    TickSnapshot,
+    TimerItem,
+    _noop,
+)
+
+INITIAL_CAPACITY = 1024
+
+
+class ArrayTimerEngine:
+    # Drop-in alternative to TimerEngine for very large timer sets. Timing state
+    # lives in per-slot NumPy buffers, so finding expiries and changed displays is
+    # one vectorized pass instead of a heap walk or a loop over every item. Only
+    # item.state and item.total are kept on the TimerItem; the buffers own the
+    # rest of the runtime fields. Loop flags are captured when a timer starts.
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        on_tick: TickCallback | None = None,
+        on_state_changed: StateCallback | None = None,
+        on_expired: ExpiredCallback | None = None,
+        on_batch_tick: BatchTickCallback | None = None,
+        capacity: int = INITIAL_CAPACITY,
+    ) -> None:
+        self._clock = clock
+        self._on_tick = on_tick or _noop
+        self._on_batch_tick = on_batch_tick or _noop
+        self._on_state_changed = on_state_changed or _noop
+        self._on_expired = on_expired or _noop
+
+        self.items_by_id: Dict[str, TimerItem] = {}
+        self.active_timers: Dict[str, TimerItem] = {}
+
+        self._slot_by_id: Dict[str, int] = {}
+        self._items: List[Optional[TimerItem]] = []
+        self._free_slots: List[int] = []
+
+        capacity = max(1, capacity)
+        # Idle slots keep an infinite deadline, so "deadline <= now" alone finds
+        # expiries and "ceil(deadline - now) != reported" ignores them.
+        self._deadline = np.full(capacity, np.inf)
+        self._reported = np.full(capacity, np.inf)
+        self._started_at = np.zeros(capacity)
+        self._total = np.ones(capacity)
+        self._cycle = np.zeros(capacity, dtype=np.int64)
+        self._loop = np.zeros(capacity, dtype=bool)
+
+    def start_item(self, item: TimerItem) -> None:
+        self.start_items([item])
+
+    def start_items(self, items: Iterable[TimerItem]) -> None:
+        items = list(items)
+        if not items:
+            return
+
+        slots = np.fromiter((self._slot_for(item) for item in items), dtype=np.int64, count=len(items))
+        totals = np.fromiter((max(1, int(item.countdown_sec)) for item in items), dtype=np.float64, count=len(items))
+        loops = np.fromiter((bool(item.infinite_loop) for item in items), dtype=bool, count=len(items))
+        started_at = self._clock()
+
+        self._started_at[slots] = started_at
+        self._total[slots] = totals
+        self._cycle[slots] = 0
+        self._loop[slots] = loops
+        self._deadline[slots] = started_at + totals
+        self._reported[slots] = totals
+
+        for item, total, loop in zip(items, totals.tolist(), loops.tolist()):
+            total = int(total)
+            item.total = total
+            item.state = STATE_LOOPING if loop else STATE_RUNNING
+            self.active_timers[item.id] = item
+            self._on_state_changed(item.id, item.state)
+            self._on_tick(item.id, total, total)
+
+    def toggle_item(self, item: TimerItem) -> None:
+        if self.is_running(item.id):
+            self.stop_item(item.id)
+        else:
+            self.start_item(item)
+
+    def stop_item(self, item_id: str) -> None:
+        slot = self._slot_by_id.get(item_id)
+        if slot is None:
+            return
+
+        item = self._items[slot]
+        self.active_timers.pop(item_id, None)
+        self._deadline[slot] = np.inf
+        self._reported[slot] = np.inf
+        item.state = STATE_STOPPED
+        self._on_tick(item_id, 0, item.total)
+        self._on_state_changed(item_id, STATE_STOPPED)
+
+    def stop_all(self) -> None:
+        size = len(self._items)
+        self._deadline[:size] = np.inf
+        self._reported[:size] = np.inf
+
+        active_items = list(self.active_timers.values())
+        self.active_timers.clear()
+        for item in active_items:
+            item.state = STATE_STOPPED
+            self._on_tick(item.id, 0, item.total)
+            self._on_state_changed(item.id, STATE_STOPPED)
+
+    def remove_item(self, item_id: str) -> None:
+        if self.is_running(item_id):
+            self.stop_item(item_id)
+
+        slot = self._slot_by_id.pop(item_id, None)
+        if slot is None:
+            return
+        self.items_by_id.pop(item_id, None)
+        self._items[slot] = None
+        self._free_slots.append(slot)
+
+    def is_running(self, item_id: str) -> bool:
+        return item_id in self.active_timers
+
+    def remaining_for(self, item: TimerItem) -> float:
+        slot = self._slot_by_id.get(item.id)
+        if slot is None or self._items[slot] is not item:
+            return item.countdown_sec
+        return self._remaining_at(slot, item.countdown_sec)
+
+    def get_remaining(self, item_id: str, default_total: int) -> float:
+        slot = self._slot_by_id.get(item_id)
+        if slot is None:
+            return default_total
+        return self._remaining_at(slot, default_total)
+
+    def get_state(self, item_id: str) -> str:
+        item = self.items_by_id.get(item_id)
+        return STATE_IDLE if item is None else item.state
+
+    def next_deadline(self) -> Optional[float]:
+        if not self.active_timers:
+            return None
+        return float(self._deadline[: len(self._items)].min())
+
+    def expire_slots(self) -> Tuple[float, np.ndarray]:
+        # One compare finds every expiry; looping slots are moved to their next
+        # start_at + n * total deadline in the same pass (skipping missed cycles)
+        # and finished slots go idle. Returns the clock reading and the slots.
+        now = self._clock()
+        size = len(self._items)
+        expired = np.flatnonzero(self._deadline[:size] <= now)
+        if not expired.size:
+            return now, expired
+
+        looping = expired[self._loop[expired]]
+        if looping.size:
+            totals = self._total[looping]
+            started_at = self._started_at[looping]
+            elapsed_cycles = np.floor((now - started_at) / totals).astype(np.int64)
+            cycles = np.maximum(self._cycle[looping] + 1, elapsed_cycles)
+            self._cycle[looping] = cycles
+            self._deadline[looping] = started_at + (cycles + 1) * totals
+            self._reported[looping] = totals
+
+        finished = expired[~self._loop[expired]]
+        self._deadline[finished] = np.inf
+        self._reported[finished] = np.inf
+        return now, expired
+
+    def process_expired(self) -> int:
+        _now, expired = self.expire_slots()
+
+        loops = self._loop[expired].tolist()
+        for slot, loop in zip(expired.tolist(), loops):
+            item = self._items[slot]
+            total = item.total
+            self._on_expired(item)
+
+            if loop:
+                item.state = STATE_LOOPING
+                self._on_state_changed(item.id, STATE_LOOPING)
+                self._on_tick(item.id, total, total)
+            else:
+                self.active_timers.pop(item.id, None)
+                item.state = STATE_STOPPED
+                self._on_tick(item.id, 0, total)
+                self._on_state_changed(item.id, STATE_STOPPED)
+
+        return len(loops)
+
+    def tick_slots(self, slots: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        # Whole-second remaining values that changed since the last report, as
+        # (slots, remaining) arrays; tick() turns them into a TickSnapshot.
+        # `slots` restricts the pass; idle slots never report a change.
+        now = self._clock()
+        if slots is None:
+            size = len(self._items)
+            remaining = np.ceil(self._deadline[:size] - now)
+            np.maximum(remaining, 0.0, out=remaining)
+            changed = np.flatnonzero(remaining != self._reported[:size])
+            changed_remaining = remaining[changed]
+        else:
+            remaining = np.ceil(self._deadline[slots] - now)
+            np.maximum(remaining, 0.0, out=remaining)
+            mask = remaining != self._reported[slots]
+            changed = slots[mask]
+            changed_remaining = remaining[mask]
+
+        self._reported[changed] = changed_remaining
+        return changed, changed_remaining.astype(np.int64)
+
+    def tick(self, items: Optional[Iterable[TimerItem]] = None) -> TickSnapshot:
+        if items is None:
+            slots, remaining = self.tick_slots()
+        else:
+            slot_by_id = self._slot_by_id
+            selected = [slot_by_id[item.id] for item in items if item.id in slot_by_id]
+            slots, remaining = self.tick_slots(np.array(selected, dtype=np.int64))
+        items = self._items
+        snapshot: TickSnapshot = []
+
+        for slot, value in zip(slots.tolist(), remaining.tolist()):
+            item = items[slot]
+            snapshot.append((item.id, value, item.total, item.state))
+
+        if snapshot:
+            self._on_batch_tick(snapshot)
+        return snapshot
+
+    def _remaining_at(self, slot: int, default_total: int) -> float:
+        deadline = self._deadline[slot]
+        if deadline != np.inf:
+            return max(0.0, round(float(deadline) - self._clock(), 3))
+        if self._items[slot].state == STATE_STOPPED:
+            return 0
+        return default_total
+
+    def _slot_for(self, item: TimerItem) -> int:
+        slot = self._slot_by_id.get(item.id)
+        if slot is None:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+                self._items[slot] = item
+            else:
+                slot = len(self._items)
+                self._items.append(item)
+                if slot >= len(self._deadline):
+                    self._grow(2 * len(self._deadline))
+            self._slot_by_id[item.id] = slot
+        else:
+            self._items[slot] = item
+
+        self.items_by_id[item.id] = item
+        return slot
+
+    def _grow(self, capacity: int) -> None:
+        extra = capacity - len(self._deadline)
+        self._deadline = np.concatenate((self._deadline, np.full(extra, np.inf)))
+        self._reported = np.concatenate((self._reported, np.full(extra, np.inf)))
+        self._started_at = np.concatenate((self._started_at, np.zeros(extra)))
+        self._total = np.concatenate((self._total, np.ones(extra)))
+        self._cycle = np.concatenate((self._cycle, np.zeros(extra, dtype=np.int64)))
+        self._loop = np.concatenate((self._loop, np.zeros(extra, dtype=bool)))
@@ -0,0 +1,270 @@
+﻿from __future__ import annotations
+
+import heapq
+import math
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+STATE_IDLE = "idle"
+STATE_RUNNING = "running"
+STATE_LOOPING = "looping"
+STATE_STOPPED = "stopped"
+
+# Alert priority: decides which voices keep a mixer channel when many fire at once.
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_CRITICAL = 2
+
+TickCallback = Callable[[str, int, int], None]
+TickSnapshot = List[Tuple[str, int, int, str]]
+BatchTickCallback = Callable[[TickSnapshot], None]
+StateCallback = Callable[[str, str], None]
+ExpiredCallback = Callable[["TimerItem"], None]
+
+CONFIG_FIELDS = (
+    "id",
+    "name",
+    "play_mode",
+    "tts_text",
+    "audio_path",
+    "countdown_sec",
+    "infinite_loop",
+    "volume",
+    "priority",
+    "hotkey",
+    "sort_order",
+)
+
+
+def _noop(*_args) -> None:
+    return None
+
+
+@dataclass(slots=True, eq=False)
+class TimerItem:
+    id: str
+    name: str = "未命名項目"
+    play_mode: str = "文字"
+    tts_text: str = ""
+    audio_path: str = ""
+    countdown_sec: int = 30
+    infinite_loop: bool = False
+    volume: int = 80
+    priority: int = PRIORITY_NORMAL
+    hotkey: Optional[str] = None
+    sort_order: int = 0
+
+    # Runtime state owned by TimerEngine; never persisted.
+    state: str = STATE_IDLE
+    total: int = 0
+    started_at: float = 0.0
+    cycle: int = 0
+    deadline: float = 0.0
+    # Matches the live heap entry; 0 once the timer is stopped.
+    sequence: int = 0
+    reported: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TimerItem":
+        return cls(**{key: data[key] for key in CONFIG_FIELDS if key in data})
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "play_mode": self.play_mode,
+            "tts_text": self.tts_text,
+            "audio_path": self.audio_path,
+            "countdown_sec": self.countdown_sec,
+            "infinite_loop": self.infinite_loop,
+            "volume": self.volume,
+            "priority": self.priority,
+            "hotkey": self.hotkey,
+            "sort_order": self.sort_order,
+        }
+
+
+class VirtualClock:
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = float(start)
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    def run(self, engine: "TimerEngine", seconds: float) -> int:
+        end = self.now + seconds
+        processed = 0
+        while True:
+            deadline = engine.next_deadline()
+            if deadline is None or deadline > end:
+                break
+            self.now = max(self.now, deadline)
+            processed += engine.process_expired()
+        self.now = end
+        return processed
+
+
+class TimerEngine:
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        on_tick: TickCallback | None = None,
+        on_state_changed: StateCallback | None = None,
+        on_expired: ExpiredCallback | None = None,
+        on_batch_tick: BatchTickCallback | None = None,
+    ) -> None:
+        self._clock = clock
+        self._on_tick = on_tick or _noop
+        self._on_batch_tick = on_batch_tick or _noop
+        self._on_state_changed = on_state_changed or _noop
+        self._on_expired = on_expired or _noop
+
+        # Every item the engine has started, and the subset currently counting down.
+        self.items_by_id: Dict[str, TimerItem] = {}
+        self.active_timers: Dict[str, TimerItem] = {}
+
+        # (deadline, sequence, item); entries whose sequence no longer matches
+        # the item's are stale and skipped lazily.
+        self._deadline_heap: List[Tuple[float, int, TimerItem]] = []
+        self._next_sequence = 0
+
+    def start_item(self, item: TimerItem) -> None:
+        total = max(1, int(item.countdown_sec))
+        started_at = self._clock()
+
+        item.total = total
+        item.started_at = started_at
+        item.cycle = 0
+        item.deadline = started_at + total
+        item.reported = total
+        item.state = STATE_LOOPING if item.infinite_loop else STATE_RUNNING
+
+        self.items_by_id[item.id] = item
+        self.active_timers[item.id] = item
+        self._schedule(item)
+
+        self._on_state_changed(item.id, item.state)
+        self._on_tick(item.id, total, total)
+
+    def toggle_item(self, item: TimerItem) -> None:
+        if self.is_running(item.id):
+            self.stop_item(item.id)
+        else:
+            self.start_item(item)
+
+    def stop_item(self, item_id: str) -> None:
+        item = self.items_by_id.get(item_id)
+        if item is None:
+            return
+
+        self.active_timers.pop(item_id, None)
+        item.sequence = 0
+        item.state = STATE_STOPPED
+        self._on_tick(item_id, 0, item.total)
+        self._on_state_changed(item_id, STATE_STOPPED)
+
+    def stop_all(self) -> None:
+        for item_id in list(self.active_timers.keys()):
+            self.stop_item(item_id)
+
+    def remove_item(self, item_id: str) -> None:
+        if self.is_running(item_id):
+            self.stop_item(item_id)
+        self.items_by_id.pop(item_id, None)
+
+    def is_running(self, item_id: str) -> bool:
+        return item_id in self.active_timers
+
+    def remaining_for(self, item: TimerItem) -> float:
+        state = item.state
+        if state == STATE_RUNNING or state == STATE_LOOPING:
+            return max(0.0, round(item.deadline - self._clock(), 3))
+        if state == STATE_STOPPED:
+            return 0
+        return item.countdown_sec
+
+    def get_remaining(self, item_id: str, default_total: int) -> float:
+        item = self.items_by_id.get(item_id)
+        if item is None:
+            return default_total
+        return self.remaining_for(item)
+
+    def get_state(self, item_id: str) -> str:
+        item = self.items_by_id.get(item_id)
+        return STATE_IDLE if item is None else item.state
+
+    def next_deadline(self) -> Optional[float]:
+        heap = self._deadline_heap
+        while heap and heap[0][2].sequence != heap[0][1]:
+            heapq.heappop(heap)
+
+        if len(heap) > 2 * len(self.active_timers) + 16:
+            self._deadline_heap = heap = [entry for entry in heap if entry[2].sequence == entry[1]]
+            heapq.heapify(heap)
+
+        return heap[0][0] if heap else None
+
+    def process_expired(self) -> int:
+        now = self._clock()
+        heap = self._deadline_heap
+        processed = 0
+
+        while heap and heap[0][0] <= now:
+            _deadline, sequence, item = heapq.heappop(heap)
+            if item.sequence != sequence:
+                continue
+
+            total = item.total
+            processed += 1
+
+            self._on_expired(item)
+
+            if item.infinite_loop:
+                # Deadlines stay on the start_at + n * total grid, so a late
+                # callback never pushes later cycles back; cycles missed while
+                # the event loop was blocked are skipped instead of replayed.
+                elapsed_cycles = int((now - item.started_at) // total)
+                item.cycle = max(item.cycle + 1, elapsed_cycles)
+                item.deadline = item.started_at + (item.cycle + 1) * total
+                item.reported = total
+                self._schedule(item)
+                item.state = STATE_LOOPING
+                self._on_state_changed(item.id, STATE_LOOPING)
+                self._on_tick(item.id, total, total)
+            else:
+                self.active_timers.pop(item.id, None)
+                item.sequence = 0
+                item.state = STATE_STOPPED
+                self._on_tick(item.id, 0, total)
+                self._on_state_changed(item.id, STATE_STOPPED)
+
+        return processed
+
+    def tick(self, items: Optional[Iterable[TimerItem]] = None) -> TickSnapshot:
+        # `items` limits the pass to the rows on screen; anything else is
+        # read on demand through remaining_for() when it is shown.
+        now = self._clock()
+        snapshot: TickSnapshot = []
+        active = self.active_timers
+
+        for item in active.values() if items is None else items:
+            if items is not None and item.id not in active:
+                continue
+            remaining = max(0, math.ceil(item.deadline - now))
+            if remaining == item.reported:
+                continue
+            item.reported = remaining
+            snapshot.append((item.id, remaining, item.total, item.state))
+
+        if snapshot:
+            self._on_batch_tick(snapshot)
+        return snapshot
+
+    def _schedule(self, item: TimerItem) -> None:
+        self._next_sequence += 1
+        item.sequence = self._next_sequence
+        heapq.heappush(self._deadline_heap, (item.deadline, self._next_sequence, item))
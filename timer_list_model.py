@@ -0,0 +1,375 @@
+﻿from __future__ import annotations
+
+import math
+from typing import Any, Dict, List
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QByteArray,
+    QEvent,
+    QMimeData,
+    QModelIndex,
+    QRect,
+    QSize,
+    Qt,
+    Signal,
+)
+from PySide6.QtGui import QColor, QFont, QPainter
+from PySide6.QtWidgets import QHeaderView, QStyledItemDelegate, QTableView
+
+from timer_core import TimerItem
+from timer_manager import TimerManager
+
+STATE_LABELS = {
+    TimerManager.STATE_IDLE: "Idle",
+    TimerManager.STATE_RUNNING: "Running",
+    TimerManager.STATE_LOOPING: "Looping",
+    TimerManager.STATE_STOPPED: "Stopped",
+}
+
+STATE_COLORS = {
+    TimerManager.STATE_IDLE: "#5f7388",
+    TimerManager.STATE_RUNNING: "#00c896",
+    TimerManager.STATE_LOOPING: "#4aa3ff",
+    TimerManager.STATE_STOPPED: "#ff5d73",
+}
+
+
+# Resolving Qt enum members costs microseconds per access in PySide6, and
+# data() runs for every visible cell on every repaint.
+_DISPLAY_ROLE = Qt.ItemDataRole.DisplayRole
+_FOREGROUND_ROLE = Qt.ItemDataRole.ForegroundRole
+_USER_ROLE = Qt.ItemDataRole.UserRole
+_STATE_QCOLORS = {state: QColor(color) for state, color in STATE_COLORS.items()}
+_DEFAULT_STATE_QCOLOR = QColor("#5f7388")
+_ROOT_FLAGS = Qt.ItemFlag.ItemIsDropEnabled
+_ROW_FLAGS = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsDragEnabled
+
+
+def format_seconds(total_seconds: float) -> str:
+    safe_value = max(0, math.ceil(total_seconds))
+    minute = safe_value // 60
+    second = safe_value % 60
+    return f"{minute:02d}:{second:02d}"
+
+
+class TimerListModel(QAbstractTableModel):
+    order_changed = Signal(list)
+
+    COLUMN_NAME = 0
+    COLUMN_TIME = 1
+    COLUMN_STATE = 2
+    COLUMN_HOTKEY = 3
+    COLUMN_ACTIONS = 4
+
+    HEADERS = ["名稱", "剩餘 / 總時", "狀態", "熱鍵", "操作"]
+    MIME_TYPE = "application/x-maple-story-timer-row"
+
+    def __init__(self, timer_manager: TimerManager, parent=None) -> None:
+        super().__init__(parent)
+        self._timer_manager = timer_manager
+        self._items: List[TimerItem] = []
+        self._row_by_id: Dict[str, int] = {}
+
+    def set_items(self, items: List[TimerItem]) -> None:
+        # The list is shared with the caller; structural edits go through
+        # insert_item / remove_item / move_row so both sides stay in sync.
+        self.beginResetModel()
+        self._items = items
+        self._row_by_id = {}
+        self._reindex_rows(0, len(items) - 1)
+        self.endResetModel()
+
+    def insert_item(self, row: int, item: TimerItem) -> None:
+        row = max(0, min(row, len(self._items)))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.insert(row, item)
+        self._reindex_rows(row, len(self._items) - 1)
+        self.endInsertRows()
+
+    def remove_item(self, item_id: str) -> TimerItem | None:
+        row = self.row_of(item_id)
+        if row < 0:
+            return None
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        item = self._items.pop(row)
+        del self._row_by_id[item_id]
+        self._reindex_rows(row, len(self._items) - 1)
+        self.endRemoveRows()
+        return item
+
+    def item_at(self, row: int) -> TimerItem | None:
+        if 0 <= row < len(self._items):
+            return self._items[row]
+        return None
+
+    def items_in_rows(self, first_row: int, last_row: int) -> List[TimerItem]:
+        return self._items[max(0, first_row):last_row + 1]
+
+    def row_of(self, item_id: str) -> int:
+        return self._row_by_id.get(item_id, -1)
+
+    def refresh_item(self, item_id: str) -> None:
+        row = self.row_of(item_id)
+        if row < 0:
+            return
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.COLUMN_ACTIONS - 1))
+
+    def refresh_all(self) -> None:
+        if self._items:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._items) - 1, self.COLUMN_ACTIONS - 1))
+
+    def apply_tick(self, snapshot: list) -> None:
+        rows = sorted(row for row in (self.row_of(entry[0]) for entry in snapshot) if row >= 0)
+        if not rows:
+            return
+
+        # Ticks only change the time column; contiguous rows share one dataChanged.
+        range_start = previous = rows[0]
+        for row in rows[1:]:
+            if row != previous + 1:
+                self._emit_time_changed(range_start, previous)
+                range_start = row
+            previous = row
+        self._emit_time_changed(range_start, previous)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole) -> Any:
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        item = self.item_at(index.row()) if index.isValid() else None
+        if item is None:
+            return None
+
+        column = index.column()
+        if role == _USER_ROLE:
+            return item.id
+
+        if role == _DISPLAY_ROLE:
+            if column == self.COLUMN_NAME:
+                return item.name
+            if column == self.COLUMN_TIME:
+                remaining = self._timer_manager.remaining_for(item)
+                return f"{format_seconds(remaining)} / {format_seconds(item.countdown_sec)}"
+            if column == self.COLUMN_STATE:
+                return STATE_LABELS.get(item.state, "Idle")
+            if column == self.COLUMN_HOTKEY:
+                return item.hotkey or "-"
+            return None
+
+        if role == _FOREGROUND_ROLE and column == self.COLUMN_STATE:
+            return _STATE_QCOLORS.get(item.state, _DEFAULT_STATE_QCOLOR)
+
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        if not index.isValid():
+            return _ROOT_FLAGS
+        return _ROW_FLAGS
+
+    def supportedDropActions(self) -> Qt.DropActions:
+        return Qt.MoveAction
+
+    def mimeTypes(self) -> List[str]:
+        return [self.MIME_TYPE]
+
+    def mimeData(self, indexes) -> QMimeData:
+        rows = sorted({index.row() for index in indexes if index.isValid()})
+        mime_data = QMimeData()
+        if rows:
+            mime_data.setData(self.MIME_TYPE, QByteArray(str(rows[0]).encode("ascii")))
+        return mime_data
+
+    def dropMimeData(self, data: QMimeData, action, row: int, column: int, parent: QModelIndex) -> bool:
+        if action != Qt.MoveAction or not data.hasFormat(self.MIME_TYPE):
+            return False
+
+        try:
+            source_row = int(bytes(data.data(self.MIME_TYPE)).decode("ascii"))
+        except ValueError:
+            return False
+
+        if row < 0:
+            row = parent.row() if parent.isValid() else len(self._items)
+        self.move_row(source_row, row)
+
+        # Returning False keeps the view from removing the source row after a
+        # MoveAction; the move has already been applied above.
+        return False
+
+    def move_row(self, source_row: int, destination_row: int) -> bool:
+        if not 0 <= source_row < len(self._items):
+            return False
+        destination_row = max(0, min(destination_row, len(self._items)))
+        if destination_row in (source_row, source_row + 1):
+            return False
+
+        self.beginMoveRows(QModelIndex(), source_row, source_row, QModelIndex(), destination_row)
+        item = self._items.pop(source_row)
+        insert_at = destination_row - 1 if destination_row > source_row else destination_row
+        self._items.insert(insert_at, item)
+        self._reindex_rows(min(source_row, insert_at), max(source_row, insert_at))
+        self.endMoveRows()
+
+        self.order_changed.emit([current.id for current in self._items])
+        return True
+
+    def _emit_time_changed(self, first_row: int, last_row: int) -> None:
+        self.dataChanged.emit(
+            self.index(first_row, self.COLUMN_TIME),
+            self.index(last_row, self.COLUMN_TIME),
+            [_DISPLAY_ROLE],
+        )
+
+    def _reindex_rows(self, first_row: int, last_row: int) -> None:
+        items = self._items
+        row_by_id = self._row_by_id
+        for row in range(first_row, last_row + 1):
+            row_by_id[items[row].id] = row
+
+
+class RowActionDelegate(QStyledItemDelegate):
+    start_clicked = Signal(str)
+    stop_clicked = Signal(str)
+
+    BUTTON_WIDTH = 54
+    BUTTON_HEIGHT = 30
+    BUTTON_SPACING = 4
+    BUTTON_LABELS = ("開始", "停止")
+
+    COLOR_NORMAL = "#1f8e73"
+    COLOR_HOVER = "#24a586"
+    COLOR_PRESSED = "#1a7a62"
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._hover: tuple[int, int] | None = None
+        self._pressed: tuple[int, int] | None = None
+
+    def sizeHint(self, option, index: QModelIndex) -> QSize:
+        return QSize(self.column_width(), self.BUTTON_HEIGHT + 4)
+
+    def column_width(self) -> int:
+        return self.BUTTON_WIDTH * 2 + self.BUTTON_SPACING + 8
+
+    def paint(self, painter: QPainter, option, index: QModelIndex) -> None:
+        super().paint(painter, option, index)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+
+        for button, rect in enumerate(self._button_rects(option.rect)):
+            key = (index.row(), button)
+            if self._pressed == key:
+                color = self.COLOR_PRESSED
+            elif self._hover == key:
+                color = self.COLOR_HOVER
+            else:
+                color = self.COLOR_NORMAL
+
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(rect, 6, 6)
+            painter.setPen(QColor("#ffffff"))
+            painter.drawText(rect, Qt.AlignCenter, self.BUTTON_LABELS[button])
+            painter.setPen(Qt.NoPen)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index: QModelIndex) -> bool:
+        event_type = event.type()
+        if event_type == QEvent.MouseButtonDblClick:
+            event_type = QEvent.MouseButtonPress
+        if event_type not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease, QEvent.MouseMove):
+            return False
+
+        button = self._button_at(option.rect, event.position().toPoint())
+        key = (index.row(), button) if button is not None else None
+
+        if event_type == QEvent.MouseMove:
+            self._set_hover(key, option)
+            return False
+
+        if event.button() != Qt.LeftButton:
+            return False
+
+        if event_type == QEvent.MouseButtonPress:
+            self._pressed = key
+            self._update_view(option)
+            return key is not None
+
+        pressed, self._pressed = self._pressed, None
+        self._update_view(option)
+        if key is None or key != pressed:
+            return False
+
+        item_id = index.data(_USER_ROLE)
+        if item_id:
+            if button == 0:
+                self.start_clicked.emit(item_id)
+            else:
+                self.stop_clicked.emit(item_id)
+        return True
+
+    def clear_hover(self) -> None:
+        self._hover = None
+        self._pressed = None
+
+    def _set_hover(self, key: tuple[int, int] | None, option) -> None:
+        if key == self._hover:
+            return
+        self._hover = key
+        self._update_view(option)
+
+    @staticmethod
+    def _update_view(option) -> None:
+        view = option.widget
+        if view is not None:
+            view.viewport().update()
+
+    def _button_rects(self, cell: QRect) -> tuple[QRect, QRect]:
+        height = min(self.BUTTON_HEIGHT, cell.height() - 4)
+        top = cell.top() + (cell.height() - height) // 2
+        left = cell.left() + 4
+        start_rect = QRect(left, top, self.BUTTON_WIDTH, height)
+        stop_rect = QRect(left + self.BUTTON_WIDTH + self.BUTTON_SPACING, top, self.BUTTON_WIDTH, height)
+        return start_rect, stop_rect
+
+    def _button_at(self, cell: QRect, position) -> int | None:
+        for button, rect in enumerate(self._button_rects(cell)):
+            if rect.contains(position):
+                return button
+        return None
+
+
+class TimerTableView(QTableView):
+    ROW_HEIGHT = 34
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.setMouseTracking(True)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.verticalHeader().hide()
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
+
+    def leaveEvent(self, event) -> None:
+        delegate = self.itemDelegateForColumn(TimerListModel.COLUMN_ACTIONS)
+        if isinstance(delegate, RowActionDelegate):
+            delegate.clear_hover()
+            self.viewport().update()
+        super().leaveEvent(event)
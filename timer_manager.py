@@ -1,153 +1,174 @@
 ﻿from __future__ import annotations
 
-from typing import Dict
+import math
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
 
-from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
 
+import timer_core
 from audio_manager import play_audio, speak_text
+from timer_core import TimerEngine, TimerItem
+
+# (kind, source, volume, priority, key); kind is "file" or "tts".
+Alert = Tuple[str, str, float, int, str]
 
 
 class TimerManager(QObject):
     timer_tick = Signal(str, int, int)
+    timers_ticked = Signal(list)
     timer_state_changed = Signal(str, str)
 
-    STATE_IDLE = "idle"
-    STATE_RUNNING = "running"
-    STATE_LOOPING = "looping"
-    STATE_STOPPED = "stopped"
-
-    def __init__(self, parent: QObject | None = None) -> None:
+    STATE_IDLE = timer_core.STATE_IDLE
+    STATE_RUNNING = timer_core.STATE_RUNNING
+    STATE_LOOPING = timer_core.STATE_LOOPING
+    STATE_STOPPED = timer_core.STATE_STOPPED
+
+    DISPLAY_INTERVAL_MS = 1000
+    # A burst announcement names at most this many texts, then a count.
+    BURST_MAX_TEXTS = 5
+    BURST_TEXT_SEPARATOR = "，"
+
+    def __init__(
+        self,
+        parent: QObject | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        engine_factory: Callable[..., TimerEngine] = TimerEngine,
+    ) -> None:
         super().__init__(parent)
-        self.active_timers: Dict[str, Dict] = {}
-        self.remaining_by_item: Dict[str, int] = {}
-        self.total_by_item: Dict[str, int] = {}
-        self.state_by_item: Dict[str, str] = {}
+        self._clock = clock
+        # Items that expired in the current pass, announced together after it.
+        self._pending_alerts: List[TimerItem] = []
+        # timer_array_engine.ArrayTimerEngine can be passed for very large timer sets.
+        self.engine = engine_factory(
+            clock=clock,
+            on_tick=self.timer_tick.emit,
+            on_state_changed=self.timer_state_changed.emit,
+            on_expired=self._pending_alerts.append,
+            on_batch_tick=self.timers_ticked.emit,
+        )
+
+        self._expiry_timer = QTimer(self)
+        self._expiry_timer.setSingleShot(True)
+        self._expiry_timer.setTimerType(Qt.PreciseTimer)
+        self._expiry_timer.timeout.connect(self._on_expiry)
 
         self._tick_timer = QTimer(self)
-        self._tick_timer.setInterval(1000)
+        self._tick_timer.setInterval(self.DISPLAY_INTERVAL_MS)
         self._tick_timer.timeout.connect(self._on_tick)
+        # Returns the items whose time is on screen; None ticks every timer.
+        self._visible_items: Callable[[], Iterable[TimerItem]] | None = None
 
-    def start_item(self, item: Dict) -> None:
-        item_id = str(item.get("id"))
-        countdown_sec = max(1, int(item.get("countdown_sec", 30)))
-
-        timer_payload = {
-            "item_id": item_id,
-            "remaining": countdown_sec,
-            "countdown_sec": countdown_sec,
-            "infinite_loop": bool(item.get("infinite_loop", False)),
-            "audio_path": item.get("audio_path", ""),
-            "tts_text": item.get("tts_text", ""),
-            "play_mode": item.get("play_mode", "文字"),
-            "volume": max(0, min(100, int(item.get("volume", 80)))),
-        }
-
-        self.active_timers[item_id] = timer_payload
-        self.total_by_item[item_id] = countdown_sec
-        self.remaining_by_item[item_id] = countdown_sec
-
-        state = self.STATE_LOOPING if timer_payload["infinite_loop"] else self.STATE_RUNNING
-        self.state_by_item[item_id] = state
-        self.timer_state_changed.emit(item_id, state)
-        self.timer_tick.emit(item_id, countdown_sec, countdown_sec)
+    @property
+    def active_timers(self) -> Dict[str, TimerItem]:
+        return self.engine.active_timers
 
+    def start_item(self, item: TimerItem) -> None:
+        self.engine.start_item(item)
+        self._arm_expiry_timer()
         if not self._tick_timer.isActive():
             self._tick_timer.start()
 
-    def toggle_item(self, item: Dict) -> None:
-        item_id = str(item.get("id"))
-        if self.is_running(item_id):
-            self.stop_item(item_id)
+    def toggle_item(self, item: TimerItem) -> None:
+        if self.is_running(item.id):
+            self.stop_item(item.id)
         else:
             self.start_item(item)
 
     def stop_item(self, item_id: str) -> None:
-        payload = self.active_timers.pop(item_id, None)
-        if payload is None and item_id not in self.state_by_item:
-            return
-
-        total = self.total_by_item.get(item_id)
-        if total is None and payload is not None:
-            total = int(payload.get("countdown_sec", 0))
-            self.total_by_item[item_id] = total
-        if total is None:
-            total = 0
-
-        self.remaining_by_item[item_id] = 0
-        self.state_by_item[item_id] = self.STATE_STOPPED
-        self.timer_tick.emit(item_id, 0, total)
-        self.timer_state_changed.emit(item_id, self.STATE_STOPPED)
-
-        if not self.active_timers and self._tick_timer.isActive():
-            self._tick_timer.stop()
+        self.engine.stop_item(item_id)
+        self._arm_expiry_timer()
 
     def stop_all(self) -> None:
-        for item_id in list(self.active_timers.keys()):
-            self.stop_item(item_id)
+        self.engine.stop_all()
+        self._arm_expiry_timer()
 
     def remove_item(self, item_id: str) -> None:
-        if self.is_running(item_id):
-            self.stop_item(item_id)
-        self.active_timers.pop(item_id, None)
-        self.remaining_by_item.pop(item_id, None)
-        self.total_by_item.pop(item_id, None)
-        self.state_by_item.pop(item_id, None)
+        self.engine.remove_item(item_id)
+        self._arm_expiry_timer()
+
+    def set_visible_items(self, provider: Callable[[], Iterable[TimerItem]] | None) -> None:
+        self._visible_items = provider
 
     def is_running(self, item_id: str) -> bool:
-        return item_id in self.active_timers
+        return self.engine.is_running(item_id)
 
-    def get_remaining(self, item_id: str, default_total: int) -> int:
-        if item_id in self.remaining_by_item:
-            return self.remaining_by_item[item_id]
+    def remaining_for(self, item: TimerItem) -> float:
+        return self.engine.remaining_for(item)
 
-        state = self.state_by_item.get(item_id, self.STATE_IDLE)
-        if state == self.STATE_STOPPED:
-            return 0
-        return default_total
+    def get_remaining(self, item_id: str, default_total: int) -> float:
+        return self.engine.get_remaining(item_id, default_total)
 
     def get_state(self, item_id: str) -> str:
-        return self.state_by_item.get(item_id, self.STATE_IDLE)
-
-    def _on_tick(self) -> None:
-        for item_id, payload in list(self.active_timers.items()):
-            payload["remaining"] -= 1
-            remaining = payload["remaining"]
-            total = payload["countdown_sec"]
-
-            if remaining > 0:
-                self.remaining_by_item[item_id] = remaining
-                self.timer_tick.emit(item_id, remaining, total)
-                continue
+        return self.engine.get_state(item_id)
 
-            self._play_notification(payload)
-
-            if payload["infinite_loop"]:
-                payload["remaining"] = total
-                self.remaining_by_item[item_id] = total
-                self.state_by_item[item_id] = self.STATE_LOOPING
-                self.timer_state_changed.emit(item_id, self.STATE_LOOPING)
-                self.timer_tick.emit(item_id, total, total)
-            else:
-                self.active_timers.pop(item_id, None)
-                self.remaining_by_item[item_id] = 0
-                self.state_by_item[item_id] = self.STATE_STOPPED
-                self.timer_tick.emit(item_id, 0, total)
-                self.timer_state_changed.emit(item_id, self.STATE_STOPPED)
-
-        if not self.active_timers and self._tick_timer.isActive():
+    def _arm_expiry_timer(self) -> None:
+        deadline = self.engine.next_deadline()
+        if deadline is None:
+            self._expiry_timer.stop()
             self._tick_timer.stop()
+            return
 
-    @staticmethod
-    def _play_notification(payload: Dict) -> None:
-        volume = max(0.0, min(1.0, int(payload.get("volume", 80)) / 100.0))
-        play_mode = payload.get("play_mode", "文字")
+        delay_ms = max(0, math.ceil((deadline - self._clock()) * 1000))
+        self._expiry_timer.start(delay_ms)
 
-        if play_mode == "音檔":
-            audio_path = str(payload.get("audio_path", "")).strip()
-            if audio_path:
-                play_audio(audio_path, volume)
-            return
+    def _on_expiry(self) -> None:
+        self.engine.process_expired()
+        self._flush_alerts()
+        self._arm_expiry_timer()
 
-        tts_text = str(payload.get("tts_text", "")).strip()
-        if tts_text:
-            speak_text(tts_text, volume)
+    def _on_tick(self) -> None:
+        provider = self._visible_items
+        self.engine.tick(None if provider is None else provider())
+
+    def _flush_alerts(self) -> None:
+        # Drain in place: the engine holds a bound append to this exact list.
+        items = self._pending_alerts[:]
+        self._pending_alerts.clear()
+        for kind, source, volume, priority, key in self._plan_alerts(items):
+            if kind == "file":
+                play_audio(source, volume, key=key, priority=priority)
+            else:
+                speak_text(source, volume, key=key, priority=priority)
+
+    @classmethod
+    def _plan_alerts(cls, items: List[TimerItem]) -> List[Alert]:
+        # Alerts from one expiry pass would talk over each other: identical
+        # audio files play once, and all texts become one announcement (its
+        # TTS is cached under the combined text). A merged alert takes the
+        # loudest volume and highest priority of the items it covers; an
+        # alert for a single item keeps the item id as its dispatcher key.
+        files: Dict[str, List] = {}
+        texts: Dict[str, List] = {}
+        for item in items:
+            if item.play_mode == "音檔":
+                source = str(item.audio_path).strip()
+                kind, group, group_key = "file", files, os.path.normcase(os.path.abspath(source))
+            else:
+                source = str(item.tts_text).strip()
+                kind, group, group_key = "tts", texts, source
+            if not source:
+                continue
+
+            volume = max(0.0, min(1.0, int(item.volume) / 100.0))
+            merged = group.get(group_key)
+            if merged is None:
+                group[group_key] = [source, volume, item.priority, item.id]
+            else:
+                merged[1] = max(merged[1], volume)
+                merged[2] = max(merged[2], item.priority)
+                merged[3] = f"{kind}:{group_key}"
+
+        alerts: List[Alert] = [("file", *merged) for merged in files.values()]
+        if len(texts) == 1:
+            alerts.extend(("tts", *merged) for merged in texts.values())
+        elif texts:
+            spoken = list(texts)[: cls.BURST_MAX_TEXTS]
+            announcement = cls.BURST_TEXT_SEPARATOR.join(spoken)
+            if len(texts) > len(spoken):
+                announcement += f"等 {len(texts)} 項提醒"
+            volume = max(merged[1] for merged in texts.values())
+            priority = max(merged[2] for merged in texts.values())
+            alerts.append(("tts", announcement, volume, priority, f"tts:{announcement}"))
+        return alerts